@@ -7,10 +7,39 @@
     action = monte_carlo_strategy(player, community_cards, pot)
 """
 
-import random
-from typing import List
-from poker.cards import Deck, Card
-from poker.evaluator import evaluate_best_hand
+from typing import List, Optional, Sequence
+from poker.cards import Card
+from poker.equity import equity, hand_ids
+from poker.equity_cache import DEFAULT_CACHE_SIZE, CacheInfo, EquityCache
+from poker.preflop import preflop_equity
+from poker.ranges import Range, range_equity
+from poker.rng import player_random
+
+# Пороги win_rate, по которым стратегии выбирают действие постфлоп
+MONTE_CARLO_THRESHOLDS = (0.4, 0.6, 0.8)
+AGGRESSIVE_THRESHOLDS = (0.3, 0.5, 0.7)
+
+# Бюджет одного решения постфлоп (poker.equity.anytime_equity): выборка идёт, пока интервал
+# эквити пересекает порог, но не дольше STRATEGY_TIME_BUDGET секунд и STRATEGY_MAX_SAMPLES розыгрышей
+STRATEGY_TIME_BUDGET = 0.002
+STRATEGY_MAX_SAMPLES = 5000
+
+# Кэш эквити для estimate_win_rate (канонизация по мастям, LRU-вытеснение)
+_equity_cache = EquityCache(DEFAULT_CACHE_SIZE)
+
+
+def set_equity_cache_size(maxsize: int):
+    """Меняет размер кэша эквити (0 — выключить)."""
+    _equity_cache.resize(maxsize)
+
+
+def equity_cache_info() -> CacheInfo:
+    """Статистика кэша эквити: hits, misses, maxsize, currsize."""
+    return _equity_cache.info()
+
+
+def clear_equity_cache():
+    _equity_cache.clear()
 
 
 def simple_strategy(player, community_cards, pot, stage, current_bet=None):
@@ -50,12 +79,7 @@ def aggressive_strategy(player, community_cards, pot, stage):
     """
     # Оцениваем шансы
     num_opponents = sum(1 for p in player.simulator.players if p.in_game and p != player)
-    win_rate = estimate_win_rate(
-        player.hand,
-        community_cards,
-        num_opponents=num_opponents,
-        num_simulations=300
-    )
+    win_rate = strategy_win_rate(player, community_cards, num_opponents, AGGRESSIVE_THRESHOLDS)
 
     is_late_position = player.position in ["CO", "BTN"]
     is_mid_position = player.position in ["MP", "UTG"]
@@ -89,9 +113,9 @@ def aggressive_strategy(player, community_cards, pot, stage):
         elif win_rate > 0.5:
             return "raise_2x"
         elif win_rate > 0.3:
-            if is_late_position and random.random() < 0.4:
+            if is_late_position and player_random(player) < 0.4:
                 return "bluff_raise_2x"  # Блеф в 40% случаев
-            elif random.random() < 0.7:
+            elif player_random(player) < 0.7:
                 return "call"
             else:
                 return "fold"
@@ -100,47 +124,76 @@ def aggressive_strategy(player, community_cards, pot, stage):
 
 
 def estimate_win_rate(player_cards: List[Card],
-                      community_cards: List[Card],
+                      community_cards: Optional[List[Card]],
                       num_opponents: int,
                       num_simulations: int = 500,
-                      rng=None) -> float:
+                      rng=None,
+                      mode: str = "auto",
+                      thresholds: Optional[Sequence[float]] = None,
+                      workers: Optional[int] = None,
+                      use_cache: bool = True,
+                      ranges: Optional[Sequence] = None,
+                      time_budget: Optional[float] = None) -> float:
     """
-    Оценивает вероятность победы методом Монте-Карло.
+    Оценивает вероятность победы.
+    mode: "sample" — Монте-Карло (одной пачкой NumPy), "exact" — полный перебор,
+          "auto" — перебор, когда исходов немного (терн, ривер), иначе Монте-Карло.
+    thresholds — пороги решения стратегии: точный перебор останавливается, как только
+    станет ясно, по какую сторону порогов лежит эквити.
+    workers — число процессов для Монте-Карло (общий долгоживущий пул, см. poker.equity_pool).
+    use_cache — брать результат из LRU-кэша по каноническому состоянию (выборки с rng не кэшируются).
+    ranges — диапазоны соперников ("QQ+, AKs" или poker.ranges.Range; одна строка или Range — один
+    соперник, список — по одному на соперника) вместо случайных рук; num_opponents тогда не
+    используется (poker.ranges.range_equity). Выборки по диапазонам без anytime: "anytime" и
+    time_budget дают обычный Монте-Карло на num_simulations.
+    time_budget — секунды на оценку: Монте-Карло идёт пачками, пока интервал эквити пересекает
+    один из thresholds, но не дольше бюджета; num_simulations — верхняя граница выборки.
+    Карты можно передавать списками Card, id (0..51) или 64-битными масками;
+    player_cards может быть HandState игрока (тогда community_cards=None — борд из состояния).
     Возвращает win_rate (0.0..1.0).
     """
-    rng = rng or random.Random()
-    wins = 0
-    ties = 0
-
-    known_cards = player_cards + community_cards
-    for _ in range(num_simulations):
-        # Создаём колоду без известных карт
-        deck = Deck(rng)
-        deck.cards = [c for c in deck.cards if c not in known_cards]
-        deck.shuffle()
-
-        # Достраиваем борд
-        missing_board = 5 - len(community_cards)
-        sim_board = community_cards + deck.deal(missing_board)
-
-        # Раздаём соперникам
-        opponents_hands = [deck.deal(2) for _ in range(num_opponents)]
-
-        # Оценка всех рук
-        my_rank = evaluate_best_hand(player_cards + sim_board)
-        opp_ranks = [evaluate_best_hand(hand + sim_board) for hand in opponents_hands]
-
-        # Сравнение
-        best_rank = max([my_rank] + opp_ranks)
-        if my_rank == best_rank:
-            if opp_ranks.count(best_rank) == 0:
-                wins += 1
-            else:
-                # Если есть ещё такие же сильные руки — ничья
-                if my_rank in opp_ranks:
-                    ties += 1
+    if ranges:
+        hero, board = hand_ids(player_cards, community_cards)
+        villains = [ranges] if isinstance(ranges, (str, Range)) else list(ranges)
+        return range_equity(hero, villains, board, num_simulations=num_simulations, rng=rng,
+                            mode="sample" if mode == "anytime" else mode).win_rate
+    if use_cache:
+        compute = _equity_cache.equity
+    else:
+        compute = equity
+    return compute(player_cards, community_cards, num_opponents,
+                   num_simulations=num_simulations, rng=rng,
+                   mode=mode, thresholds=thresholds, workers=workers, time_budget=time_budget).win_rate
+
 
-    return (wins + ties * 0.5) / num_simulations
+def strategy_win_rate(player, community_cards, num_opponents, thresholds=None,
+                      num_simulations=STRATEGY_MAX_SAMPLES, time_budget=STRATEGY_TIME_BUDGET):
+    """
+    win_rate для стратегий: на префлопе — O(1) lookup в таблице 169 классов рук
+    (poker.preflop), постфлоп или без таблицы — estimate_win_rate с бюджетом времени:
+    очевидные решения стоят одной маленькой пачки, пограничные — не дольше time_budget.
+    Выборка берёт числа из потока игрока (Player.rng), поэтому раздача симулятора с seed
+    воспроизводится вместе с решениями стратегий.
+    """
+    if not community_cards:
+        rate = preflop_equity(player.hand, num_opponents)
+        if rate is not None:
+            return rate
+    # Состояние руки из симулятора уже содержит id карт руки и борда
+    state = getattr(player, "hand_state", None)
+    if state is not None and len(state.board) == len(community_cards):
+        hand, board = state, None
+    else:
+        hand, board = player.hand, community_cards
+    return estimate_win_rate(
+        hand,
+        board,
+        num_opponents=num_opponents,
+        num_simulations=num_simulations,
+        rng=getattr(player, "rng", None),
+        thresholds=thresholds,
+        time_budget=time_budget
+    )
 
 
 def monte_carlo_strategy(player, community_cards, pot, stage, current_bet=None):
@@ -150,12 +203,7 @@ def monte_carlo_strategy(player, community_cards, pot, stage, current_bet=None):
     num_opponents = sum(
         1 for p in player.simulator.players if p.in_game and p != player
     )
-    win_rate = estimate_win_rate(
-        player.hand,
-        community_cards,
-        num_opponents=num_opponents,
-        num_simulations=300
-    )
+    win_rate = strategy_win_rate(player, community_cards, num_opponents, MONTE_CARLO_THRESHOLDS)
 
     if stage == "Preflop":
         ranks = [card.rank for card in player.hand]
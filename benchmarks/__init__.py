@@ -0,0 +1,13 @@
+from .suite import (
+    BENCHMARKS, GROUPS, BenchmarkReport, Measurement, Regression, compare, run_suite,
+)
+
+__all__ = [
+    "BENCHMARKS",
+    "GROUPS",
+    "BenchmarkReport",
+    "Measurement",
+    "Regression",
+    "compare",
+    "run_suite",
+]
@@ -0,0 +1,346 @@
+"""
+Замеры горячих путей: оценка рук, эквити, симулятор, память на раздачу.
+
+Основные объекты:
+- run_suite(groups, scale, seed, repeat) -> BenchmarkReport
+- BenchmarkReport.save(path) / BenchmarkReport.load(path) : JSON для сравнения между коммитами
+- compare(baseline, current, threshold) -> [Regression]   : что стало хуже больше чем на threshold
+- CLI:
+    python -m benchmarks --json bench.json
+    python -m benchmarks --only evaluator equity --compare bench.json --threshold 0.15
+
+Группы:
+- evaluator : evaluate_best_hand на 5, 6 и 7 картах (оценок/с), плюс evaluate_ids и evaluate_batch
+- equity    : estimate_win_rate в режиме Монте-Карло на каждой улице и числе соперников (выборок/с)
+- simulator : PokerSimulator.play_hand за столом из 6 одинаковых стратегий (раздач/с)
+- memory    : tracemalloc — пик памяти за прогон и память, оставшаяся после него, на раздачу
+
+Время — лучший из repeat запусков; входные данные заранее сгенерированы из seed,
+поэтому запуски на одном коммите сравнимы между собой. scale масштабирует объём работы.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ai.basic_strategy import estimate_win_rate
+from poker.batch_runner import reset_random_state, resolve_strategy
+from poker.cards import CARDS
+from poker.equity import evaluate_batch
+from poker.evaluator import evaluate_best_hand
+from poker.fast_evaluator import evaluate_ids
+from poker.rng import RandomStream
+from poker.simulator import Player, PokerSimulator
+from utils.detailed_log import NullLogger
+
+FORMAT_VERSION = 1
+GROUPS = ("evaluator", "equity", "simulator", "memory")
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_REPEAT = 3
+
+STREETS = {"preflop": 0, "flop": 3, "turn": 4, "river": 5}
+OPPONENTS = (1, 2, 3, 5)
+STRATEGIES = ("simple_strategy", "monte_carlo_strategy", "aggressive_strategy")
+TABLE_SIZE = 6
+POSITIONS = ["UTG", "MP", "CO", "BTN", "SB", "BB"]
+
+# Объём работы при scale=1
+EVALUATOR_HANDS = 20000
+EQUITY_SAMPLES = 20000
+SIMULATOR_HANDS = {"simple_strategy": 2000, "monte_carlo_strategy": 150, "aggressive_strategy": 150}
+MEMORY_HANDS = {"simple_strategy": 300, "monte_carlo_strategy": 40, "aggressive_strategy": 40}
+MIN_MEMORY_HANDS = 20
+
+
+@dataclass
+class Measurement:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = True
+    tolerance: float = 0.0       # абсолютная разница, которую compare не считает регрессией
+    params: dict = field(default_factory=dict)
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline: float
+    current: float
+    unit: str
+    change: float                # доля ухудшения: 0.2 — на 20% хуже
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.baseline:.4g} -> {self.current:.4g} {self.unit} ({100 * self.change:+.1f}%)"
+
+
+@dataclass
+class BenchmarkReport:
+    meta: dict
+    results: Dict[str, Measurement] = field(default_factory=dict)
+
+    def add(self, m: Measurement):
+        self.results[m.name] = m
+
+    def to_dict(self) -> dict:
+        return {"format": FORMAT_VERSION, "meta": self.meta,
+                "results": {name: asdict(m) for name, m in self.results.items()}}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "BenchmarkReport":
+        if d.get("format") != FORMAT_VERSION:
+            raise ValueError(f"unsupported benchmark format {d.get('format')!r}")
+        return cls(d["meta"], {name: Measurement(**m) for name, m in d["results"].items()})
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "BenchmarkReport":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def format_table(self) -> str:
+        lines = [f"{'замер':<44}{'значение':>16}  единицы"]
+        for m in self.results.values():
+            lines.append(f"{m.name:<44}{m.value:>16,.1f}  {m.unit}")
+        return "\n".join(lines)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _meta(scale: float, seed: int, repeat: int) -> dict:
+    return {
+        "commit": _git_commit(),
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "scale": scale,
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def _best_time(fn: Callable[[], None], repeat: int, warmup: bool = False) -> float:
+    """
+    Лучшее время из repeat запусков (меньше всего подвержено шуму планировщика).
+    warmup — сначала один запуск без замера: таблицы оценщика достраиваются лениво.
+    """
+    if warmup:
+        fn()
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, int(base * scale))
+
+
+def bench_evaluator(scale: float = 1.0, seed: int = 1, repeat: int = DEFAULT_REPEAT) -> List[Measurement]:
+    n = _count(EVALUATOR_HANDS, scale)
+    stream = RandomStream(seed).substream("evaluator")
+    results = []
+    for size in (5, 6, 7):
+        ids = stream.shuffles(n, k=size)
+        hands = [[CARDS[i] for i in row] for row in ids.tolist()]
+
+        def run(hands=hands):
+            for h in hands:
+                evaluate_best_hand(h)
+
+        results.append(Measurement(f"evaluator.best_hand.{size}", n / _best_time(run, repeat, warmup=True), "evals/s",
+                                   params={"hands": n}))
+    ids = stream.shuffles(n, k=7)
+    rows = ids.tolist()
+
+    def run_ids():
+        for row in rows:
+            evaluate_ids(row)
+
+    results.append(Measurement("evaluator.ids.7", n / _best_time(run_ids, repeat, warmup=True), "evals/s",
+                               params={"hands": n}))
+    batch = ids.astype(np.intp)
+    evaluate_batch(batch[:1])  # таблицы строятся лениво — не в замере
+    results.append(Measurement("evaluator.batch.7", n / _best_time(lambda: evaluate_batch(batch), repeat),
+                               "evals/s", params={"hands": n}))
+    return results
+
+
+def bench_equity(scale: float = 1.0, seed: int = 1, repeat: int = DEFAULT_REPEAT) -> List[Measurement]:
+    samples = _count(EQUITY_SAMPLES, scale)
+    stream = RandomStream(seed).substream("equity")
+    results = []
+    for street, board_size in STREETS.items():
+        deal = stream.shuffles(1, k=2 + board_size)[0].tolist()
+        hero, board = deal[:2], deal[2:]
+        for opponents in OPPONENTS:
+            def run(hero=hero, board=board, opponents=opponents):
+                estimate_win_rate(hero, board, opponents, num_simulations=samples, rng=stream,
+                                  mode="sample", use_cache=False)
+
+            rate = samples / _best_time(run, repeat, warmup=True)
+            results.append(Measurement(f"equity.{street}.{opponents}opp", rate, "samples/s",
+                                       params={"samples": samples}))
+    return results
+
+
+def _table(strategy: str, seed: int) -> PokerSimulator:
+    fn = resolve_strategy(strategy)
+    players = [Player(f"{strategy}#{i}", fn, position=POSITIONS[i]) for i in range(TABLE_SIZE)]
+    return PokerSimulator(players, rng=seed, logger=NullLogger())
+
+
+def _play(sim: PokerSimulator, hands: int, stack: int = 1000):
+    for _ in range(hands):
+        for p in sim.players:
+            p.stack = stack
+        sim.play_hand(verbose=False)
+
+
+def bench_simulator(scale: float = 1.0, seed: int = 1, repeat: int = DEFAULT_REPEAT,
+                    strategies: Sequence[str] = STRATEGIES) -> List[Measurement]:
+    results = []
+    for strategy in strategies:
+        hands = _count(SIMULATOR_HANDS.get(strategy, 200), scale)
+
+        def run(strategy=strategy, hands=hands):
+            # Каждый запуск — с одного и того же состояния: та же колода, пустые кэши эквити
+            reset_random_state(seed)
+            _play(_table(strategy, seed), hands)
+
+        results.append(Measurement(f"simulator.{strategy}", hands / _best_time(run, repeat), "hands/s",
+                                   params={"hands": hands, "players": TABLE_SIZE}))
+    return results
+
+
+def bench_memory(scale: float = 1.0, seed: int = 1, repeat: int = DEFAULT_REPEAT,
+                 strategies: Sequence[str] = STRATEGIES) -> List[Measurement]:
+    """Один запуск на стратегию: под tracemalloc время не измеряется, repeat не нужен."""
+    results = []
+    for strategy in strategies:
+        # Меньше MIN_MEMORY_HANDS раздач — остаток кэшей одной раздачи перевешивает среднее
+        hands = max(MIN_MEMORY_HANDS, _count(MEMORY_HANDS.get(strategy, 50), scale))
+        reset_random_state(seed)
+        sim = _table(strategy, seed)
+        _play(sim, 1)  # ленивые таблицы и кэши первой раздачи — не в замере
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            _play(sim, hands)
+            gc.collect()
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        params = {"hands": hands, "players": TABLE_SIZE}
+        results.append(Measurement(f"memory.{strategy}.peak", (peak - before) / 1024, "KiB",
+                                   higher_is_better=False, tolerance=64.0, params=params))
+        results.append(Measurement(f"memory.{strategy}.retained_per_hand", max(0, after - before) / hands,
+                                   "bytes/hand", higher_is_better=False, tolerance=1024.0, params=params))
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[..., List[Measurement]]] = {
+    "evaluator": bench_evaluator,
+    "equity": bench_equity,
+    "simulator": bench_simulator,
+    "memory": bench_memory,
+}
+
+
+def run_suite(groups: Optional[Sequence[str]] = None, scale: float = 1.0, seed: int = 1,
+              repeat: int = DEFAULT_REPEAT,
+              progress: Optional[Callable[[Measurement], None]] = None) -> BenchmarkReport:
+    groups = list(groups or GROUPS)
+    unknown = [g for g in groups if g not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"unknown benchmark groups {unknown}; available: {list(BENCHMARKS)}")
+    report = BenchmarkReport(_meta(scale, seed, repeat))
+    for group in groups:
+        for m in BENCHMARKS[group](scale=scale, seed=seed, repeat=repeat):
+            report.add(m)
+            if progress is not None:
+                progress(m)
+    return report
+
+
+def compare(baseline: BenchmarkReport, current: BenchmarkReport,
+            threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """Замеры, ухудшившиеся больше чем на threshold (доля). Сравниваются только общие замеры."""
+    regressions = []
+    for name, cur in current.results.items():
+        base = baseline.results.get(name)
+        if base is None or base.value <= 0:
+            continue
+        if abs(cur.value - base.value) <= cur.tolerance:
+            continue
+        if cur.higher_is_better:
+            change = (base.value - cur.value) / base.value
+        else:
+            change = (cur.value - base.value) / base.value
+        if change > threshold:
+            regressions.append(Regression(name, base.value, cur.value, cur.unit, change))
+    return regressions
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Замеры производительности оценщика, эквити и симулятора")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=None, help="какие группы запускать")
+    parser.add_argument("--scale", type=float, default=1.0, help="множитель объёма работы")
+    parser.add_argument("--quick", action="store_true", help="то же, что --scale 0.1 --repeat 1")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", default=None, help="куда сохранить результат")
+    parser.add_argument("--compare", default=None, help="JSON прошлого запуска для проверки регрессий")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое ухудшение (доля), по умолчанию %(default)s")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.scale, args.repeat = 0.1, 1
+
+    report = run_suite(args.only, scale=args.scale, seed=args.seed, repeat=args.repeat,
+                       progress=lambda m: print(f"  {m.name:<44}{m.value:>16,.1f}  {m.unit}", flush=True))
+    if args.json:
+        report.save(args.json)
+        print(f"Сохранено: {args.json}")
+    if args.compare:
+        regressions = compare(BenchmarkReport.load(args.compare), report, args.threshold)
+        if regressions:
+            print(f"\nРегрессии (хуже больше чем на {100 * args.threshold:.0f}%):")
+            for r in regressions:
+                print(f"  {r}")
+            return 1
+        print(f"\nРегрессий нет (порог {100 * args.threshold:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,79 @@
+import glob
 import os
 import tkinter as tk
 from tkinter import ttk
+from typing import List, Optional, Sequence
+from poker.cards import Card
 from poker.simulator import PokerSimulator, Player
 from ai.basic_strategy import simple_strategy, monte_carlo_strategy
 
 
+class CardSprites:
+    """Картинки карт: все PNG загружаются и уменьшаются один раз при запуске (нужен уже созданный Tk)."""
+
+    def __init__(self, cards_dir: Optional[str], subsample: int = 3):
+        self.images = {}
+        if not cards_dir:
+            return
+        for path in sorted(glob.glob(os.path.join(cards_dir, "*.png"))):
+            try:
+                image = tk.PhotoImage(file=path).subsample(subsample)  # уменьшаем
+            except tk.TclError as e:
+                print(f"❌ Не удалось загрузить карту: {path} — {e}")
+                continue
+            self.images[os.path.splitext(os.path.basename(path))[0]] = image
+
+    def get(self, card: Card) -> Optional[tk.PhotoImage]:
+        return self.images.get(f"{card.rank_str()}{card.suit}")
+
+
+def changed_slots(old: Sequence[Card], new: Sequence[Card]) -> List[int]:
+    """Номера мест, где карта сменилась, появилась или исчезла."""
+    return [i for i in range(max(len(old), len(new)))
+            if (old[i] if i < len(old) else None) != (new[i] if i < len(new) else None)]
+
+
+class CardRow:
+    """
+    Ряд мест под карты: рамки и метки создаются один раз, show() меняет картинку только
+    там, где карта сменилась, лишние места прячет.
+    """
+
+    def __init__(self, parent, sprites: CardSprites, size: int, bg: str, font, padx: int, empty_text: str = None):
+        self.sprites = sprites
+        self.padx = padx
+        self.cards: List[Card] = []
+        self.slots = []
+        for _ in range(size):
+            # Рамка с тенью
+            container = tk.Frame(parent, bg=bg, highlightbackground="#333", highlightthickness=2)
+            label = tk.Label(container, bg=bg, fg="white", font=font)
+            label.pack()
+            self.slots.append((container, label))
+        self.empty = tk.Label(parent, text=empty_text, font=("Arial", 12), bg=bg, fg="white") if empty_text else None
+
+    def show(self, cards: Sequence[Card]):
+        cards = list(cards)
+        if self.empty is not None:
+            if cards:
+                self.empty.pack_forget()
+            else:
+                self.empty.pack()
+        for i in changed_slots(self.cards, cards):
+            container, label = self.slots[i]
+            if i >= len(cards):
+                container.pack_forget()
+                continue
+            image = self.sprites.get(cards[i])
+            if image is None:
+                label.config(image="", text=cards[i].pretty())
+            else:
+                label.config(image=image, text="")
+            if i >= len(self.cards):
+                container.pack(side=tk.LEFT, padx=self.padx)
+        self.cards = cards
+
+
 class PokerGUI(tk.Tk):
     def __init__(self, simulator):
         super().__init__()
@@ -18,6 +87,8 @@ class PokerGUI(tk.Tk):
         if not os.path.exists(self.cards_dir):
             print(f"⚠️ Папка с картами не найдена: {self.cards_dir}")
             self.cards_dir = None
+        # Картинки карт загружаются один раз; дальше меняются только ссылки в метках
+        self.sprites = CardSprites(self.cards_dir)
 
         # Заголовок
         title = tk.Label(self, text="🃏 Poker Simulator", font=("Arial Black", 24), bg="#0d3b2a", fg="white")
@@ -34,6 +105,8 @@ class PokerGUI(tk.Tk):
         # Фрейм для изображений борда
         self.board_images_frame = tk.Frame(board_frame, bg="#0d3b2a")
         self.board_images_frame.pack(side=tk.LEFT, padx=5)
+        self.board_row = CardRow(self.board_images_frame, self.sprites, 5, "#0d3b2a", ("Arial", 14), 5,
+                                 empty_text="Борд пуст")
 
         # Фрейм для игроков
         players_frame = tk.Frame(self, bg="#0d3b2a")
@@ -54,11 +127,9 @@ class PokerGUI(tk.Tk):
             # Фрейм для карт
             card_frame = tk.Frame(frame, bg="#1a523f")
             card_frame.pack(pady=5)
+            card_row = CardRow(card_frame, self.sprites, 2, "#1a523f", ("Arial", 12), 3)
 
-            # Сохраняем ссылки
-            player.card_images = []
-
-            self.player_frames.append((frame, name_label, stack_label, card_frame))
+            self.player_frames.append((frame, name_label, stack_label, card_row))
 
         # Лог
         log_frame = tk.Frame(self, bg="#0d3b2a")
@@ -69,6 +140,11 @@ class PokerGUI(tk.Tk):
         self.log.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.log.insert(tk.END, "🎮 Добро пожаловать в Poker Simulator!\n")
 
+        # Теги цветов
+        self.log.tag_configure("stage", foreground="#ffd700", font=("Courier", 11, "bold"))
+        self.log.tag_configure("bank", foreground="#00ff00", font=("Courier", 11))
+        self.log.tag_configure("winner", foreground="#ffcc00", font=("Courier", 11, "bold"))
+
         # Кнопки
         btn_frame = tk.Frame(self, bg="#0d3b2a")
         btn_frame.pack(pady=10)
@@ -82,43 +158,8 @@ class PokerGUI(tk.Tk):
         self.next_button.pack(side=tk.LEFT, padx=10)
 
     def update_board(self):
-        """Обновляет изображения борда."""
-        # Очищаем старые карты
-        for widget in self.board_images_frame.winfo_children():
-            widget.destroy()
-
-        # Если нет карт — показываем текст
-        if not self.simulator.community_cards:
-            label = tk.Label(self.board_images_frame, text="Борд пуст", font=("Arial", 12), bg="#0d3b2a", fg="white")
-            label.pack()
-            return
-
-        # Отображаем каждую карту
-        for i, card in enumerate(self.simulator.community_cards):
-            filename = f"{card.rank_str()}{card.suit}.png"
-            path = os.path.join(self.cards_dir, filename) if self.cards_dir else None
-
-            try:
-                if not self.cards_dir or not os.path.exists(path):
-                    raise FileNotFoundError(f"Файл не найден: {path}")
-
-                img = tk.PhotoImage(file=path)
-                img = img.subsample(3)  # уменьшаем
-
-                # Создаём рамку с тенью
-                card_container = tk.Frame(self.board_images_frame, bg="#0d3b2a", highlightbackground="#333",
-                                          highlightthickness=2)
-                card_container.pack(side=tk.LEFT, padx=5)
-
-                label = tk.Label(card_container, image=img, bg="#0d3b2a")
-                label.image = img
-                label.pack()
-
-            except Exception as e:
-                print(f"❌ Не удалось загрузить карту борда: {path} — {e}")
-                label = tk.Label(self.board_images_frame, text=card.pretty(), font=("Arial", 14), bg="#0d3b2a",
-                                 fg="white")
-                label.pack(side=tk.LEFT, padx=5)
+        """Обновляет изображения борда (меняются только новые карты)."""
+        self.board_row.show(self.simulator.community_cards)
 
     def start_hand(self):
         """Начинаем новую раздачу."""
@@ -164,52 +205,16 @@ class PokerGUI(tk.Tk):
 
     def update_players(self):
         """Обновляет стеки и карты игроков."""
-        for (frame, name_label, stack_label, card_frame), player in zip(self.player_frames, self.simulator.players):
+        for (frame, name_label, stack_label, card_row), player in zip(self.player_frames, self.simulator.players):
             if not player.in_game:
                 name_label.config(text=f"{player.name} ❌", fg="red")
                 stack_label.config(text="выбыл", fg="red")
-                # Очищаем карты
-                for widget in card_frame.winfo_children():
-                    widget.destroy()
-                player.card_images = []
+                card_row.show([])
             else:
                 # Обновляем стек
                 name_label.config(text=player.name, fg="white")
                 stack_label.config(text=f"стек: {player.stack}", fg="#ffd700")
-
-                # Очищаем старые карты
-                for widget in card_frame.winfo_children():
-                    widget.destroy()
-
-                # Показываем новые карты
-                player.card_images = []
-                for card in player.hand:
-                    filename = f"{card.rank_str()}{card.suit}.png"
-                    path = os.path.join(self.cards_dir, filename) if self.cards_dir else None
-
-                    try:
-                        if not self.cards_dir or not os.path.exists(path):
-                            raise FileNotFoundError(f"Файл не найден: {path}")
-
-                        img = tk.PhotoImage(file=path)
-                        img = img.subsample(3)  # уменьшаем
-
-                        # Рамка с тенью
-                        card_container = tk.Frame(card_frame, bg="#1a523f", highlightbackground="#333",
-                                                  highlightthickness=2)
-                        card_container.pack(side=tk.LEFT, padx=3)
-
-                        label_card = tk.Label(card_container, image=img, bg="#1a523f")
-                        label_card.image = img
-                        label_card.pack()
-
-                        player.card_images.append(img)
-
-                    except Exception as e:
-                        print(f"❌ Не удалось загрузить карту игрока: {path} — {e}")
-                        label_card = tk.Label(card_frame, text=card.pretty(), font=("Arial", 12), bg="#1a523f",
-                                              fg="white")
-                        label_card.pack(side=tk.LEFT, padx=3)
+                card_row.show(player.hand)
 
     def pretty_log(self, result):
         """Красиво выводит результат в лог."""
@@ -228,11 +233,6 @@ class PokerGUI(tk.Tk):
             'AllFolded': '🎉'
         }.get(stage, '🎲')
 
-        # Теги цветов
-        self.log.tag_configure("stage", foreground="#ffd700", font=("Courier", 11, "bold"))
-        self.log.tag_configure("bank", foreground="#00ff00", font=("Courier", 11))
-        self.log.tag_configure("winner", foreground="#ffcc00", font=("Courier", 11, "bold"))
-
         log_line = f"[{stage_emoji} {stage}] "
 
         if action == "all_folded":
@@ -0,0 +1,418 @@
+"""
+Распознавание карт на скриншоте стола: 13 шаблонов ранга + 4 шаблона масти вместо 52 карт.
+
+Основные объекты:
+- Slot, TableLayout                  : области интереса (ROI) мест карт — карманные и борд;
+                                       TableLayout.load/save — разметка стола в JSON
+- default_layout(card_height)        : разметка по умолчанию: две карты игрока и пять карт борда
+- GlyphTemplates / load_templates()  : шаблоны ранга и масти, вырезанные из левого верхнего угла
+                                       templates/cards/*.png и усреднённые; строятся один раз
+- CardRecognizer(layout)             : recognize(image) -> {слот: "As" | None} за один проход
+- CardRecognizer.find_cards(image)   : поиск карт по всему кадру без разметки
+- non_max_suppression(boxes, scores) : из пересекающихся срабатываний остаётся лучшее
+- render_table(layout, cards)        : синтетический скриншот из PNG карт — для офлайн-проверки
+
+Как распознаётся слот: в ROI ищется карта (светлый прямоугольник), её угол приводится к одному
+рабочему масштабу, и шаблоны ранга и масти сравниваются только в окрестности своего места
+в углу (cv2.TM_CCOEFF_NORMED). Из всех откликов в слоте берётся один лучший — одна карта на слот.
+Цвет масти не нужен: корреляция нормирована, красный и чёрный знак сравниваются одинаково.
+На картах PNG из templates/cards надёжно от высоты карты ~100 пикселей; стол из 7 слотов — 2–3 мс.
+
+CLI:
+    python -m interface.card_recognizer shot.png --layout layout.json
+    python -m interface.card_recognizer --render shot.png --cards As Kd 7h 7c 2s
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+CARDS_DIR = os.path.join(os.path.dirname(__file__), "..", "templates", "cards")
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+
+# Угол карты (в пикселях шаблона, карта ~198x278): ранг сверху, масть под ним
+CORNER_WIDTH = 42
+CORNER_HEIGHT = 62
+# Масштаб, к которому приводится угол карты перед сравнением (доля от размера PNG):
+# мелкие карты увеличиваются — шаблоны ранга и масти всегда одного размера
+WORK_SCALE = 0.7
+SEARCH_RADIUS = 6        # сдвиг знака относительно среднего места, пиксели PNG
+LIGHT_LEVEL = 200        # яркость «белого» поля карты
+MIN_SCORE = 0.5          # ниже — слот считается пустым
+
+
+@dataclass
+class Slot:
+    name: str
+    x: int
+    y: int
+    w: int
+    h: int
+    # "hole" — карты игрока, "board" — борд; другие виды областей: "button", "stack", "bet", "pot"...
+    kind: str = "board"
+
+    def crop(self, image: np.ndarray) -> np.ndarray:
+        return image[self.y:self.y + self.h, self.x:self.x + self.w]
+
+
+@dataclass
+class TableLayout:
+    """Разметка стола: высота карты на экране и ROI слотов (карта плюс запас на сдвиг)."""
+    card_height: int
+    slots: List[Slot] = field(default_factory=list)
+
+    @property
+    def hole(self) -> List[Slot]:
+        return [s for s in self.slots if s.kind == "hole"]
+
+    @property
+    def board(self) -> List[Slot]:
+        return [s for s in self.slots if s.kind == "board"]
+
+    @property
+    def cards(self) -> List[Slot]:
+        return [s for s in self.slots if s.kind in ("hole", "board")]
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "TableLayout":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["card_height"], [Slot(**s) for s in data["slots"]])
+
+
+def default_layout(card_height: int = 120, margin: int = 8) -> TableLayout:
+    """Борд по центру, карты игрока под ним; кадр — 8 ширин карты на 3.5 высоты."""
+    card_w = int(round(card_height * 0.71))
+    step = card_w + card_w // 4
+    board_x = (8 * card_w - 5 * step) // 2
+    slots = [Slot(f"board_{i + 1}", board_x + i * step - margin, card_height // 3 - margin,
+                  card_w + 2 * margin, card_height + 2 * margin) for i in range(5)]
+    hero_x = 4 * card_w - step
+    hero_y = card_height // 3 + card_height + card_height // 2
+    slots += [Slot(f"hole_{i + 1}", hero_x + i * step - margin, hero_y - margin,
+                   card_w + 2 * margin, card_height + 2 * margin, kind="hole") for i in range(2)]
+    return TableLayout(card_height, slots)
+
+
+def frame_size(layout: TableLayout) -> Tuple[int, int]:
+    """(ширина, высота) кадра, в который помещаются все слоты."""
+    return (max(s.x + s.w for s in layout.slots) + layout.card_height // 3,
+            max(s.y + s.h for s in layout.slots) + layout.card_height // 3)
+
+
+# --- шаблоны ---
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def _locate_card(gray: np.ndarray) -> Optional[Tuple[int, int]]:
+    """Левый верхний угол светлого поля карты в ROI; None — карты нет."""
+    light = gray > LIGHT_LEVEL
+    cols = np.flatnonzero(light.mean(axis=0) > 0.3)
+    rows = np.flatnonzero(light.mean(axis=1) > 0.3)
+    if not len(cols) or not len(rows):
+        return None
+    return int(cols[0]), int(rows[0])
+
+
+def _glyph_boxes(gray: np.ndarray):
+    """Рамки ранга и масти в углу PNG карты по связным компонентам; None — угол не разобрать."""
+    ink = (gray[:CORNER_HEIGHT, :CORNER_WIDTH] < 170).astype(np.uint8)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(ink)
+    rank, suit = [], []
+    for x, y, w, h, area in stats[1:]:
+        # Рамка карты касается края, картинка фигуры — правее знаков
+        if area < 8 or x == 0 or y == 0 or x >= 28:
+            continue
+        if y + h <= 30:
+            rank.append((x, y, x + w, y + h))
+        elif y >= 24 and y + h <= 56:
+            suit.append((area, (x, y, x + w, y + h)))
+    if not rank or not suit:
+        return None
+    x0, y0 = min(b[0] for b in rank), min(b[1] for b in rank)
+    x1, y1 = max(b[2] for b in rank), max(b[3] for b in rank)
+    suit_box = max(suit)[1]
+    sw, sh = suit_box[2] - suit_box[0], suit_box[3] - suit_box[1]
+    if not (14 <= y1 - y0 <= 24 and 12 <= sw <= 22 and 14 <= sh <= 22):
+        return None
+    return (x0 - 1, y0 - 1, x1 + 1, y1 + 1), (suit_box[0] - 1, suit_box[1] - 1, suit_box[2] + 1, suit_box[3] + 1)
+
+
+@dataclass
+class Glyph:
+    image: np.ndarray  # «чернила» 0..1 (1 — знак), float32
+    dx: float          # смещение от угла светлого поля карты, пиксели PNG
+    dy: float
+
+
+@dataclass
+class GlyphTemplates:
+    ranks: Dict[str, Glyph]
+    suits: Dict[str, Glyph]
+    card_height: float  # высота PNG карты
+
+    @classmethod
+    def from_cards(cls, cards_dir: str = CARDS_DIR) -> "GlyphTemplates":
+        """Каждый шаблон — среднее одного знака по всем картам, где угол удалось разобрать."""
+        groups: Tuple[Dict[str, list], Dict[str, list]] = ({}, {})
+        heights = []
+        for path in sorted(glob.glob(os.path.join(cards_dir, "*.png"))):
+            name = os.path.basename(path)[:2]
+            gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if gray is None or len(name) != 2 or name[0] not in RANKS or name[1] not in SUITS:
+                continue
+            heights.append(gray.shape[0])
+            boxes, origin = _glyph_boxes(gray), _locate_card(gray)
+            if boxes is None or origin is None:
+                continue
+            for kind, key in ((0, name[0]), (1, name[1])):
+                groups[kind].setdefault(key, []).append((gray, boxes[kind], origin))
+        if not heights:
+            raise FileNotFoundError(f"no card templates in {cards_dir}")
+        ranks, suits = ({key: _average(items) for key, items in g.items()} for g in groups)
+        missing = set(RANKS) - set(ranks) | set(SUITS) - set(suits)
+        if missing:
+            raise ValueError(f"cannot build glyph templates for {sorted(missing)}")
+        return cls(ranks, suits, float(np.median(heights)))
+
+
+def _average(items) -> Glyph:
+    h = max(b[3] - b[1] for _, b, _ in items)
+    w = max(b[2] - b[0] for _, b, _ in items)
+    acc = np.zeros((h, w), np.float32)
+    dx = dy = 0.0
+    for gray, (x0, y0, _, _), (ox, oy) in items:
+        crop = np.full((h, w), 255, np.uint8)
+        part = gray[y0:y0 + h, x0:x0 + w]
+        crop[:part.shape[0], :part.shape[1]] = part
+        crop = crop.astype(np.float32)
+        lo, hi = crop.min(), crop.max()
+        # Красный и чёрный знак приводятся к одной шкале «чернил»
+        acc += (hi - crop) / max(hi - lo, 1.0)
+        dx += x0 - ox
+        dy += y0 - oy
+    return Glyph(acc / len(items), dx / len(items), dy / len(items))
+
+
+@lru_cache(maxsize=4)
+def load_templates(cards_dir: str = CARDS_DIR) -> GlyphTemplates:
+    """Шаблоны из каталога карт; повторные вызовы берут готовые из кэша."""
+    return GlyphTemplates.from_cards(cards_dir)
+
+
+def _scaled(glyphs: Dict[str, Glyph], scale: float):
+    """[(ключ, шаблон, dx, dy)] в масштабе scale относительно PNG."""
+    out = []
+    for key, g in glyphs.items():
+        image = cv2.resize(g.image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        out.append((key, image, int(round(g.dx * scale)), int(round(g.dy * scale))))
+    return out
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou: float = 0.3) -> List[int]:
+    """boxes: (n, 4) — x, y, w, h. Индексы оставленных рамок по убыванию score."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    order = np.argsort(-np.asarray(scores))
+    x0, y0 = boxes[:, 0], boxes[:, 1]
+    x1, y1 = x0 + boxes[:, 2], y0 + boxes[:, 3]
+    area = boxes[:, 2] * boxes[:, 3]
+    keep = []
+    while len(order):
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        w = np.clip(np.minimum(x1[i], x1[rest]) - np.maximum(x0[i], x0[rest]), 0, None)
+        h = np.clip(np.minimum(y1[i], y1[rest]) - np.maximum(y0[i], y0[rest]), 0, None)
+        inter = w * h
+        order = rest[inter / (area[i] + area[rest] - inter) <= iou]
+    return keep
+
+
+@dataclass
+class Detection:
+    card: str
+    score: float
+    box: Tuple[int, int, int, int]  # x, y, w, h карты в кадре
+
+
+class CardRecognizer:
+    """
+    Распознаёт карты в слотах разметки. Шаблоны приводятся к рабочему масштабу
+    один раз, в конструкторе.
+    """
+
+    def __init__(self, layout: Optional[TableLayout] = None, templates: Optional[GlyphTemplates] = None,
+                 min_score: float = MIN_SCORE):
+        self.layout = layout or default_layout()
+        self.templates = templates or load_templates()
+        self.min_score = min_score
+        self.screen_scale = self.layout.card_height / self.templates.card_height
+        self._ranks = _scaled(self.templates.ranks, WORK_SCALE)
+        self._suits = _scaled(self.templates.suits, WORK_SCALE)
+        self._radius = int(round(SEARCH_RADIUS * WORK_SCALE)) + 1
+
+    def _best(self, ink: np.ndarray, glyphs) -> Tuple[Optional[str], float]:
+        """Лучший шаблон в окрестности своего места в углу — одно срабатывание на слот."""
+        r = self._radius
+        best_key, best_score = None, -1.0
+        for key, tpl, dx, dy in glyphs:
+            th, tw = tpl.shape
+            x0, y0 = max(dx - r, 0), max(dy - r, 0)
+            window = ink[y0:dy + th + r, x0:dx + tw + r]
+            if window.shape[0] < th or window.shape[1] < tw:
+                continue
+            score = cv2.minMaxLoc(cv2.matchTemplate(window, tpl, cv2.TM_CCOEFF_NORMED))[1]
+            if score > best_score:
+                best_key, best_score = key, score
+        return best_key, best_score
+
+    def classify(self, gray: np.ndarray, origin: Tuple[int, int]) -> Optional[Tuple[str, float]]:
+        """Карта с углом светлого поля в origin (пиксели gray) -> (карта, уверенность) или None."""
+        x, y = origin
+        s = self.screen_scale
+        corner = gray[y:y + int(np.ceil(CORNER_HEIGHT * s)) + 2, x:x + int(np.ceil(CORNER_WIDTH * s)) + 2]
+        if corner.size == 0:
+            return None
+        factor = WORK_SCALE / s
+        corner = cv2.resize(corner, None, fx=factor, fy=factor, interpolation=cv2.INTER_LINEAR)
+        ink = 255.0 - corner.astype(np.float32)
+        rank, rank_score = self._best(ink, self._ranks)
+        suit, suit_score = self._best(ink, self._suits)
+        score = min(rank_score, suit_score)
+        if rank is None or suit is None or score < self.min_score:
+            return None
+        return rank + suit, float(score)
+
+    def recognize_slot(self, image: np.ndarray, slot: Slot) -> Optional[Tuple[str, float]]:
+        gray = _to_gray(slot.crop(image))
+        origin = _locate_card(gray)
+        if origin is None:
+            return None
+        return self.classify(gray, origin)
+
+    def read(self, image: np.ndarray, slot: Slot) -> Optional[str]:
+        """Карта в слоте ("As") или None."""
+        found = self.recognize_slot(image, slot)
+        return found[0] if found else None
+
+    def recognize(self, image: np.ndarray, slots: Optional[Sequence[Slot]] = None) -> Dict[str, Optional[str]]:
+        """{имя слота: "As" или None} для всех слотов карт разметки (или переданных slots)."""
+        gray = _to_gray(image)
+        return {slot.name: self.read(gray, slot) for slot in (slots if slots is not None else self.layout.cards)}
+
+    def hole_cards(self, image: np.ndarray) -> List[str]:
+        return [c for c in self.recognize(image, self.layout.hole).values() if c]
+
+    def board_cards(self, image: np.ndarray) -> List[str]:
+        return [c for c in self.recognize(image, self.layout.board).values() if c]
+
+    def find_cards(self, image: np.ndarray) -> List[Detection]:
+        """
+        Карты в любом месте кадра: кандидаты — светлые области размером с карту (одна карта
+        может распасться на несколько областей — non_max_suppression оставляет одну),
+        затем каждая распознаётся как слот.
+        """
+        gray = _to_gray(image)
+        card_h = self.layout.card_height
+        card_w = int(round(card_h * 0.71))
+        light = (gray > LIGHT_LEVEL).astype(np.uint8)
+        _, _, stats, _ = cv2.connectedComponentsWithStats(light)
+        candidates = stats[1:]
+        size_ok = ((abs(candidates[:, 2] - card_w) <= card_w // 4)
+                   & (abs(candidates[:, 3] - card_h) <= card_h // 4))
+        candidates = candidates[size_ok]
+        if not len(candidates):
+            return []
+        found = []
+        for i in non_max_suppression(candidates[:, :4], candidates[:, 4]):
+            x, y, w, h = (int(v) for v in candidates[i, :4])
+            result = self.classify(gray, (x, y))
+            if result is not None:
+                found.append(Detection(result[0], result[1], (x, y, w, h)))
+        found.sort(key=lambda d: (d.box[1], d.box[0]))
+        return found
+
+
+# --- синтетические скриншоты ---
+
+def render_table(layout: TableLayout, cards: Dict[str, str], background=(40, 110, 40), jitter: int = 0,
+                 rng: Optional[np.random.Generator] = None, cards_dir: str = CARDS_DIR) -> np.ndarray:
+    """
+    BGR-кадр со столом: cards — {имя слота: "As"}, карта вписана в ROI с отступом;
+    jitter — случайный сдвиг карты внутри ROI (пиксели).
+    """
+    width, height = frame_size(layout)
+    frame = np.empty((height, width, 3), np.uint8)
+    frame[:] = background
+    rng = rng or np.random.default_rng(0)
+    slots = {s.name: s for s in layout.slots}
+    for name, card in cards.items():
+        slot = slots[name]
+        png = cv2.imread(os.path.join(cards_dir, f"{card}.png"))
+        if png is None:
+            raise FileNotFoundError(f"no template for card {card!r}")
+        scale = layout.card_height / png.shape[0]
+        png = cv2.resize(png, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        ph, pw = png.shape[:2]
+        dx = (slot.w - pw) // 2 + (int(rng.integers(-jitter, jitter + 1)) if jitter else 0)
+        dy = (slot.h - ph) // 2 + (int(rng.integers(-jitter, jitter + 1)) if jitter else 0)
+        x, y = max(slot.x + dx, 0), max(slot.y + dy, 0)
+        frame[y:y + ph, x:x + pw] = png[:height - y, :width - x]
+    return frame
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Распознавание карт на скриншоте стола")
+    parser.add_argument("image", help="скриншот (или путь для --render)")
+    parser.add_argument("--layout", help="JSON с разметкой слотов (по умолчанию default_layout)")
+    parser.add_argument("--card-height", type=int, default=120)
+    parser.add_argument("--find", action="store_true", help="искать карты по всему кадру, без слотов")
+    parser.add_argument("--render", action="store_true", help="нарисовать стол с картами --cards в image")
+    parser.add_argument("--cards", nargs="*", default=[], help="карты для --render: сначала борд, потом игрок")
+    args = parser.parse_args(argv)
+
+    layout = TableLayout.load(args.layout) if args.layout else default_layout(args.card_height)
+    if args.render:
+        names = [s.name for s in layout.board + layout.hole]
+        cv2.imwrite(args.image, render_table(layout, dict(zip(names, args.cards))))
+        return 0
+
+    image = cv2.imread(args.image)
+    if image is None:
+        parser.error(f"cannot read {args.image}")
+    recognizer = CardRecognizer(layout)
+    started = time.perf_counter()
+    if args.find:
+        for d in recognizer.find_cards(image):
+            print(f"{d.card}  {d.score:.2f}  {d.box}")
+    else:
+        for name, card in recognizer.recognize(image).items():
+            print(f"{name:<10}{card or '-'}")
+    print(f"{1e3 * (time.perf_counter() - started):.2f} мс")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+
+# Пример использования:
+# >>> layout = default_layout(card_height=120)
+# >>> frame = render_table(layout, {"board_1": "As", "board_2": "Kd", "hole_1": "7h", "hole_2": "7c"})
+# >>> CardRecognizer(layout).recognize(frame)
+# {'board_1': 'As', 'board_2': 'Kd', 'board_3': None, ..., 'hole_1': '7h', 'hole_2': '7c'}
@@ -0,0 +1,79 @@
+"""
+Исполнение решений: ответ стратегии -> нажатие кнопки клиента.
+
+Основные объекты:
+- button_for(action, visible) : кнопка для ответа стратегии среди видимых ("call" без CALL — CHECK,
+                                "fold" без FOLD при бесплатном чеке — CHECK)
+- ClickActor(layout)          : клик мышью (pyautogui) по центру области кнопки из разметки
+- RecordingActor()            : вместо кликов запоминает ходы — для офлайн-прогона по записанным кадрам
+
+Стадия действия interface.pipeline.Pipeline — любой объект с методом act(move) -> имя кнопки или None.
+Размер рейза не вводится: кнопка RAISE нажимается с размером, выставленным в клиенте.
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from poker.betting import Action, parse_action
+
+from .card_recognizer import TableLayout
+
+# Кнопки по убыванию предпочтения для каждого действия
+BUTTONS = {
+    Action.FOLD: ("FOLD", "CHECK"),
+    Action.CHECK: ("CHECK", "CALL"),
+    Action.CALL: ("CALL", "CHECK"),
+    Action.RAISE: ("RAISE", "CALL", "CHECK"),
+    Action.BLUFF_RAISE: ("RAISE", "CALL", "CHECK"),
+    Action.ALLIN: ("ALLIN", "RAISE", "CALL", "CHECK"),
+}
+
+
+def button_for(action, visible: Iterable[str]) -> Optional[str]:
+    """Имя кнопки для ответа стратегии; None — подходящей кнопки на экране нет."""
+    visible = set(visible)
+    for name in BUTTONS.get(parse_action(action).action, ()):
+        if name in visible:
+            return name
+    return None
+
+
+class ClickActor:
+    """Нажимает кнопки по областям kind="button" разметки (имя области — имя кнопки)."""
+
+    def __init__(self, layout: TableLayout, origin: Tuple[int, int] = (0, 0)):
+        # pyautogui нужен только для живой игры: импорт здесь, чтобы офлайн-прогон работал без экрана
+        import pyautogui
+        self._click = pyautogui.click
+        self.origin = origin
+        self.buttons = {s.name.upper(): s for s in layout.slots if s.kind == "button"}
+
+    def act(self, move) -> Optional[str]:
+        name = button_for(move.action, move.buttons)
+        slot = self.buttons.get(name)
+        if slot is None:
+            return None
+        self._click(self.origin[0] + slot.x + slot.w // 2, self.origin[1] + slot.y + slot.h // 2)
+        return name
+
+
+class RecordingActor:
+    """Заглушка стадии действия: moves — [(ход, кнопка)] в порядке исполнения."""
+
+    def __init__(self):
+        self.moves: List[Tuple[object, Optional[str]]] = []
+
+    def act(self, move) -> Optional[str]:
+        name = button_for(move.action, move.buttons)
+        self.moves.append((move, name))
+        return name
+
+    @property
+    def actions(self) -> List[str]:
+        return [move.action for move, _ in self.moves]
+
+
+# Пример использования:
+# >>> actor = RecordingActor()
+# >>> Pipeline(reader.watcher(), simple_strategy, actor).run(replay("recordings/session1"))
+# >>> actor.actions
+# ['call', 'call', 'fold']
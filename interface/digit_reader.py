@@ -0,0 +1,333 @@
+"""
+Чтение сумм (стеки, ставки, банк) без Tesseract: сегментация на символы и ближайший сосед.
+
+Основные объекты:
+- segment(gray)                  : рамки символов в области (цифры и разделители), слева направо
+- glyph_features(gray, boxes)    : символы -> векторы фиксированного размера (GLYPH_W x GLYPH_H)
+- DigitClassifier                : ближайший сосед по косинусной близости; default() — эталоны
+                                   цифр, нарисованные шрифтами OpenCV; fit_crops() — дообучение
+                                   на размеченных вырезках со своего клиента
+- DigitReader.read_all(image, slots) : все суммы кадра за один проход — символы всех областей
+                                   классифицируются одним умножением матриц; области с теми же
+                                   пикселями (crc32) берутся из кэша
+- render_amount / draw_amounts   : синтетические вырезки и кадры для проверки
+- load_crops(directory) / benchmark(reader, crops) : точность и время на размеченных вырезках
+                                   (имя файла — "<сумма>_<что угодно>.png")
+
+Разделители тысяч ("," ".", пробел) пропускаются: суммы в фишках целые.
+
+CLI:
+    python -m interface.digit_reader crops/            # точность и время на вырезках
+    python -m interface.digit_reader --synthetic 500   # то же на сгенерированных
+"""
+
+import argparse
+import glob
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .card_recognizer import Slot, TableLayout
+
+GLYPH_W = 12
+GLYPH_H = 16
+MIN_CONTRAST = 60            # разница яркости текста и фона, ниже — область пустая
+SEPARATOR_HEIGHT = 0.45      # символ ниже этой доли высоты цифр — разделитель
+DIGIT_ASPECT = 0.75          # типичная ширина цифры к высоте
+WIDE_ASPECT = 1.1            # шире — несколько слипшихся цифр
+AMOUNT_KINDS = ("stack", "bet", "pot")   # виды областей разметки с суммами
+FONTS = (cv2.FONT_HERSHEY_SIMPLEX, cv2.FONT_HERSHEY_DUPLEX, cv2.FONT_HERSHEY_PLAIN)
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def _ink(gray: np.ndarray) -> Optional[np.ndarray]:
+    """Текст — 1, фон — 0, независимо от того, светлый текст на тёмном или наоборот."""
+    background = int(np.median(gray))
+    contrast = cv2.absdiff(gray, np.full_like(gray, background))
+    if int(contrast.max()) < MIN_CONTRAST:
+        return None
+    _, mask = cv2.threshold(contrast, 0, 1, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return mask
+
+
+def segment(gray: np.ndarray) -> List[Tuple[int, int, int, int, bool]]:
+    """
+    Символы области слева направо: (x, y, w, h, разделитель). Части одного символа,
+    перекрывающиеся по горизонтали, объединяются.
+    """
+    mask = _ink(gray)
+    if mask is None:
+        return []
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+    boxes = [[x, y, x + w, y + h] for x, y, w, h, area in stats[1:] if area >= 2]
+    boxes.sort()
+    merged: List[List[int]] = []
+    for b in boxes:
+        if merged:
+            m = merged[-1]
+            overlap = min(m[2], b[2]) - max(m[0], b[0])
+            if overlap > 0.5 * min(m[2] - m[0], b[2] - b[0]):
+                m[:] = [min(m[0], b[0]), min(m[1], b[1]), max(m[2], b[2]), max(m[3], b[3])]
+                continue
+        merged.append(b)
+    if not merged:
+        return []
+    height = max(b[3] - b[1] for b in merged)
+    return [(x0, y0, x1 - x0, y1 - y0, (y1 - y0) < SEPARATOR_HEIGHT * height) for x0, y0, x1, y1 in merged]
+
+
+def glyph_features(mask: np.ndarray, boxes: Sequence[Tuple[int, int, int, int, bool]]) -> np.ndarray:
+    """Символы -> (n, GLYPH_W * GLYPH_H): высота приводится к GLYPH_H с сохранением пропорций."""
+    out = np.zeros((len(boxes), GLYPH_H, GLYPH_W), np.float32)
+    for i, (x, y, w, h, _) in enumerate(boxes):
+        glyph = mask[y:y + h, x:x + w].astype(np.float32)
+        new_w = min(GLYPH_W, max(1, int(round(w * GLYPH_H / h))))
+        glyph = cv2.resize(glyph, (new_w, GLYPH_H), interpolation=cv2.INTER_AREA)
+        left = (GLYPH_W - new_w) // 2
+        out[i, :, left:left + new_w] = glyph
+    out = out.reshape(len(boxes), -1)
+    out -= out.mean(axis=1, keepdims=True)
+    out /= np.linalg.norm(out, axis=1, keepdims=True) + 1e-6
+    return out
+
+
+def split_touching(mask: np.ndarray, box: Tuple[int, int, int, int, bool],
+                   classifier: "DigitClassifier") -> List[Tuple[int, int, int, int, bool]]:
+    """
+    Слипшиеся цифры (мелкий жирный шрифт): слишком широкий символ режется на k частей по
+    минимумам проекции столбцов; k выбирается по средней близости частей к эталонам.
+    """
+    x, y, w, h, _ = box
+    if w <= WIDE_ASPECT * h:
+        return [box]
+    columns = mask[y:y + h, x:x + w].sum(axis=0)
+    guess = max(2, int(round(w / (h * DIGIT_ASPECT))))
+    best, best_score = [box], -1.0
+    for k in range(max(2, guess - 1), guess + 2):
+        cuts = [0]
+        radius = max(1, w // (4 * k))
+        for j in range(1, k):
+            lo = max(cuts[-1] + 1, j * w // k - radius)
+            hi = min(w - 1, j * w // k + radius)
+            if lo > hi:
+                break
+            cuts.append(lo + int(np.argmin(columns[lo:hi + 1])))
+        else:
+            cuts.append(w)
+            pieces = [(x + a, y, b - a, h, False) for a, b in zip(cuts, cuts[1:])]
+            score = float(classifier.predict(glyph_features(mask, pieces))[1].mean())
+            if score > best_score:
+                best, best_score = pieces, score
+    return best
+
+
+def _digit_features(gray: np.ndarray, classifier: Optional["DigitClassifier"] = None):
+    """Признаки цифр области (разделители отброшены); с classifier режутся слипшиеся цифры."""
+    mask = _ink(gray)
+    if mask is None:
+        return np.zeros((0, GLYPH_W * GLYPH_H), np.float32), []
+    boxes = [b for b in segment(gray) if not b[4]]
+    if classifier is not None:
+        boxes = [piece for b in boxes for piece in split_touching(mask, b, classifier)]
+    return glyph_features(mask, boxes), boxes
+
+
+def render_amount(value, height: int = 18, font: int = cv2.FONT_HERSHEY_SIMPLEX, thickness: int = 1,
+                  fg=(235, 235, 235), bg=(35, 35, 35), separators: bool = False, pad: int = 4) -> np.ndarray:
+    """BGR-вырезка с суммой: текст высотой ~height пикселей."""
+    text = f"{value:,}" if separators and isinstance(value, int) else str(value)
+    scale = cv2.getFontScaleFromHeight(font, height, thickness)
+    (w, h), base = cv2.getTextSize(text, font, scale, thickness)
+    crop = np.empty((h + base + 2 * pad, w + 2 * pad, 3), np.uint8)
+    crop[:] = bg
+    cv2.putText(crop, text, (pad, pad + h), font, scale, fg, thickness, cv2.LINE_AA)
+    return crop
+
+
+class DigitClassifier:
+    """Ближайший сосед: эталоны — строки матрицы признаков, метка — цифра."""
+
+    def __init__(self, features: np.ndarray, labels: Sequence[str]):
+        self.features = np.asarray(features, np.float32)
+        self.labels = np.asarray(labels)
+
+    @classmethod
+    def default(cls, heights: Sequence[int] = (12, 16, 22, 30), fonts: Sequence[int] = FONTS) -> "DigitClassifier":
+        """Эталоны цифр 0–9, нарисованные по одной шрифтами OpenCV разных размеров и толщины."""
+        features, labels = [], []
+        for font in fonts:
+            for height in heights:
+                for thickness in (1, 2):
+                    for digit in "0123456789":
+                        gray = _to_gray(render_amount(digit, height, font, thickness))
+                        mask = _ink(gray)
+                        boxes = segment(gray)
+                        x0, y0 = min(b[0] for b in boxes), min(b[1] for b in boxes)
+                        x1 = max(b[0] + b[2] for b in boxes)
+                        y1 = max(b[1] + b[3] for b in boxes)
+                        features.append(glyph_features(mask, [(x0, y0, x1 - x0, y1 - y0, False)]))
+                        labels.append(digit)
+        return cls(np.concatenate(features), labels)
+
+    def fit_crops(self, crops: Sequence[Tuple[np.ndarray, int]]) -> int:
+        """Добавляет эталоны из размеченных вырезок; возвращает число добавленных символов."""
+        added = 0
+        for image, value in crops:
+            f, boxes = _digit_features(_to_gray(image), self)
+            digits = str(value)
+            if len(boxes) != len(digits):
+                continue  # вырезку не удалось разбить на символы — как эталон она бесполезна
+            self.features = np.concatenate([self.features, f])
+            self.labels = np.concatenate([self.labels, list(digits)])
+            added += len(digits)
+        return added
+
+    def predict(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Метки и близость (косинус) для каждой строки features — одним умножением матриц."""
+        if not len(features):
+            return np.array([], dtype=self.labels.dtype), np.zeros(0, np.float32)
+        similarity = features @ self.features.T
+        best = similarity.argmax(axis=1)
+        return self.labels[best], similarity[np.arange(len(features)), best]
+
+
+@dataclass
+class ReadStats:
+    regions: int = 0
+    cache_hits: int = 0
+    glyphs: int = 0
+
+
+class DigitReader:
+    """Суммы в областях кадра; кэш — последнее значение каждой области и crc32 её пикселей."""
+
+    def __init__(self, classifier: Optional[DigitClassifier] = None, min_similarity: float = 0.5):
+        self.classifier = classifier or DigitClassifier.default()
+        self.min_similarity = min_similarity
+        self._cache: Dict[str, Tuple[int, Optional[int]]] = {}
+        self.stats = ReadStats()
+
+    def read_all(self, image: np.ndarray, slots: Sequence[Slot]) -> Dict[str, Optional[int]]:
+        """{имя области: сумма или None} для всех slots."""
+        gray = _to_gray(image)
+        out: Dict[str, Optional[int]] = {}
+        pending = []   # (имя, crc, число символов)
+        features = []
+        for slot in slots:
+            self.stats.regions += 1
+            crop = np.ascontiguousarray(slot.crop(gray))
+            crc = zlib.crc32(crop)
+            cached = self._cache.get(slot.name)
+            if cached is not None and cached[0] == crc:
+                self.stats.cache_hits += 1
+                out[slot.name] = cached[1]
+                continue
+            f, boxes = _digit_features(crop, self.classifier)
+            features.append(f)
+            pending.append((slot.name, crc, len(boxes)))
+        if pending:
+            labels, similarity = self.classifier.predict(np.concatenate(features))
+            self.stats.glyphs += len(labels)
+            start = 0
+            for name, crc, n in pending:
+                digits, sim = labels[start:start + n], similarity[start:start + n]
+                start += n
+                value = int("".join(digits)) if n and sim.min() >= self.min_similarity else None
+                self._cache[name] = (crc, value)
+                out[name] = value
+        return out
+
+    def read(self, image: np.ndarray, slot: Slot) -> Optional[int]:
+        return self.read_all(image, [slot])[slot.name]
+
+    def clear_cache(self):
+        self._cache.clear()
+
+
+def draw_amounts(frame: np.ndarray, layout: TableLayout, values: Dict[str, int], **render_kw) -> np.ndarray:
+    """Рисует суммы в областях разметки (по центру области); frame меняется на месте."""
+    slots = {s.name: s for s in layout.slots}
+    for name, value in values.items():
+        slot = slots[name]
+        crop = render_amount(value, **render_kw)
+        h, w = min(crop.shape[0], slot.h), min(crop.shape[1], slot.w)
+        x, y = slot.x + (slot.w - w) // 2, slot.y + (slot.h - h) // 2
+        frame[slot.y:slot.y + slot.h, slot.x:slot.x + slot.w] = crop[0, 0]
+        frame[y:y + h, x:x + w] = crop[:h, :w]
+    return frame
+
+
+def load_crops(directory: str) -> List[Tuple[np.ndarray, int]]:
+    """Размеченные вырезки: метка — число в начале имени файла ("1250_seat3.png")."""
+    crops = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.png"))):
+        label = os.path.basename(path).split("_")[0].split(".")[0]
+        image = cv2.imread(path)
+        if label.isdigit() and image is not None:
+            crops.append((image, int(label)))
+    return crops
+
+
+def synthetic_crops(n: int, seed: int = 1) -> List[Tuple[np.ndarray, int]]:
+    """Случайные суммы разными шрифтами, размерами и цветами."""
+    rng = np.random.default_rng(seed)
+    crops = []
+    for _ in range(n):
+        value = int(rng.integers(0, 10 ** int(rng.integers(1, 7))))
+        dark = bool(rng.integers(2))
+        fg, bg = ((235, 235, 235), (35, 35, 35)) if dark else ((20, 20, 20), (220, 220, 220))
+        crops.append((render_amount(value, int(rng.integers(12, 28)), FONTS[int(rng.integers(len(FONTS)))],
+                                    int(rng.integers(1, 3)), fg, bg, separators=bool(rng.integers(2))), value))
+    return crops
+
+
+def benchmark(reader: DigitReader, crops: Sequence[Tuple[np.ndarray, int]]) -> dict:
+    """Точность и время чтения вырезок по одной (без кэша)."""
+    correct = 0
+    started = time.perf_counter()
+    for i, (image, value) in enumerate(crops):
+        h, w = image.shape[:2]
+        reader.clear_cache()
+        correct += reader.read(image, Slot(f"crop_{i}", 0, 0, w, h, kind="stack")) == value
+    seconds = time.perf_counter() - started
+    n = len(crops)
+    return {"crops": n, "accuracy": correct / n if n else 0.0, "ms_per_crop": 1e3 * seconds / n if n else 0.0}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Точность и скорость чтения сумм")
+    parser.add_argument("crops", nargs="?", help="каталог размеченных вырезок (<сумма>_*.png)")
+    parser.add_argument("--synthetic", type=int, default=0, help="сгенерировать N вырезок вместо каталога")
+    parser.add_argument("--train", help="каталог вырезок для дообучения классификатора")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    if not args.crops and not args.synthetic:
+        parser.error("нужен каталог вырезок или --synthetic N")
+
+    crops = load_crops(args.crops) if args.crops else synthetic_crops(args.synthetic, args.seed)
+    classifier = DigitClassifier.default()
+    if args.train:
+        print(f"Эталонов добавлено: {classifier.fit_crops(load_crops(args.train))}")
+    result = benchmark(DigitReader(classifier), crops)
+    print(f"Вырезок: {result['crops']}, точность: {100 * result['accuracy']:.1f}%, "
+          f"{result['ms_per_crop']:.3f} мс на вырезку")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+
+# Пример использования:
+# >>> reader = DigitReader()
+# >>> layout = TableLayout.load("layout.json")          # области kind="stack" / "bet" / "pot"
+# >>> reader.read_all(frame, [s for s in layout.slots if s.kind in AMOUNT_KINDS])
+# {'stack_1': 1480, 'stack_2': 2210, 'pot': 340}
@@ -0,0 +1,191 @@
+"""
+Пропуск повторного распознавания: сравнение областей кадра с предыдущим кадром.
+
+Основные объекты:
+- FrameDiff(regions)            : changed(image) -> области, которые изменились с прошлого кадра
+                                  (tolerance=0 — crc32 пикселей области, иначе средняя разница
+                                  по прореженной сетке)
+- TableWatcher(layout)          : process(image) -> [ChangeEvent]; распознаватели запускаются
+                                  только на изменившихся областях, TableWatcher.state — стол целиком
+- ChangeEvent                   : область, её вид ("hole", "board", ...), старое и новое значение
+- WatchStats                    : кадров, проверено областей, распознаваний выполнено и пропущено
+- read_frames(directory)        : записанные кадры по порядку имён — замена живого захвата
+
+Распознаватели — {вид области: fn(image, slot) -> значение}; по умолчанию карты
+(interface/card_recognizer.py). Значение None — «пусто» (нет карты, нет кнопки).
+
+CLI:
+    python -m interface.frame_diff frames/ --layout layout.json
+"""
+
+import argparse
+import glob
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .card_recognizer import CardRecognizer, Slot, TableLayout, default_layout
+
+FRAME_PATTERNS = ("*.png", "*.jpg", "*.bmp")
+
+Recognizer = Callable[[np.ndarray, Slot], object]
+
+
+class FrameDiff:
+    """
+    Подписи областей последнего принятого кадра. С tolerance > 0 подпись обновляется только
+    при изменении — медленный дрейф яркости в итоге тоже засчитывается.
+    """
+
+    def __init__(self, regions: Sequence[Slot], tolerance: float = 0.0, step: int = 2):
+        self.regions = list(regions)
+        self.tolerance = tolerance
+        self.step = max(1, step)
+        self._signatures: Dict[str, object] = {}
+
+    def _signature(self, tile: np.ndarray):
+        if not self.tolerance:
+            return tile.shape, zlib.crc32(np.ascontiguousarray(tile))
+        return tile[::self.step, ::self.step].astype(np.int16)
+
+    def _same(self, old, new) -> bool:
+        if old is None:
+            return False
+        if not self.tolerance:
+            return old == new
+        return old.shape == new.shape and float(np.abs(new - old).mean()) <= self.tolerance
+
+    def changed(self, image: np.ndarray) -> List[Slot]:
+        out = []
+        signatures = self._signatures
+        for region in self.regions:
+            signature = self._signature(region.crop(image))
+            if not self._same(signatures.get(region.name), signature):
+                signatures[region.name] = signature
+                out.append(region)
+        return out
+
+    def reset(self):
+        """Следующий кадр считается полностью новым."""
+        self._signatures.clear()
+
+
+@dataclass
+class ChangeEvent:
+    frame: int
+    region: str
+    kind: str
+    old: object
+    new: object
+
+
+@dataclass
+class WatchStats:
+    frames: int = 0
+    regions_checked: int = 0
+    recognitions: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def skip_ratio(self) -> float:
+        return self.skipped / self.regions_checked if self.regions_checked else 0.0
+
+    def format(self) -> str:
+        per_frame = 1e3 * self.seconds / self.frames if self.frames else 0.0
+        return (f"Кадров: {self.frames}, областей: {self.regions_checked}, распознаваний: {self.recognitions}, "
+                f"пропущено: {self.skipped} ({100 * self.skip_ratio:.1f}%), {per_frame:.2f} мс/кадр")
+
+
+def card_recognizers(recognizer: CardRecognizer) -> Dict[str, Recognizer]:
+    return {"hole": recognizer.read, "board": recognizer.read}
+
+
+class TableWatcher:
+    """
+    Состояние стола по потоку кадров. Области без распознавателя не отслеживаются;
+    событие выдаётся, когда распознанное значение области изменилось.
+    """
+
+    def __init__(self, layout: Optional[TableLayout] = None,
+                 recognizers: Optional[Dict[str, Recognizer]] = None, tolerance: float = 0.0):
+        self.layout = layout or default_layout()
+        if recognizers is None:
+            recognizers = card_recognizers(CardRecognizer(self.layout))
+        self.recognizers = recognizers
+        self.diff = FrameDiff([s for s in self.layout.slots if s.kind in recognizers], tolerance)
+        self.state: Dict[str, object] = {}
+        self.stats = WatchStats()
+        self.frame_index = 0
+
+    def process(self, image: np.ndarray) -> List[ChangeEvent]:
+        started = time.perf_counter()
+        changed = self.diff.changed(image)
+        events = []
+        state = self.state
+        for slot in changed:
+            value = self.recognizers[slot.kind](image, slot)
+            old = state.get(slot.name)
+            state[slot.name] = value
+            if value != old:
+                events.append(ChangeEvent(self.frame_index, slot.name, slot.kind, old, value))
+        stats = self.stats
+        stats.frames += 1
+        stats.regions_checked += len(self.diff.regions)
+        stats.recognitions += len(changed)
+        stats.skipped += len(self.diff.regions) - len(changed)
+        stats.seconds += time.perf_counter() - started
+        self.frame_index += 1
+        return events
+
+    def run(self, frames: Iterable[np.ndarray]) -> Iterator[ChangeEvent]:
+        for image in frames:
+            yield from self.process(image)
+
+    def reset(self):
+        self.diff.reset()
+        self.state.clear()
+
+
+def read_frames(directory: str) -> Iterator[Tuple[str, np.ndarray]]:
+    """(путь, BGR-кадр) для изображений каталога в порядке имён."""
+    paths = sorted(p for pattern in FRAME_PATTERNS for p in glob.glob(os.path.join(directory, pattern)))
+    for path in paths:
+        image = cv2.imread(path)
+        if image is not None:
+            yield path, image
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Изменения стола по записанным кадрам")
+    parser.add_argument("frames", help="каталог с кадрами (png/jpg/bmp)")
+    parser.add_argument("--layout", help="JSON с разметкой (по умолчанию default_layout)")
+    parser.add_argument("--card-height", type=int, default=120)
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="средняя разница яркости, ниже которой область не изменилась (0 — точно)")
+    args = parser.parse_args(argv)
+
+    layout = TableLayout.load(args.layout) if args.layout else default_layout(args.card_height)
+    watcher = TableWatcher(layout, tolerance=args.tolerance)
+    for path, image in read_frames(args.frames):
+        for e in watcher.process(image):
+            print(f"{os.path.basename(path)}  {e.region:<10}{e.old or '-'} -> {e.new or '-'}")
+    print(watcher.stats.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+
+# Пример использования:
+# >>> watcher = TableWatcher(default_layout(120))
+# >>> for path, frame in read_frames("recordings/session1"):
+# ...     for event in watcher.process(frame):
+# ...         print(event.region, event.old, "->", event.new)
+# >>> watcher.stats.skip_ratio   # доля областей, которые не пришлось распознавать
@@ -0,0 +1,402 @@
+"""
+Конвейер автоигры: захват -> распознавание -> решение -> действие, каждая стадия — свой поток.
+
+Основные объекты:
+- Pipeline(watcher, strategy, actor) : стадии связаны очередями длины queue_size; при drop=True
+                                  переполненная очередь выбрасывает самый старый элемент — стадия
+                                  всегда работает с последним кадром, а не копит отставание
+- run(source) -> PipelineStats  : прогон по источнику кадров (replay — записанные, screen — экран)
+- Move                          : ход — кадр, улица, карты, видимые кнопки и ответ стратегии
+- StageStats / PipelineStats    : по стадиям — число, среднее и максимальное время, превышения
+                                  бюджета, выброшенные элементы, отклонённые кадры; total — от захвата до действия
+
+Бюджет задержки (DEFAULT_BUDGETS, секунды) задаётся на стадию; превышения считаются, а ход по
+кадру старше max_age (по умолчанию — сумма бюджетов) не исполняется: стол уже мог измениться.
+Тот же ход тогда решается заново по следующему кадру, даже если на нём ничего не изменилось.
+
+Распознавание — interface.frame_diff.TableWatcher (ScreenReader.watcher()); решение — стратегия
+из ai.basic_strategy с тем же вызовом, что в симуляторе; действие — любой объект с act(move)
+(interface.clicker: ClickActor кликает, RecordingActor только запоминает).
+
+CLI:
+    python -m interface.pipeline frames/ --layout layout.json --strategy simple   # офлайн, без кликов
+    python -m interface.pipeline --live --layout layout.json --click               # живая игра
+"""
+
+import argparse
+import inspect
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from ai.basic_strategy import aggressive_strategy, monte_carlo_strategy, simple_strategy
+from poker.cards import parse_card
+from poker.simulator import Player
+
+from .card_recognizer import TableLayout
+from .frame_diff import TableWatcher, read_frames
+
+STAGES = ("capture", "recognize", "decide", "act")
+DEFAULT_BUDGETS = {"capture": 0.040, "recognize": 0.030, "decide": 0.050, "act": 0.030}
+STREETS = {0: "Preflop", 3: "Flop", 4: "Turn", 5: "River"}
+STRATEGIES = {"simple": simple_strategy, "aggressive": aggressive_strategy, "monte_carlo": monte_carlo_strategy}
+
+_STOP = object()   # конец потока кадров; проходит по всем очередям и не выбрасывается
+
+
+@dataclass
+class StageStats:
+    name: str
+    budget: float
+    items: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    over_budget: int = 0
+    dropped: int = 0      # выброшено из входной очереди (backpressure)
+    stale: int = 0        # ходы, не исполненные из-за возраста кадра (только act)
+    rejected: int = 0     # кадры с повторяющимися или нечитаемыми картами (только decide)
+
+    def record(self, seconds: float):
+        self.items += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        if seconds > self.budget:
+            self.over_budget += 1
+
+    @property
+    def mean(self) -> float:
+        return self.seconds / self.items if self.items else 0.0
+
+    def format(self) -> str:
+        line = (f"{self.name:<10}{self.items:>6}  сред {1e3 * self.mean:7.2f} мс  макс {1e3 * self.max_seconds:7.2f} мс"
+                f"  бюджет {1e3 * self.budget:.0f} мс, превышений {self.over_budget}")
+        if self.dropped:
+            line += f", выброшено {self.dropped}"
+        if self.stale:
+            line += f", устарело {self.stale}"
+        if self.rejected:
+            line += f", отклонено {self.rejected}"
+        return line
+
+
+@dataclass
+class PipelineStats:
+    stages: Dict[str, StageStats]
+    total: StageStats
+    seconds: float = 0.0
+
+    def format(self) -> str:
+        return "\n".join([s.format() for s in self.stages.values()] + [self.total.format(),
+                                                                        f"Время прогона: {self.seconds:.2f} с"])
+
+
+@dataclass
+class Frame:
+    index: int
+    image: np.ndarray
+    captured_at: float
+
+
+@dataclass
+class TableView:
+    """Стол по кадру: значения областей TableWatcher.state, разобранные по видам."""
+    frame: int
+    captured_at: float
+    hole: Tuple[str, ...]
+    board: Tuple[str, ...]
+    buttons: Tuple[str, ...]
+    amounts: Dict[str, Optional[int]] = field(default_factory=dict)   # стеки и ставки по именам областей
+    pot: int = 0
+
+    @classmethod
+    def from_state(cls, frame: Frame, layout: TableLayout, state: Dict[str, object]) -> "TableView":
+        by_kind: Dict[str, list] = {}
+        amounts = {}
+        pot = 0
+        for slot in layout.slots:
+            value = state.get(slot.name)
+            if slot.kind == "pot":
+                pot += value or 0
+            elif slot.kind in ("stack", "bet"):
+                amounts[slot.name] = value
+            elif value is not None:
+                by_kind.setdefault(slot.kind, []).append(value)
+        return cls(frame.index, frame.captured_at, tuple(by_kind.get("hole", ())), tuple(by_kind.get("board", ())),
+                   tuple(by_kind.get("button", ())), amounts, pot)
+
+
+@dataclass
+class Move:
+    frame: int
+    captured_at: float
+    stage: str
+    hole: Tuple[str, ...]
+    board: Tuple[str, ...]
+    buttons: Tuple[str, ...]
+    action: object
+    to_call: Optional[int] = None
+
+
+class _Table:
+    """То, что стратегии читают у симулятора (player.simulator): игроки в раздаче и большой блайнд."""
+
+    def __init__(self, players: List[Player], bb: int):
+        self.players = players
+        self.bb = bb
+
+
+def replay(directory: str, fps: Optional[float] = None) -> Iterator[np.ndarray]:
+    """Записанные кадры по порядку имён; fps — выдавать не быстрее, как живой захват."""
+    interval = 1.0 / fps if fps else 0.0
+    for _, image in read_frames(directory):
+        yield image
+        if interval:
+            time.sleep(interval)
+
+
+def screen(reader, fps: float = 10.0) -> Iterator[np.ndarray]:
+    """Скриншоты ScreenReader.capture() не чаще fps в секунду — до остановки конвейера."""
+    interval = 1.0 / fps
+    while True:
+        started = time.perf_counter()
+        yield reader.capture()
+        time.sleep(max(0.0, interval - (time.perf_counter() - started)))
+
+
+class Pipeline:
+    """
+    Стадии — потоки; распознавание и решение выдают результат, только если что-то изменилось:
+    решение принимается один раз на сочетание (карты руки, борд, видимые кнопки), то есть на
+    каждый свой ход, а не на каждый кадр.
+    """
+
+    def __init__(self, watcher: TableWatcher, strategy: Callable, actor, budgets: Optional[Dict[str, float]] = None,
+                 queue_size: int = 1, drop: bool = True, max_age: Optional[float] = None,
+                 hero_stack: str = "stack_1", hero_bet: str = "bet_1", big_blind: int = 20,
+                 position: Optional[str] = None):
+        self.watcher = watcher
+        self.strategy = strategy
+        self.actor = actor
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.queue_size = queue_size
+        self.drop = drop
+        self.max_age = max_age if max_age is not None else sum(self.budgets[s] for s in STAGES)
+        self.hero_stack = hero_stack
+        self.hero_bet = hero_bet
+        # Стратегии с current_bet (simple_strategy, monte_carlo_strategy) получают сумму к уравниванию
+        self._takes_bet = "current_bet" in inspect.signature(strategy).parameters
+        self.big_blind = big_blind
+        self.position = position
+        self.stats = PipelineStats({s: StageStats(s, self.budgets[s]) for s in STAGES},
+                                   StageStats("total", self.max_age))
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._last_turn = None
+        self._retry = threading.Event()   # ход устарел — решить заново по следующему кадру
+
+    # --- стадии ---
+
+    def _recognize(self, frame: Frame) -> Optional[TableView]:
+        if not self.watcher.process(frame.image) and not self._retry.is_set():
+            return None
+        self._retry.clear()
+        return TableView.from_state(frame, self.watcher.layout, self.watcher.state)
+
+    def _to_call(self, view: TableView) -> Optional[int]:
+        """Сколько доложить герою: наибольшая ставка на столе минус своя; None — ставки не прочитаны."""
+        bets = {name: value for name, value in view.amounts.items() if name.startswith("bet") and value is not None}
+        if not bets:
+            return None
+        return max(0, max(bets.values()) - bets.get(self.hero_bet, 0))
+
+    def _hero(self, view: TableView) -> Player:
+        hero = Player("hero", self.strategy, position=self.position)
+        stack = view.amounts.get(self.hero_stack)
+        if stack is not None:
+            hero.stack = stack
+        hero.hand = [parse_card(c) for c in view.hole]
+        opponents = [Player(name, None, stack=value) for name, value in view.amounts.items()
+                     if name.startswith("stack") and name != self.hero_stack and value]
+        hero.simulator = _Table([hero] + (opponents or [Player("villain", None)]), self.big_blind)
+        return hero
+
+    def _decide(self, view: TableView) -> Optional[Move]:
+        if len(view.hole) < 2 or not view.buttons:
+            return None
+        turn = (view.hole, view.board, view.buttons)
+        if turn == self._last_turn:
+            return None
+        # Карта, прочитанная посреди анимации, может совпасть с другой: такой кадр пропускается,
+        # а не останавливает конвейер исключением стратегии
+        try:
+            cards = [parse_card(c) for c in view.hole + view.board]
+        except ValueError:
+            cards = None
+        if cards is None or len(set(cards)) != len(cards):
+            self.stats.stages["decide"].rejected += 1
+            return None
+        self._last_turn = turn
+        stage = STREETS.get(len(view.board), "Flop")
+        board = cards[len(view.hole):]
+        to_call = self._to_call(view)
+        if self._takes_bet:
+            action = self.strategy(self._hero(view), board, view.pot, stage, current_bet=to_call)
+        else:
+            action = self.strategy(self._hero(view), board, view.pot, stage)
+        return Move(view.frame, view.captured_at, stage, view.hole, view.board, view.buttons, action, to_call)
+
+    def _forget(self, move: Move):
+        """Ход не исполнен: если это последний решённый ход, он решается заново по следующему кадру."""
+        if self._last_turn == (move.hole, move.board, move.buttons):
+            self._last_turn = None
+            self._retry.set()
+
+    def _act(self, move: Move):
+        age = time.perf_counter() - move.captured_at
+        if age > self.max_age:
+            self.stats.stages["act"].stale += 1
+            self._forget(move)
+            return None
+        self.actor.act(move)
+        self.stats.total.record(time.perf_counter() - move.captured_at)
+        return None
+
+    # --- потоки и очереди ---
+
+    def _put(self, box: queue.Queue, item, receiver: str):
+        if not self.drop or item is _STOP:
+            box.put(item)
+            return
+        while True:
+            try:
+                box.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    old = box.get_nowait()
+                except queue.Empty:
+                    continue
+                self.stats.stages[receiver].dropped += 1
+                if receiver == "act":
+                    self._forget(old)
+
+    def _capture(self, source: Iterable[np.ndarray], outbox: queue.Queue):
+        stats = self.stats.stages["capture"]
+        frames = iter(source)
+        index = 0
+        try:
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                image = next(frames, None)
+                if image is None:
+                    break
+                captured_at = time.perf_counter()
+                stats.record(captured_at - started)
+                self._put(outbox, Frame(index, image, captured_at), "recognize")
+                index += 1
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            outbox.put(_STOP)
+
+    def _stage(self, name: str, fn: Callable, inbox: queue.Queue, outbox: Optional[queue.Queue], receiver: str):
+        stats = self.stats.stages[name]
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                break
+            if self.error is not None:
+                continue   # стадия ниже упала: только разгружаем очередь до конца потока
+            started = time.perf_counter()
+            try:
+                out = fn(item)
+            except BaseException as exc:
+                self._fail(exc)
+                continue
+            stats.record(time.perf_counter() - started)
+            if out is not None and outbox is not None:
+                self._put(outbox, out, receiver)
+        if outbox is not None:
+            outbox.put(_STOP)
+
+    def _fail(self, exc: BaseException):
+        if self.error is None:
+            self.error = exc
+        self._stop.set()
+
+    def run(self, source: Iterable[np.ndarray]) -> PipelineStats:
+        """Прогон до конца source или stop(); исключение любой стадии пробрасывается отсюда."""
+        self._stop.clear()
+        self.error = None
+        boxes = [queue.Queue(self.queue_size) for _ in STAGES[1:]]
+        threads = [threading.Thread(target=self._capture, args=(source, boxes[0]), name="capture", daemon=True)]
+        steps = [("recognize", self._recognize), ("decide", self._decide), ("act", self._act)]
+        for i, (name, fn) in enumerate(steps):
+            outbox = boxes[i + 1] if i + 1 < len(boxes) else None
+            receiver = STAGES[i + 2] if outbox is not None else ""
+            threads.append(threading.Thread(target=self._stage, args=(name, fn, boxes[i], outbox, receiver),
+                                            name=name, daemon=True))
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.stats.seconds += time.perf_counter() - started
+        if self.error is not None:
+            raise self.error
+        return self.stats
+
+    def stop(self):
+        """Остановить захват; уже захваченные кадры дорабатываются."""
+        self._stop.set()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Конвейер захват -> распознавание -> решение -> действие")
+    parser.add_argument("frames", nargs="?", help="каталог записанных кадров (офлайн-прогон)")
+    parser.add_argument("--live", action="store_true", help="захват экрана вместо каталога")
+    parser.add_argument("--layout", help="JSON с разметкой (по умолчанию default_layout)")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="simple")
+    parser.add_argument("--fps", type=float, default=None, help="темп кадров (для --live — 10)")
+    parser.add_argument("--click", action="store_true", help="нажимать кнопки (иначе только запись ходов)")
+    parser.add_argument("--big-blind", type=int, default=20)
+    args = parser.parse_args(argv)
+    if not args.frames and not args.live:
+        parser.error("нужен каталог кадров или --live")
+
+    from .clicker import ClickActor, RecordingActor
+    from .screen_reader import ScreenReader
+
+    reader = ScreenReader(TableLayout.load(args.layout) if args.layout else None)
+    watcher = reader.watcher()
+    actor = ClickActor(watcher.layout) if args.click else RecordingActor()
+    pipeline = Pipeline(watcher, STRATEGIES[args.strategy], actor, big_blind=args.big_blind,
+                        drop=args.live, max_age=None if args.live else float("inf"))
+    source = screen(reader, args.fps or 10.0) if args.live else replay(args.frames, args.fps)
+    try:
+        pipeline.run(source)
+    except KeyboardInterrupt:
+        pipeline.stop()
+    if isinstance(actor, RecordingActor):
+        for move, button in actor.moves:
+            print(f"кадр {move.frame:>5}  {move.stage:<8}{' '.join(move.hole):<7}{' '.join(move.board):<16}"
+                  f"{move.action} -> {button or '-'}")
+    print(pipeline.stats.format())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
+
+# Пример использования:
+# >>> reader = ScreenReader(TableLayout.load("layout.json"))
+# >>> actor = RecordingActor()
+# >>> pipeline = Pipeline(reader.watcher(), monte_carlo_strategy, actor)
+# >>> print(pipeline.run(replay("recordings/session1", fps=10)).format())
+# >>> actor.moves[0]   # (Move(frame=12, stage='Preflop', hole=('Ah', 'Kh'), ...), 'RAISE')
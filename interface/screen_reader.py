@@ -2,24 +2,25 @@ import cv2
 import numpy as np
 from PIL import ImageGrab
 
+from .card_recognizer import CardRecognizer, Slot, TableLayout
+from .digit_reader import AMOUNT_KINDS, DigitReader
+from .frame_diff import TableWatcher
+
 
 class ScreenReader:
-    def __init__(self):
+    def __init__(self, layout: TableLayout = None):
         self.template_dir = "templates/"
-        self.card_templates = {}
+        # Карты распознаются по шаблонам ранга и масти в слотах разметки (interface/card_recognizer.py)
+        self.layout = layout
+        self.card_recognizer = None
+        # Стеки, ставки и банк — без Tesseract (interface/digit_reader.py)
+        self.digit_reader = DigitReader()
         self.button_templates = {}
 
     def load_templates(self):
-        """Загружает шаблоны карт и кнопок."""
-        # Шаблоны карт
-        card_names = ["As", "Ad", "Ah", "Ac", "Ks", "Kh", "Kd", "Kc", ...]
-        for name in card_names:
-            path = f"{self.template_dir}{name}.png"
-            try:
-                template = cv2.imread(path, 0)
-                self.card_templates[name] = template
-            except:
-                print(f"Не найден шаблон: {path}")
+        """Готовит распознаватель карт и загружает шаблоны кнопок."""
+        self.card_recognizer = CardRecognizer(self.layout)
+        self.layout = self.card_recognizer.layout
 
         # Кнопки
         self.button_templates = {
@@ -28,22 +29,62 @@ class ScreenReader:
             "FOLD": cv2.imread(f"{self.template_dir}fold.png", 0),
         }
 
+    def capture(self) -> np.ndarray:
+        """Скриншот экрана в BGR."""
+        return cv2.cvtColor(np.array(ImageGrab.grab()), cv2.COLOR_RGB2BGR)
+
     def detect_hand_cards(self, image):
-        """Находит карты на руках."""
-        cards = []
-        for card_name, template in self.card_templates.items():
-            result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
-            locations = np.where(result >= 0.8)
-            for pt in zip(*locations[::-1]):
-                cards.append(card_name)
-        return cards
+        """Находит карты на руках: ["As", "Kd"]."""
+        if self.card_recognizer is None:
+            self.load_templates()
+        return self.card_recognizer.hole_cards(image)
+
+    def detect_board_cards(self, image):
+        """Карты борда по порядку слотов."""
+        if self.card_recognizer is None:
+            self.load_templates()
+        return self.card_recognizer.board_cards(image)
+
+    def detect_stacks(self, image=None):
+        """Стеки, ставки и банк за один проход: {имя области: сумма или None}; без image — скриншот."""
+        if self.card_recognizer is None:
+            self.load_templates()
+        if image is None:
+            image = self.capture()
+        return self.digit_reader.read_all(image, [s for s in self.layout.slots if s.kind in AMOUNT_KINDS])
 
     def detect_buttons(self, image):
         """Находит координаты кнопок."""
         buttons = {}
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         for btn_name, template in self.button_templates.items():
+            if template is None:
+                continue
             result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
             locations = np.where(result >= 0.8)
             for pt in zip(*locations[::-1]):
                 buttons[btn_name] = pt
         return buttons
+
+    def read_button(self, image, slot: Slot):
+        """Область кнопки (slot.kind == "button", имя — "FOLD"/"CHECK"/...): имя, если кнопка видна."""
+        template = self.button_templates.get(slot.name.upper())
+        if template is None:
+            return None
+        region = slot.crop(image)
+        if region.ndim == 3:
+            region = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+        if region.shape[0] < template.shape[0] or region.shape[1] < template.shape[1]:
+            return None
+        score = cv2.minMaxLoc(cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED))[1]
+        return slot.name if score >= 0.8 else None
+
+    def watcher(self, tolerance: float = 0.0) -> TableWatcher:
+        """Наблюдатель за столом: карты, кнопки и суммы распознаются заново только при изменении области."""
+        if self.card_recognizer is None:
+            self.load_templates()
+        read_card = self.card_recognizer.read
+        recognizers = {"hole": read_card, "board": read_card, "button": self.read_button}
+        recognizers.update((kind, self.digit_reader.read) for kind in AMOUNT_KINDS)
+        return TableWatcher(self.layout, recognizers, tolerance=tolerance)
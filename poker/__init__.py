@@ -1,11 +1,19 @@
-from .cards import Card, Deck
+from .cards import Card, Deck, CARDS, parse_card, to_ids, cards_to_mask
 from .evaluator import evaluate_best_hand
+from .fast_evaluator import evaluate_strength, evaluate_ids, evaluate_mask
 from .simulator import PokerSimulator, Player
 
 __all__ = [
     "Card",
     "Deck",
+    "CARDS",
+    "parse_card",
+    "to_ids",
+    "cards_to_mask",
     "evaluate_best_hand",
+    "evaluate_strength",
+    "evaluate_ids",
+    "evaluate_mask",
     "PokerSimulator",
     "Player",
 ]
\ No newline at end of file
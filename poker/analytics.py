@@ -0,0 +1,248 @@
+"""
+Аналитика по бинарной истории раздач (poker/hand_history.py) без создания Python-объектов на раздачу.
+
+Основные объекты:
+- analyze(paths) -> HistoryReport   : один проход по файлам; блоки файлов читаются как np.memmap
+                                      и обрабатываются кусками по chunk_hands раздач
+- HistoryReport.players[name]       : PlayerStats — VPIP, PFR, доля выигранных раздач, bb/100,
+                                      частота вскрытия среди увидевших каждую улицу
+- HistoryReport.classes             : ClassStats — раздачи, выигрыши и bb по 169 классам стартовых рук
+- hand_class_indices(hole)          : (..., 2) id карт -> индекс класса в preflop.HAND_CLASSES
+- find_histories(directory)         : все *.phh в каталоге (по умолчанию data/)
+- CLI:
+    python -m poker.analytics data/*.phh
+
+Все запросы — векторные операции над столбцами структурированных массивов раздач и действий
+(действие относится к раздаче через num_actions); временная память ограничена размером куска,
+поэтому размер файлов не важен.
+"""
+
+import argparse
+import glob
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Sequence, Union
+
+import numpy as np
+
+from .hand_history import STREETS, ActionCode, Outcome, iter_chunks, read_header
+from .preflop import HAND_CLASSES, hand_class
+
+DEFAULT_HISTORY_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data"))
+DEFAULT_CHUNK_HANDS = 1 << 18
+
+_VOLUNTARY = np.array([ActionCode.CALL, ActionCode.RAISE, ActionCode.BLUFF_RAISE, ActionCode.ALLIN])
+_AGGRESSIVE = np.array([ActionCode.RAISE, ActionCode.BLUFF_RAISE, ActionCode.ALLIN])
+_BOARD_TO_STREET = np.array([0, 0, 0, 1, 2, 3])  # число карт борда -> последняя улица
+
+
+def _build_class_table() -> np.ndarray:
+    table = np.full((52, 52), -1, dtype=np.int16)
+    index = {name: i for i, name in enumerate(HAND_CLASSES)}
+    for a in range(52):
+        for b in range(52):
+            if a != b:
+                table[a, b] = index[hand_class([a, b])]
+    return table
+
+
+_CLASS_TABLE = _build_class_table()
+
+
+def hand_class_indices(hole: np.ndarray) -> np.ndarray:
+    """Массив (..., 2) id карт -> индексы классов (-1 там, где карт нет)."""
+    a, b = hole[..., 0].astype(np.intp), hole[..., 1].astype(np.intp)
+    dealt = (a >= 0) & (b >= 0)
+    return np.where(dealt, _CLASS_TABLE[np.where(dealt, a, 0), np.where(dealt, b, 1)], -1)
+
+
+@dataclass
+class PlayerStats:
+    name: str
+    hands: int = 0
+    vpip_hands: int = 0          # добровольно вложил фишки на префлопе
+    pfr_hands: int = 0           # рейзил на префлопе
+    wins: int = 0
+    net_bb: float = 0.0
+    saw_street: np.ndarray = field(default_factory=lambda: np.zeros(len(STREETS), dtype=np.int64))
+    showdown_from: np.ndarray = field(default_factory=lambda: np.zeros(len(STREETS), dtype=np.int64))
+
+    @property
+    def vpip(self) -> float:
+        return self.vpip_hands / self.hands if self.hands else 0.0
+
+    @property
+    def pfr(self) -> float:
+        return self.pfr_hands / self.hands if self.hands else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.hands if self.hands else 0.0
+
+    @property
+    def bb_per_100(self) -> float:
+        return 100.0 * self.net_bb / self.hands if self.hands else 0.0
+
+    @property
+    def showdown_frequency(self) -> Dict[str, float]:
+        """Улица -> доля дошедших до вскрытия среди увидевших эту улицу."""
+        return {s: (float(self.showdown_from[i]) / self.saw_street[i] if self.saw_street[i] else 0.0)
+                for i, s in enumerate(STREETS)}
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name, "hands": self.hands, "vpip": self.vpip, "pfr": self.pfr,
+            "win_rate": self.win_rate, "bb_per_100": self.bb_per_100,
+            "showdown_frequency": self.showdown_frequency,
+        }
+
+
+@dataclass
+class ClassStats:
+    hands: np.ndarray = field(default_factory=lambda: np.zeros(len(HAND_CLASSES), dtype=np.int64))
+    wins: np.ndarray = field(default_factory=lambda: np.zeros(len(HAND_CLASSES), dtype=np.int64))
+    net_bb: np.ndarray = field(default_factory=lambda: np.zeros(len(HAND_CLASSES), dtype=np.float64))
+
+    @property
+    def win_rate(self) -> np.ndarray:
+        return np.divide(self.wins, self.hands, out=np.zeros(len(HAND_CLASSES)), where=self.hands > 0)
+
+    @property
+    def bb_per_100(self) -> np.ndarray:
+        return np.divide(100.0 * self.net_bb, self.hands, out=np.zeros(len(HAND_CLASSES)),
+                         where=self.hands > 0)
+
+    def to_dict(self) -> dict:
+        win_rate, bb = self.win_rate, self.bb_per_100
+        return {name: {"hands": int(self.hands[i]), "win_rate": float(win_rate[i]),
+                       "bb_per_100": float(bb[i])}
+                for i, name in enumerate(HAND_CLASSES) if self.hands[i]}
+
+
+@dataclass
+class HistoryReport:
+    hands: int = 0
+    players: Dict[str, PlayerStats] = field(default_factory=dict)
+    classes: ClassStats = field(default_factory=ClassStats)
+    ended_on_street: np.ndarray = field(default_factory=lambda: np.zeros(len(STREETS), dtype=np.int64))
+    showdowns: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "hands": self.hands,
+            "showdowns": self.showdowns,
+            "ended_on_street": dict(zip(STREETS, map(int, self.ended_on_street))),
+            "players": [p.to_dict() for p in self.players.values()],
+            "classes": self.classes.to_dict(),
+        }
+
+    def format_table(self) -> str:
+        lines = [f"Раздач: {self.hands}, вскрытий: {self.showdowns}",
+                 f"{'игрок':<24}{'раздач':>9}{'VPIP':>7}{'PFR':>7}{'win %':>7}{'bb/100':>9}"
+                 + "".join(f"{'SD/' + s[0]:>7}" for s in STREETS)]
+        for p in self.players.values():
+            sd = p.showdown_frequency
+            lines.append(f"{p.name:<24}{p.hands:>9}{100 * p.vpip:>7.1f}{100 * p.pfr:>7.1f}"
+                         f"{100 * p.win_rate:>7.1f}{p.bb_per_100:>9.2f}"
+                         + "".join(f"{100 * sd[s]:>7.1f}" for s in STREETS))
+        return "\n".join(lines)
+
+
+def _analyze_chunk(chunk: np.ndarray, actions: np.ndarray, seats: Sequence[str], report: HistoryReport):
+    n = len(chunk)
+    report.hands += n
+    outcome = chunk["outcome"]
+    showdown = outcome == Outcome.SHOWDOWN
+    report.showdowns += int(showdown.sum())
+    board_len = (chunk["board"] >= 0).sum(axis=1)
+    last_street = _BOARD_TO_STREET[board_len]
+    report.ended_on_street += np.bincount(last_street, minlength=len(STREETS))
+
+    # Действия идут подряд в порядке раздач: номер раздачи для каждого действия
+    act_hand = np.repeat(np.arange(n), chunk["num_actions"])
+    act_seat, act_street, act_code = actions["seat"], actions["street"], actions["code"]
+    preflop = act_street == 0
+    fold = act_code == ActionCode.FOLD
+    voluntary = np.isin(act_code, _VOLUNTARY)
+    aggressive = np.isin(act_code, _AGGRESSIVE)
+
+    classes = hand_class_indices(chunk["hole"])
+    net = (chunk["stack_end"] - chunk["stack_start"]) / chunk["big_blind"][:, None]
+    winners = chunk["winners"]
+    num_seats = chunk["num_seats"]
+    streets = np.arange(len(STREETS))
+
+    for seat, name in enumerate(seats):
+        dealt = (classes[:, seat] >= 0) & (num_seats > seat)
+        if not dealt.any():
+            continue
+        stats = report.players.setdefault(name, PlayerStats(name))
+        mine = act_seat == seat
+        won = ((winners >> seat) & 1).astype(bool) & dealt
+        seat_net = np.where(dealt, net[:, seat], 0.0)
+
+        stats.hands += int(dealt.sum())
+        stats.vpip_hands += len(np.unique(act_hand[preflop & mine & voluntary]))
+        stats.pfr_hands += len(np.unique(act_hand[preflop & mine & aggressive]))
+        stats.wins += int(won.sum())
+        stats.net_bb += float(seat_net.sum())
+
+        # Улица сброса (len(STREETS) — не сбрасывал); улицу s видел, если раздача до неё дошла
+        # и игрок не сбросил раньше
+        fold_street = np.full(n, len(STREETS), dtype=np.int64)
+        folded = fold & mine
+        np.minimum.at(fold_street, act_hand[folded], act_street[folded])
+        saw = dealt[:, None] & (streets[None, :] <= last_street[:, None]) \
+            & (streets[None, :] <= fold_street[:, None])
+        went = showdown & (fold_street == len(STREETS))
+        stats.saw_street += saw.sum(axis=0)
+        stats.showdown_from += (saw & went[:, None]).sum(axis=0)
+
+        cls = classes[dealt, seat]
+        report.classes.hands += np.bincount(cls, minlength=len(HAND_CLASSES))
+        report.classes.wins += np.bincount(cls, weights=won[dealt], minlength=len(HAND_CLASSES)).astype(np.int64)
+        report.classes.net_bb += np.bincount(cls, weights=seat_net[dealt], minlength=len(HAND_CLASSES))
+
+
+def analyze(paths: Union[str, Iterable[str]], chunk_hands: int = DEFAULT_CHUNK_HANDS) -> HistoryReport:
+    """Один проход по файлам истории; игроки с одинаковым именем в разных файлах суммируются."""
+    if isinstance(paths, str):
+        paths = [paths]
+    report = HistoryReport()
+    for path in paths:
+        seats = read_header(path)["seats"]
+        for hands, actions in iter_chunks(path, chunk_hands):
+            _analyze_chunk(hands, actions, seats, report)
+    return report
+
+
+def find_histories(directory: str = DEFAULT_HISTORY_DIR):
+    return sorted(glob.glob(os.path.join(directory, "*.phh")))
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description="Статистика по бинарной истории раздач")
+    parser.add_argument("paths", nargs="*", help=f"файлы истории (по умолчанию {DEFAULT_HISTORY_DIR}/*.phh)")
+    parser.add_argument("--classes", type=int, default=10, help="сколько лучших классов рук показать")
+    parser.add_argument("--json", default=None, help="куда сохранить отчёт в JSON")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or find_histories()
+    if not paths:
+        parser.error("не найдено ни одного файла истории")
+    report = analyze(paths)
+    print(report.format_table())
+    if args.classes:
+        bb = report.classes.bb_per_100
+        order = [i for i in np.argsort(-bb) if report.classes.hands[i]][:args.classes]
+        print("\nЛучшие классы рук (bb/100):")
+        for i in order:
+            print(f"  {HAND_CLASSES[i]:>4}  {bb[i]:>9.1f}  ({report.classes.hands[i]} раздач)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Массовый прогон раздач без GUI и логов: оценка стратегий на больших выборках.
+
+Основные объекты:
+- run_batch(strategies, num_hands, ...) -> BatchResult
+- BatchResult.stats[name] -> SeatStats: bb/100, доля выигранных раздач, частота вскрытий
+- CLI:
+    python -m poker.batch_runner --hands 100000 --seed 1 \\
+        --strategies simple_strategy monte_carlo_strategy aggressive_strategy
+
+Во внутреннем цикле нет print и записи в poker_game.log: симулятор получает NullLogger.
+Сброс стеков (reset_stacks):
+- "hand"  — перед каждой раздачей все стеки возвращаются к starting_stack (по умолчанию);
+- "bust"  — докупка до starting_stack только у игроков с нулевым стеком;
+- "never" — без сбросов; прогон заканчивается, когда фишки остались меньше чем у двух игроков.
+"""
+
+import argparse
+import importlib
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from utils.detailed_log import NullLogger
+from utils.profiling import Profiler
+from .equity import seed_default_rng
+from .equity_cache import clear_all_caches
+from .simulator import PokerSimulator, Player
+
+RESET_MODES = ("hand", "bust", "never")
+
+StrategySpec = Union[Callable, Tuple[str, Callable]]
+
+
+@dataclass
+class SeatStats:
+    """Накопленные результаты одного места (одной стратегии)."""
+    name: str
+    strategy: str
+    hands: int = 0          # раздач, в которых игрок получил карты
+    net_chips: int = 0      # суммарный выигрыш/проигрыш
+    wins: int = 0           # раздач, в которых игрок забрал банк (или его долю)
+    showdowns: int = 0      # раздач, дошедших для игрока до вскрытия
+    big_blind: int = 20
+
+    @property
+    def bb_per_100(self) -> float:
+        return 100.0 * self.net_chips / self.big_blind / self.hands if self.hands else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.hands if self.hands else 0.0
+
+    @property
+    def showdown_frequency(self) -> float:
+        return self.showdowns / self.hands if self.hands else 0.0
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d.update(bb_per_100=self.bb_per_100, win_rate=self.win_rate,
+                 showdown_frequency=self.showdown_frequency)
+        return d
+
+
+@dataclass
+class BatchResult:
+    hands: int
+    seconds: float
+    seed: Optional[int]
+    stats: Dict[str, SeatStats] = field(default_factory=dict)
+
+    @property
+    def hands_per_second(self) -> float:
+        return self.hands / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hands": self.hands,
+            "seconds": self.seconds,
+            "hands_per_second": self.hands_per_second,
+            "seed": self.seed,
+            "players": {name: s.to_dict() for name, s in self.stats.items()},
+        }
+
+    def format_table(self) -> str:
+        lines = [f"Раздач: {self.hands} за {self.seconds:.1f} с ({self.hands_per_second:.0f} раздач/с)",
+                 f"{'игрок':<24}{'bb/100':>10}{'win %':>9}{'SD %':>9}"]
+        for s in self.stats.values():
+            lines.append(f"{s.name:<24}{s.bb_per_100:>10.2f}{100 * s.win_rate:>9.1f}"
+                         f"{100 * s.showdown_frequency:>9.1f}")
+        return "\n".join(lines)
+
+
+def _seat_players(strategies: Sequence[StrategySpec], starting_stack: int) -> List[Player]:
+    """Игроки по порядку мест; позиции симулятор назначает от баттона в каждой раздаче."""
+    players = []
+    seen: Dict[str, int] = {}
+    for spec in strategies:
+        name, fn = spec if isinstance(spec, tuple) else (spec.__name__, spec)
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}#{seen[name]}"
+        players.append(Player(name, fn, stack=starting_stack))
+    return players
+
+
+def reset_random_state(seed: Optional[int]):
+    """
+    Общее случайное состояние, которым пользуются стратегии: глобальный random,
+    генератор эквити по умолчанию и кэши эквити (их содержимое зависит от истории вызовов).
+    """
+    random.seed(seed)
+    seed_default_rng(seed)
+    clear_all_caches()
+
+
+def run_batch(strategies: Sequence[StrategySpec], num_hands: int, big_blind: int = 20,
+              starting_stack: int = 1000, seed: Optional[int] = None, reset_stacks: str = "hand",
+              history: Optional[str] = None) -> BatchResult:
+    """
+    Играет num_hands раздач между стратегиями (функции или пары (имя, функция)).
+    seed задаёт колоду симулятора и случайное состояние стратегий (reset_random_state),
+    поэтому прогон с seed полностью воспроизводим. history — путь для бинарной истории раздач.
+    """
+    if reset_stacks not in RESET_MODES:
+        raise ValueError(f"reset_stacks must be one of {RESET_MODES}, got {reset_stacks!r}")
+    players = _seat_players(strategies, starting_stack)
+    # С seed симулятор сам отключает часы в бюджете времени стратегий (deterministic_sampling)
+    sim = PokerSimulator(players, big_blind=big_blind, rng=seed, logger=NullLogger(), history=history)
+    if seed is not None:
+        reset_random_state(seed)
+    stats = {p.name: SeatStats(p.name, p.strategy.__name__, big_blind=big_blind) for p in players}
+
+    started = time.perf_counter()
+    played = 0
+    for _ in range(num_hands):
+        for p in players:
+            if reset_stacks == "hand" or (reset_stacks == "bust" and p.stack <= 0):
+                p.stack = starting_stack
+        if sum(1 for p in players if p.stack > 0) < 2:
+            break
+
+        before = [p.stack for p in players]
+        result = sim.play_hand(verbose=False)
+        played += 1
+
+        if result["action"] == "showdown":
+            winners = set(result["winners"])
+        else:
+            winners = {result.get("winner")}
+        showdown = result["action"] == "showdown"
+        for p, stack_before in zip(players, before):
+            if not p.hand:
+                continue
+            s = stats[p.name]
+            s.hands += 1
+            s.net_chips += p.stack - stack_before
+            if p.name in winners:
+                s.wins += 1
+            if showdown and not p.folded:
+                s.showdowns += 1
+
+    sim.close()
+    return BatchResult(hands=played, seconds=time.perf_counter() - started, seed=seed, stats=stats)
+
+
+def resolve_strategy(name: str) -> Callable:
+    """'simple_strategy' (из ai.basic_strategy) или 'package.module:function' -> функция."""
+    module_name, _, attr = name.rpartition(":")
+    module = importlib.import_module(module_name or "ai.basic_strategy")
+    return getattr(module, attr)
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description="Массовый прогон раздач без логов")
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--strategies", nargs="+",
+                        default=["simple_strategy", "monte_carlo_strategy", "aggressive_strategy"])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--big-blind", type=int, default=20)
+    parser.add_argument("--stack", type=int, default=1000)
+    parser.add_argument("--reset", choices=RESET_MODES, default="hand")
+    parser.add_argument("--json", default=None, help="куда сохранить результат в JSON")
+    parser.add_argument("--history", default=None, help="куда писать бинарную историю раздач")
+    parser.add_argument("--profile", default=None, nargs="?", const="-",
+                        help="задержки решений стратегий (utils.profiling); с путём — ещё и JSON")
+    args = parser.parse_args(argv)
+
+    strategies = [(name.rpartition(":")[2], resolve_strategy(name)) for name in args.strategies]
+    profiler = Profiler().enable() if args.profile else None
+    result = run_batch(strategies, args.hands, big_blind=args.big_blind, starting_stack=args.stack,
+                       seed=args.seed, reset_stacks=args.reset, history=args.history)
+    print(result.format_table())
+    if profiler is not None:
+        profiler.disable()
+        print("\n" + profiler.format_report())
+        if args.profile != "-":
+            profiler.save(args.profile)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
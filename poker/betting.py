@@ -0,0 +1,427 @@
+"""
+Движок торговли Texas Hold'em: блайнды, круги до закрытия, минимальный рейз, сайд-поты.
+
+Основные объекты:
+- Action                            : коды действий — то же перечисление, что hand_history.ActionCode
+                                      (FOLD, CALL, RAISE, BLUFF_RAISE, ALLIN, CHECK, BLIND)
+- parse_action(value) -> Decision   : ответ стратегии ("raise_2x", "raise_pot", Action.CALL,
+                                      (Action.RAISE, 120)) -> код и способ расчёта размера;
+                                      каждая строка разбирается один раз
+- BettingState                      : состояние раздачи в параллельных списках по местам
+                                      (стек, ставка на улице, вклад в банк, статус)
+- state.start_hand(stacks, button)  : новая раздача, блайнды; state.begin_street() — следующая улица
+- state.apply(seat, decision)       : решение по правилам -> (фактическое действие, фишки)
+- state.first_to_act()/next_to_act(): очередь хода; None — круг закрыт
+- play_round(state, decide)         : круг торговли целиком (для кода без симулятора)
+- state.side_pots() / state.settle(strengths) : основной банк и сайд-поты, раздача выигрыша
+
+Правила:
+- Круг идёт, пока каждый активный игрок не ответил на последнюю ставку; префлоп первым ходит
+  место после большого блайнда, постфлоп — после баттона (хедз-ап: баттон ставит малый блайнд).
+- Рейз — минимум на размер предыдущего полного рейза (на первой ставке — big blind);
+  меньший рейз дотягивается до минимума, а если на него не хватает стека — это all-in.
+- All-in меньше минимального рейза не открывает торговлю заново: кто уже ходил, может только
+  уравнять или сбросить.
+- Фолд без ставки против себя — чек; чек против ставки — фолд.
+- Банк делится по вкладам: у каждого сайд-пота свои претенденты; при равных руках нечётные
+  фишки достаются первым по часовой стрелке от баттона.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .hand_history import ActionCode
+
+Action = ActionCode
+
+# Статус места в раздаче
+ACTIVE = 0   # в игре и может ставить
+FOLDED = 1
+ALLIN = 2    # в игре, фишек больше нет
+OUT = 3      # не участвует в раздаче (нет стека)
+
+# Как считается размер рейза
+SIZE_NONE = 0   # без размера: фолд, чек, колл, all-in
+SIZE_MULT = 1   # до factor × текущая ставка (без ставки — × big blind)
+SIZE_POT = 2    # на factor × банк после колла
+SIZE_TO = 3     # до factor фишек; 0 — минимальный рейз
+
+_RAISES = (Action.RAISE, Action.BLUFF_RAISE)
+
+
+@dataclass(frozen=True)
+class Decision:
+    action: Action
+    sizing: int = SIZE_NONE
+    factor: float = 0.0
+
+
+_SIMPLE = {
+    "fold": Decision(Action.FOLD),
+    "check": Decision(Action.CHECK),
+    "call": Decision(Action.CALL),
+    "allin": Decision(Action.ALLIN),
+    "all_in": Decision(Action.ALLIN),
+    "raise": Decision(Action.RAISE, SIZE_TO, 0),
+    "bluff_raise": Decision(Action.BLUFF_RAISE, SIZE_TO, 0),
+}
+_PARSED: Dict[str, Decision] = dict(_SIMPLE)
+
+
+def _parse_string(text: str) -> Decision:
+    name = text.strip().lower()
+    if name in _SIMPLE:
+        return _SIMPLE[name]
+    code = Action.RAISE
+    if name.startswith("bluff_"):
+        code = Action.BLUFF_RAISE
+        name = name[len("bluff_"):]
+    if name.startswith("raise_"):
+        size = name[len("raise_"):]
+        try:
+            if size == "pot":
+                return Decision(code, SIZE_POT, 1.0)
+            if size == "half":
+                return Decision(code, SIZE_POT, 0.5)
+            if size.endswith("x"):
+                return Decision(code, SIZE_MULT, float(size[:-1]))
+            return Decision(code, SIZE_TO, int(size))
+        except ValueError:
+            pass
+    raise ValueError(f"unknown action {text!r}")
+
+
+def parse_action(value) -> Decision:
+    """
+    Ответ стратегии -> Decision. Понимает строки ("fold", "check", "call", "allin", "raise_2x",
+    "raise_pot", "raise_half", "raise_120", "bluff_raise_3x"), Action и пары (Action, сумма рейза).
+    """
+    if isinstance(value, Decision):
+        return value
+    if isinstance(value, str):
+        decision = _PARSED.get(value)
+        if decision is None:
+            decision = _PARSED[value] = _parse_string(value)
+        return decision
+    if isinstance(value, tuple):
+        code, amount = value
+        code = Action(code)
+        if code in _RAISES:
+            return Decision(code, SIZE_TO, amount)
+        return Decision(code)
+    return Decision(Action(value))
+
+
+@dataclass
+class Pot:
+    amount: int
+    eligible: List[int]                              # места, которые могут выиграть этот банк
+    winners: List[int] = field(default_factory=list)  # заполняет settle()
+
+
+class BettingState:
+    """
+    Состояние торговли одной раздачи. Все поля по местам — списки длины num_seats
+    (структура массивов): симулятор и стратегии читают их без промежуточных объектов.
+    """
+
+    __slots__ = ("num_seats", "big_blind", "small_blind", "stacks", "bets", "contributed", "status",
+                 "acted", "can_raise", "button", "street", "current_bet", "min_raise", "live", "total")
+
+    def __init__(self, num_seats: int, big_blind: int, small_blind: Optional[int] = None):
+        if num_seats < 2:
+            raise ValueError("Нужно хотя бы 2 места")
+        self.num_seats = num_seats
+        self.big_blind = big_blind
+        self.small_blind = big_blind // 2 if small_blind is None else small_blind
+        self.stacks = [0] * num_seats
+        self.bets = [0] * num_seats          # поставлено на текущей улице
+        self.contributed = [0] * num_seats   # вложено в банк за раздачу
+        self.status = [OUT] * num_seats
+        self.acted = [False] * num_seats     # ответил на текущую ставку
+        self.can_raise = [True] * num_seats  # False — после неполного all-in-рейза
+        self.button = 0
+        self.street = 0
+        self.current_bet = 0
+        self.min_raise = big_blind
+        self.live = 0    # мест в игре (не сбросили карты), поддерживается по ходу раздачи
+        self.total = 0   # банк: сумма contributed
+
+    # --- раздача и улицы ---
+
+    def start_hand(self, stacks: Sequence[int], button: int) -> List[Tuple[int, int]]:
+        """
+        Новая раздача: места с нулевым стеком не участвуют. Ставит блайнды и открывает
+        префлоп; возвращает [(место, сумма)] блайндов (пусто, если участников меньше двух).
+        """
+        n = self.num_seats
+        for seat in range(n):
+            stack = stacks[seat]
+            self.stacks[seat] = stack
+            self.status[seat] = ACTIVE if stack > 0 else OUT
+        self.bets[:] = [0] * n
+        self.contributed[:] = [0] * n
+        self.live = n - self.status.count(OUT)
+        self.total = 0
+        self.button = button
+        self.street = 0
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        blinds = []
+        seats = self.blind_seats()
+        if seats is not None:
+            sb, bb = seats
+            blinds.append((sb, self._put(sb, self.small_blind)))
+            blinds.append((bb, self._put(bb, self.big_blind)))
+            # Короткий большой блайнд не уменьшает ставку, которую надо уравнять
+            self.current_bet = self.big_blind
+        self._open_round()
+        return blinds
+
+    def begin_street(self):
+        """Следующая улица: ставки обнуляются, минимальная ставка — big blind."""
+        self.street += 1
+        self.bets[:] = [0] * self.num_seats
+        self.current_bet = 0
+        self.min_raise = self.big_blind
+        self._open_round()
+
+    def _open_round(self):
+        # Торговать не с кем — единственному активному игроку ходить нужно, только если
+        # он не уравнял all-in соперника
+        lone = sum(1 for s in self.status if s == ACTIVE) < 2
+        for seat in range(self.num_seats):
+            self.can_raise[seat] = True
+            self.acted[seat] = lone and self.bets[seat] >= self.current_bet
+
+    def _next(self, seat: int, statuses: Tuple[int, ...]) -> int:
+        n = self.num_seats
+        for step in range(1, n + 1):
+            s = (seat + step) % n
+            if self.status[s] in statuses:
+                return s
+        return -1
+
+    def blind_seats(self) -> Optional[Tuple[int, int]]:
+        """(малый, большой) блайнд; хедз-ап малый ставит баттон. None — участников меньше двух."""
+        dealt = (ACTIVE, ALLIN, FOLDED)
+        players = sum(1 for s in self.status if s != OUT)
+        if players < 2:
+            return None
+        sb = self.button if players == 2 else self._next(self.button, dealt)
+        return sb, self._next(sb, dealt)
+
+    # --- очередь хода ---
+
+    def first_to_act(self) -> Optional[int]:
+        if self.street == 0:
+            seats = self.blind_seats()
+            start = seats[1] if seats is not None else self.button
+        else:
+            start = self.button
+        return self.next_to_act(start)
+
+    def next_to_act(self, seat: int) -> Optional[int]:
+        """Следующее после seat место, которому нужно ходить; None — круг закрыт."""
+        if self.live < 2:
+            return None
+        n = self.num_seats
+        status, acted = self.status, self.acted
+        for step in range(1, n + 1):
+            s = (seat + step) % n
+            if status[s] == ACTIVE and not acted[s]:
+                return s
+        return None
+
+    # --- чтение состояния ---
+
+    @property
+    def pot(self) -> int:
+        return self.total
+
+    def in_hand(self) -> List[int]:
+        """Места, не сбросившие карты (включая all-in)."""
+        return [s for s in range(self.num_seats) if self.status[s] in (ACTIVE, ALLIN)]
+
+    def to_call(self, seat: int) -> int:
+        return max(0, min(self.current_bet - self.bets[seat], self.stacks[seat]))
+
+    def min_raise_to(self) -> int:
+        return self.current_bet + self.min_raise
+
+    def raise_target(self, seat: int, decision: Decision) -> int:
+        """До какой суммы на улице рейзит игрок по decision (до применения минимума и стека)."""
+        sizing = decision.sizing
+        if sizing == SIZE_MULT:
+            return int((self.current_bet or self.big_blind) * decision.factor)
+        if sizing == SIZE_POT:
+            to_call = self.current_bet - self.bets[seat]
+            return self.current_bet + int(decision.factor * (self.pot + to_call))
+        return int(decision.factor)
+
+    # --- действия ---
+
+    def _put(self, seat: int, amount: int) -> int:
+        amount = min(amount, self.stacks[seat])
+        self.stacks[seat] -= amount
+        self.bets[seat] += amount
+        self.contributed[seat] += amount
+        self.total += amount
+        if self.stacks[seat] == 0 and self.status[seat] == ACTIVE:
+            self.status[seat] = ALLIN
+        return amount
+
+    def _raised(self, seat: int, target: int):
+        increment = target - self.current_bet
+        full = increment >= self.min_raise
+        for s in range(self.num_seats):
+            if s == seat or self.status[s] != ACTIVE:
+                continue
+            if full:
+                self.can_raise[s] = True
+            elif self.acted[s]:
+                # Неполный рейз: уже ходившие могут только уравнять или сбросить
+                self.can_raise[s] = False
+            self.acted[s] = False
+        if full:
+            self.min_raise = increment
+        self.current_bet = target
+        self.acted[seat] = True
+
+    def apply(self, seat: int, decision) -> Tuple[Action, int]:
+        """
+        Применяет решение места seat с поправкой на правила; возвращает фактическое действие
+        и число фишек, которые игрок доложил этим действием.
+        """
+        decision = parse_action(decision)
+        code = decision.action
+        to_call = self.current_bet - self.bets[seat]
+        stack = self.stacks[seat]
+
+        if code == Action.CHECK and to_call > 0:
+            code = Action.FOLD
+        if code == Action.FOLD:
+            if to_call <= 0:
+                code = Action.CHECK
+            else:
+                self.status[seat] = FOLDED
+                self.live -= 1
+                self.acted[seat] = True
+                return Action.FOLD, 0
+
+        if code in _RAISES:
+            others = any(self.status[s] == ACTIVE for s in range(self.num_seats) if s != seat)
+            if not (self.can_raise[seat] and others) or stack <= to_call:
+                code = Action.CALL
+            else:
+                target = max(self.raise_target(seat, decision), self.min_raise_to())
+                if target >= self.bets[seat] + stack:
+                    code = Action.ALLIN
+                else:
+                    amount = self._put(seat, target - self.bets[seat])
+                    self._raised(seat, target)
+                    return code, amount
+
+        if code == Action.ALLIN:
+            amount = self._put(seat, stack)
+            if self.bets[seat] > self.current_bet:
+                self._raised(seat, self.bets[seat])
+            else:
+                self.acted[seat] = True
+            return Action.ALLIN, amount
+
+        self.acted[seat] = True
+        if to_call <= 0:
+            return Action.CHECK, 0
+        return Action.CALL, self._put(seat, to_call)
+
+    # --- банк ---
+
+    def side_pots(self) -> List[Pot]:
+        """
+        Основной банк и сайд-поты по вкладам игроков, не сбросивших карты. Фишки сбросивших
+        входят в банки до уровня их вклада; непокрытая ставка возвращается владельцу
+        банком с единственным претендентом.
+        """
+        contributed, status = self.contributed, self.status
+        live = self.in_hand()
+        pots: List[Pot] = []
+        prev = 0
+        for level in sorted({contributed[s] for s in live}):
+            if level == prev:
+                continue
+            amount = sum(min(c, level) - min(c, prev) for c in contributed)
+            eligible = [s for s in live if contributed[s] >= level]
+            if pots and pots[-1].eligible == eligible:
+                pots[-1].amount += amount
+            else:
+                pots.append(Pot(amount, eligible))
+            prev = level
+        # Вклад сбросивших сверх самого большого вклада оставшихся — в последний банк
+        dead = sum(contributed) - sum(p.amount for p in pots)
+        if dead:
+            if pots:
+                pots[-1].amount += dead
+            elif live:
+                pots.append(Pot(dead, live))
+        return pots
+
+    def settle(self, strengths: Optional[Sequence] = None) -> List[Pot]:
+        """
+        Раздаёт банки: strengths — сила руки по местам (больше — лучше), нужна только если
+        на банк претендуют двое и больше. Выигрыш зачисляется в stacks; вызывается один раз
+        за раздачу (вклады остаются до start_hand, чтобы pot показывал разыгранный банк).
+        """
+        n = self.num_seats
+        order = [(self.button + step) % n for step in range(1, n + 1)]
+        pots = self.side_pots()
+        for pot in pots:
+            eligible = pot.eligible
+            if len(eligible) == 1:
+                winners = eligible
+            else:
+                best = max(strengths[s] for s in eligible)
+                winners = [s for s in order if s in eligible and strengths[s] == best]
+            share, odd = divmod(pot.amount, len(winners))
+            for i, s in enumerate(winners):
+                self.stacks[s] += share + (1 if i < odd else 0)
+            pot.winners = winners
+        return pots
+
+
+def play_round(state: BettingState, decide: Callable[[int], object],
+               on_action: Optional[Callable[[int, Action, int], None]] = None):
+    """Круг торговли до закрытия: decide(seat) -> ответ стратегии; on_action(seat, код, фишки)."""
+    seat = state.first_to_act()
+    while seat is not None:
+        code, amount = state.apply(seat, decide(seat))
+        if on_action is not None:
+            on_action(seat, code, amount)
+        seat = state.next_to_act(seat)
+
+
+POSITION_NAMES = {
+    2: ("BTN", "BB"),
+    3: ("BTN", "SB", "BB"),
+    4: ("BTN", "SB", "BB", "CO"),
+    5: ("BTN", "SB", "BB", "UTG", "CO"),
+    6: ("BTN", "SB", "BB", "UTG", "MP", "CO"),
+}
+
+
+def position_names(n: int) -> Tuple[str, ...]:
+    """Названия позиций по часовой стрелке от баттона для n участников."""
+    if n in POSITION_NAMES:
+        return POSITION_NAMES[n]
+    if n < 2:
+        return ("BTN",)[:n]
+    middle = n - 6
+    return ("BTN", "SB", "BB", "UTG") + tuple(f"UTG+{i}" for i in range(1, middle + 1)) + ("MP", "CO")
+
+
+# Пример использования:
+# >>> state = BettingState(3, big_blind=20)
+# >>> state.start_hand([1000, 50, 1000], button=0)   # [(1, 10), (2, 20)]
+# >>> state.apply(0, "raise_pot")                    # (Action.RAISE, 70)
+# >>> state.apply(1, "allin"); state.apply(2, "call")
+# >>> [(p.amount, p.eligible) for p in state.side_pots()]   # [(150, [0, 1, 2]), (40, [0, 2])]
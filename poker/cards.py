@@ -3,17 +3,17 @@
 
 Основные типы:
 - Card : объект карты (rank, suit)
-- Deck : стандартная колода на 52 карты, умеет тасовать и сдавать
+- Deck : колода на 52 карты (минус мёртвые карты) с курсором сдачи и частичным тасованием
 - helpers: parse_card (строка -> Card), card_str (Card -> строка)
+- целочисленное представление: id 0..51, таблица CARDS, маски (to_ids, cards_to_mask, mask_to_ids)
 
 Формат строковых карт: 'As' = туз пик, 'Td' = десятка бубен, '2c' = двойка треф и т.д.
 Ranks: 2-9, T, J, Q, K, A
 Suits: s (spades), h (hearts), d (diamonds), c (clubs)
 """
 
-from dataclasses import dataclass
 import random
-from typing import List
+from typing import Iterable, List, Tuple, Union
 
 RANK_STR_TO_INT = {
     '2': 2, '3': 3, '4': 4, '5': 5,
@@ -26,20 +26,88 @@ INT_TO_RANK_STR = {v: k for k, v in RANK_STR_TO_INT.items()}
 SUITS = {'s', 'h', 'd', 'c'}
 SUIT_SYMBOLS = {'s': '♠', 'h': '♥', 'd': '♦', 'c': '♣'}
 
+# Порядок мастей в целочисленном id совпадает со строковым порядком ('c' < 'd' < 'h' < 's'),
+# поэтому сравнение id даёт тот же порядок, что и сравнение (rank, suit).
+SUIT_ORDER = 'cdhs'
+SUIT_INDEX = {s: i for i, s in enumerate(SUIT_ORDER)}
+
 
-@dataclass(frozen=True, order=True)
 class Card:
-    rank: int  # 2..14
-    suit: str  # 's','h','d','c'
+    """
+    Карта — неизменяемый «вид» на целый id 0..51: id = (rank - 2) * 4 + SUIT_INDEX[suit].
+
+    Все 52 карты создаются один раз (таблица CARDS); Card(rank, suit) и parse_card
+    возвращают готовый экземпляр, поэтому карты можно сравнивать и по `is`.
+    Атрибуты: rank (2..14), suit ('s','h','d','c'), id (0..51), mask (1 << id).
+    """
+
+    __slots__ = ('rank', 'suit', 'id', 'mask', '_str')
+
+    def __new__(cls, rank: int, suit: str):
+        try:
+            return _BY_RANK_SUIT[(rank, suit)]
+        except (KeyError, TypeError):
+            pass
+        if suit not in SUITS:
+            raise ValueError(f"Invalid suit: {suit}")
+        raise ValueError(f"Invalid rank: {rank}")
+
+    @classmethod
+    def _create(cls, card_id: int) -> "Card":
+        self = object.__new__(cls)
+        rank, suit = card_id // 4 + 2, SUIT_ORDER[card_id % 4]
+        object.__setattr__(self, 'rank', rank)
+        object.__setattr__(self, 'suit', suit)
+        object.__setattr__(self, 'id', card_id)
+        object.__setattr__(self, 'mask', 1 << card_id)
+        object.__setattr__(self, '_str', f"{INT_TO_RANK_STR[rank]}{suit}")
+        return self
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        return card_from_id, (self.id,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
-    def __post_init__(self):
-        if self.suit not in SUITS:
-            raise ValueError(f"Invalid suit: {self.suit}")
-        if not (2 <= self.rank <= 14):
-            raise ValueError(f"Invalid rank: {self.rank}")
+    def __hash__(self) -> int:
+        return self.id
+
+    def __eq__(self, other):
+        if isinstance(other, Card):
+            return self.id == other.id
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Card):
+            return self.id < other.id
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Card):
+            return self.id <= other.id
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Card):
+            return self.id > other.id
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Card):
+            return self.id >= other.id
+        return NotImplemented
 
     def __str__(self) -> str:
-        return f"{INT_TO_RANK_STR[self.rank]}{self.suit}"
+        return self._str
 
     def __repr__(self) -> str:
         return f"Card({self.rank}, '{self.suit}')"
@@ -52,11 +120,27 @@ class Card:
         return INT_TO_RANK_STR[self.rank]
 
 
+# Таблица-синглтон: CARDS[id] — единственный экземпляр карты с этим id
+CARDS: Tuple[Card, ...] = tuple(Card._create(i) for i in range(52))
+_BY_RANK_SUIT = {(c.rank, c.suit): c for c in CARDS}
+_BY_STR = {str(c): c for c in CARDS}
+
+CardLike = Union[Card, int, str]
+
+
+def card_from_id(card_id: int) -> Card:
+    """id 0..51 -> Card"""
+    return CARDS[card_id]
+
+
 def parse_card(s: str) -> Card:
     """
     Парсит строку в карту.
     Примеры: 'As', 'Td', '2c'
     """
+    card = _BY_STR.get(s)
+    if card is not None:
+        return card
     if not isinstance(s, str) or len(s) != 2:
         raise ValueError(f"Card string must be 2 chars like 'As', got {s!r}")
     r, suit = s[0].upper(), s[1].lower()
@@ -64,7 +148,12 @@ def parse_card(s: str) -> Card:
         raise ValueError(f"Invalid rank symbol: {r!r}")
     if suit not in SUITS:
         raise ValueError(f"Invalid suit: {suit!r}")
-    return Card(rank=RANK_STR_TO_INT[r], suit=suit)
+    return _BY_RANK_SUIT[(RANK_STR_TO_INT[r], suit)]
+
+
+def card_str(card: Card) -> str:
+    """Card -> строка вида 'As'"""
+    return card._str
 
 
 def card_from_tuple(tup):
@@ -73,32 +162,151 @@ def card_from_tuple(tup):
     return Card(rank=int(r), suit=s)
 
 
+def to_ids(cards: Union[int, Iterable[CardLike]]) -> List[int]:
+    """
+    Нормализует руку/борд в список id.
+    Принимает 64-битную маску (int) или последовательность из Card, id (int) или строк.
+    """
+    if isinstance(cards, int):
+        return mask_to_ids(cards)
+    ids = []
+    for c in cards:
+        if isinstance(c, Card):
+            ids.append(c.id)
+        elif isinstance(c, int):
+            if not 0 <= c < 52:
+                raise ValueError(f"Invalid card id: {c}")
+            ids.append(c)
+        else:
+            ids.append(parse_card(c).id)
+    return ids
+
+
+def to_cards(cards: Union[int, Iterable[CardLike]]) -> List[Card]:
+    """То же, что to_ids, но возвращает объекты Card."""
+    return [CARDS[i] for i in to_ids(cards)]
+
+
+def cards_to_mask(cards: Union[int, Iterable[CardLike]]) -> int:
+    """Рука/борд -> 64-битная маска (бит id установлен для каждой карты)."""
+    if isinstance(cards, int):
+        return cards
+    mask = 0
+    for i in to_ids(cards):
+        mask |= 1 << i
+    return mask
+
+
+def mask_to_ids(mask: int) -> List[int]:
+    """64-битная маска -> список id по возрастанию."""
+    if mask >> 52:
+        raise ValueError(f"Invalid card mask: {mask:#x}")
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return ids
+
+
+_ALL_IDS = tuple(range(52))
+
+
 class Deck:
-    """Стандартная колода 52 карты."""
+    """
+    Стандартная колода 52 карты без перевыделения памяти.
+
+    Живые карты (без мёртвых из маски dead) лежат в заранее выделенном списке id,
+    позиция сдачи — курсор. shuffle() только включает случайную сдачу, а deal(n)
+    делает n шагов Фишера–Йетса: перемешивается ровно столько карт, сколько сдано.
+    reset() возвращает сданные карты в колоду за O(1) — список остаётся перестановкой
+    живых карт, сдвигается только курсор. Порядок сдачи полностью задаётся rng.
+    """
 
-    def __init__(self, rng=None):
-        self.cards: List[Card] = [Card(rank=r, suit=s) for s in SUITS for r in range(2, 15)]
+    __slots__ = ('rng', 'dead', '_ids', '_size', '_pos', '_random', '_shuffled')
+
+    def __init__(self, rng=None, dead: Union[int, Iterable[CardLike]] = 0):
         self.rng = rng or random.Random()
+        self._random = self.rng.random
+        self._ids: List[int] = list(_ALL_IDS)
+        self.reset(dead)
+
+    def reset(self, dead: Union[int, Iterable[CardLike], None] = None, restore: bool = False):
+        """
+        Возвращает все карты в колоду (без перемешивания). dead — новая маска/список
+        мёртвых карт; None — оставить прежние. restore=True — вернуть карты в порядок id,
+        чтобы следующая сдача зависела только от состояния rng, а не от прошлых раздач.
+        """
+        if dead is None and restore:
+            dead = self.dead
+        if dead is not None:
+            dead = cards_to_mask(dead)
+            if dead >> 52:
+                raise ValueError(f"Invalid card mask: {dead:#x}")
+            ids = self._ids
+            if dead:
+                size = 0
+                for i in range(52):
+                    if not dead >> i & 1:
+                        ids[size] = i
+                        size += 1
+            else:
+                ids[:] = _ALL_IDS
+                size = 52
+            self.dead = dead
+            self._size = size
+        self._pos = 0
+        self._shuffled = False
+
+    def remove(self, cards: Union[int, Iterable[CardLike]]):
+        """Убирает карты из колоды (добавляет к dead) и возвращает сданные карты обратно."""
+        self.reset(self.dead | cards_to_mask(cards))
 
     def shuffle(self):
-        self.rng.shuffle(self.cards)
+        """Дальнейшая сдача — случайная (частичный Фишер–Йетс в deal)."""
+        self._shuffled = True
 
-    def deal(self, n=1) -> List[Card]:
+    def deal_ids(self, n=1) -> List[int]:
+        """Как deal, но id карт — без создания списка Card."""
         if n < 1:
             return []
-        if n > len(self.cards):
+        pos, end = self._pos, self._pos + n
+        if end > self._size:
             raise ValueError("Not enough cards to deal")
-        dealt = self.cards[:n]
-        self.cards = self.cards[n:]
-        return dealt
+        ids = self._ids
+        if self._shuffled:
+            rand, size = self._random, self._size
+            for i in range(pos, end):
+                j = i + int(rand() * (size - i))
+                ids[i], ids[j] = ids[j], ids[i]
+        self._pos = end
+        return ids[pos:end]
+
+    def deal(self, n=1) -> List[Card]:
+        return [CARDS[i] for i in self.deal_ids(n)]
 
     def burn(self, n=1):
-        self.deal(n)
+        self.deal_ids(n)
+
+    @property
+    def cards(self) -> List[Card]:
+        """Оставшиеся карты в текущем порядке (после shuffle порядок ещё не определён)."""
+        return [CARDS[i] for i in self._ids[self._pos:self._size]]
+
+    @property
+    def mask(self) -> int:
+        """Маска карт, которых в колоде нет: мёртвые и уже сданные."""
+        mask = self.dead
+        for i in self._ids[:self._pos]:
+            mask |= 1 << i
+        return mask
 
     def __len__(self):
-        return len(self.cards)
+        return self._size - self._pos
 
 # Примеры использования:
 # >>> from poker.cards import parse_card, Deck
 # >>> parse_card('As')  # A of spades
 # >>> d = Deck(); d.shuffle(); d.deal(2)
+# >>> d = Deck(random.Random(1), dead=cards_to_mask(['As', 'Kd'])); d.shuffle(); d.deal_ids(5)
+# >>> d.reset(); d.shuffle()  # та же колода для следующего розыгрыша
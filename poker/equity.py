@@ -0,0 +1,535 @@
+"""
+Оценка эквити руки (шанса победы) против случайных рук соперников.
+
+Основные функции:
+- evaluate_batch(cards: np.ndarray) -> np.ndarray — векторная оценка силы N рук (N x 5..7 id карт)
+- evaluate_keys(key, suit_bits) -> np.ndarray — то же по аддитивным ключам рук (сумма ключей карт)
+- monte_carlo_equity(hero, board, num_opponents, num_simulations, rng) -> EquityResult
+  Сэмплирует все розыгрыши разом: добор борда и руки соперников — массивы NumPy,
+  оценка — табличные lookup'ы по тем же таблицам, что и poker/fast_evaluator.py.
+- exact_equity(hero, board, num_opponents, thresholds=None) -> EquityResult
+  Полный перебор достроек борда и рук соперников; достройки, изоморфные по мастям,
+  считаются один раз с весом. С thresholds перебор останавливается, как только
+  гарантированные границы эквити не пересекают ни один порог.
+- anytime_equity(hero, board, num_opponents, thresholds, time_budget) -> EquityResult
+  Монте-Карло пачками растущего размера, пока доверительный интервал не окажется целиком
+  по одну сторону каждого порога решения или не кончится бюджет времени/выборок.
+- equity(..., mode="auto") — выбирает точный перебор или сэмплирование по размеру пространства.
+
+Карты принимаются в любом виде, который понимает poker.cards.to_ids (Card, id, строки, маска).
+rng: None, int (seed), numpy.random.Generator, poker.rng.RandomStream или random.Random (из него берётся seed).
+"""
+
+import math
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import combinations
+from math import comb, factorial
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cards import Deck, cards_to_mask, to_ids
+from .isomorphism import PERMUTED, stabilizer
+from .rng import RandomStream
+from . import fast_evaluator
+from .fast_evaluator import (
+    CARD_KEY, FLUSH_STRENGTH, RANK_KEY_MASK, SUIT_BIT, SUIT_SHIFT, HandState, build_rank_table,
+    evaluate_ids,
+)
+
+# Сколько розыгрышей обрабатывать за один проход (ограничивает память на временные массивы)
+DEFAULT_BATCH_SIZE = 20000
+
+# Режим "auto": точный перебор, если исходов не больше этого числа (терн/ривер хедз-ап, ривер 3-way)
+EXACT_STATE_LIMIT = 500000
+# Больше этого exact_equity не перебирает вовсе (наборы рук соперников не помещаются в память)
+EXACT_STATE_HARD_LIMIT = 5000000
+
+# anytime_equity: первая пачка, z-квантиль интервала (~95%), точность без порогов
+ANYTIME_FIRST_BATCH = 256
+ANYTIME_Z = 1.96
+ANYTIME_PRECISION = 0.01
+# С бюджетом времени "auto" перебирает точно только совсем маленькие пространства (ривер хедз-ап)
+ANYTIME_EXACT_LIMIT = 2000
+
+
+@dataclass
+class EquityResult:
+    """
+    Итог расчёта эквити: количества побед/ничьих/поражений героя.
+    exact  — результат получен полным перебором;
+    bounds — (нижняя, верхняя) гарантированные границы эквити, если перебор остановлен досрочно,
+             или доверительный интервал, на котором остановилась anytime_equity;
+    timed_out — размер выборки anytime_equity ограничили часы: результат зависит от скорости машины.
+    """
+    wins: int
+    ties: int
+    losses: int
+    exact: bool = False
+    bounds: Optional[Tuple[float, float]] = None
+    timed_out: bool = False
+
+    @property
+    def total(self) -> int:
+        return self.wins + self.ties + self.losses
+
+    @property
+    def win_rate(self) -> float:
+        """
+        Доля побед, ничья считается за половину (как в estimate_win_rate).
+        После досрочной остановки — оценка по просмотренной части, зажатая в bounds.
+        """
+        if not self.total:
+            return 0.0
+        rate = (self.wins + self.ties * 0.5) / self.total
+        if self.bounds is not None:
+            rate = min(max(rate, self.bounds[0]), self.bounds[1])
+        return rate
+
+    def confidence_interval(self, z: float = ANYTIME_Z) -> Tuple[float, float]:
+        """Нормальный интервал для win_rate по выборке (ничья = 0.5 победы)."""
+        n = self.total
+        if not n:
+            return 0.0, 1.0
+        mean = (self.wins + self.ties * 0.5) / n
+        var = max((self.wins + self.ties * 0.25) / n - mean * mean, 0.0)
+        half = z * math.sqrt(var / n)
+        return max(mean - half, 0.0), min(mean + half, 1.0)
+
+    def __add__(self, other: "EquityResult") -> "EquityResult":
+        return EquityResult(self.wins + other.wins, self.ties + other.ties, self.losses + other.losses)
+
+
+class _Tables:
+    """NumPy-версии таблиц быстрого оценщика (строятся один раз, лениво)."""
+
+    def __init__(self):
+        rank_table = build_rank_table()
+        keys = np.fromiter(rank_table.keys(), dtype=np.int64, count=len(rank_table))
+        values = np.fromiter(rank_table.values(), dtype=np.int32, count=len(rank_table))
+        order = np.argsort(keys)
+        self.rank_keys = keys[order]
+        self.rank_values = values[order]
+        self.flush_strength = np.asarray(FLUSH_STRENGTH, dtype=np.int32)
+        # Ключ карты как в fast_evaluator: пятеричный счётчик рангов + 3-битные счётчики мастей
+        self.card_key = np.asarray(CARD_KEY, dtype=np.int64)
+        self.suit_bit = np.asarray(SUIT_BIT, dtype=np.int64)
+
+
+_tables: Optional[_Tables] = None
+
+
+def _get_tables() -> _Tables:
+    global _tables
+    if _tables is None:
+        _tables = _Tables()
+    return _tables
+
+
+def evaluate_keys(key: np.ndarray, suit_bits: np.ndarray) -> np.ndarray:
+    """
+    Векторная оценка по аддитивным ключам: key — сумма CARD_KEY карт руки,
+    suit_bits — сумма SUIT_BIT (13-битные маски рангов каждой масти, по 16 бит на масть).
+    Обе суммы можно собирать по частям (рука + борд), поэтому общий борд считается один раз.
+    """
+    counter = fast_evaluator.eval_counter
+    if counter is not None:
+        counter.n += len(key)
+    t = _get_tables()
+    strength = t.rank_values[np.searchsorted(t.rank_keys, key & RANK_KEY_MASK)]
+    suit_key = key >> SUIT_SHIFT
+    for s in range(4):
+        rows = np.flatnonzero((suit_key >> (3 * s)) & 7 >= 5)
+        if rows.size:
+            strength[rows] = t.flush_strength[(suit_bits[rows] >> (16 * s)) & 0x1FFF]
+    return strength
+
+
+def evaluate_batch(cards: np.ndarray) -> np.ndarray:
+    """
+    Векторная оценка: cards — целочисленный массив (N, k), k = 5..7, id карт 0..51.
+    Возвращает массив (N,) сил рук, совместимых с evaluate_ids.
+    """
+    t = _get_tables()
+    cards = np.asarray(cards)
+    return evaluate_keys(t.card_key[cards].sum(axis=1), t.suit_bit[cards].sum(axis=1))
+
+
+_default_generator: Optional[np.random.Generator] = None
+
+
+def seed_default_rng(seed=None):
+    """Пересоздаёт генератор, которым пользуются вызовы с rng=None (для воспроизводимых прогонов)."""
+    global _default_generator
+    _default_generator = np.random.default_rng(seed)
+
+
+def make_generator(rng=None) -> np.random.Generator:
+    """Приводит rng (None / seed / Generator / RandomStream / random.Random) к numpy.random.Generator."""
+    if isinstance(rng, np.random.Generator):
+        return rng
+    if isinstance(rng, RandomStream):
+        return rng.numpy()
+    if isinstance(rng, random.Random):
+        return np.random.default_rng(rng.getrandbits(64))
+    if rng is None:
+        if _default_generator is None:
+            seed_default_rng()
+        return _default_generator
+    return np.random.default_rng(rng)
+
+
+def _draw(remaining: np.ndarray, n: int, k: int, gen: np.random.Generator) -> np.ndarray:
+    """n независимых выборок по k карт без возвращения (частичный Фишер–Йетс по строкам)."""
+    m = len(remaining)
+    deck = np.tile(remaining.astype(np.int8), (n, 1))
+    rows = np.arange(n)
+    for j in range(k):
+        r = gen.integers(j, m, size=n)
+        picked = deck[rows, r]
+        deck[rows, r] = deck[:, j]
+        deck[:, j] = picked
+    return deck[:, :k]
+
+
+def hand_ids(hero, board=None) -> Tuple[list, list]:
+    """
+    (hero, board) -> списки id. hero может быть HandState из симулятора:
+    тогда при board=None борд берётся из него же, без повторного разбора карт.
+    """
+    if isinstance(hero, HandState):
+        return list(hero.hole), (list(hero.board) if board is None else to_ids(board))
+    return to_ids(hero), to_ids(board if board is not None else [])
+
+
+def _check_deal(hero, board, num_opponents):
+    if len(hero) != 2:
+        raise ValueError("hero must hold exactly 2 cards")
+    if len(board) > 5:
+        raise ValueError("board must have at most 5 cards")
+    if len(set(hero + board)) != len(hero) + len(board):
+        raise ValueError("duplicate cards in hero/board")
+    if num_opponents < 0:
+        raise ValueError("num_opponents must be >= 0")
+    if 2 + len(board) + (5 - len(board)) + 2 * num_opponents > 52:
+        raise ValueError("not enough cards for this many opponents")
+
+
+def _score(hero_strength: np.ndarray, opp_strength: np.ndarray) -> EquityResult:
+    best_opp = opp_strength.max(axis=1)
+    wins = int(np.count_nonzero(hero_strength > best_opp))
+    ties = int(np.count_nonzero(hero_strength == best_opp))
+    return EquityResult(wins, ties, len(hero_strength) - wins - ties)
+
+
+def _sampler(hero: list, board: list, num_opponents: int, gen: np.random.Generator):
+    """Функция sample(n) -> EquityResult на n новых розыгрышей (подготовка — один раз)."""
+    t = _get_tables()
+    dead = cards_to_mask(hero + board)
+    remaining = np.array([i for i in range(52) if not dead >> i & 1], dtype=np.int8)
+    missing = 5 - len(board)
+    need = missing + 2 * num_opponents
+    board_key = int(t.card_key[board].sum())
+    board_bits = int(t.suit_bit[board].sum())
+    hero_key = int(t.card_key[hero].sum())
+    hero_bits = int(t.suit_bit[hero].sum())
+
+    def sample(n: int) -> EquityResult:
+        drawn = _draw(remaining, n, need, gen)
+        runout, holes = drawn[:, :missing], drawn[:, missing:]
+        key = board_key + t.card_key[runout].sum(axis=1)
+        bits = board_bits + t.suit_bit[runout].sum(axis=1)
+        hero_strength = evaluate_keys(key + hero_key, bits + hero_bits)
+        opp_key = t.card_key[holes[:, 0::2]] + t.card_key[holes[:, 1::2]] + key[:, None]
+        opp_bits = t.suit_bit[holes[:, 0::2]] + t.suit_bit[holes[:, 1::2]] + bits[:, None]
+        opp_strength = evaluate_keys(opp_key.ravel(), opp_bits.ravel()).reshape(n, num_opponents)
+        return _score(hero_strength, opp_strength)
+
+    return sample
+
+
+def monte_carlo_equity(hero, board, num_opponents: int, num_simulations: int = 10000,
+                       rng=None, batch_size: int = DEFAULT_BATCH_SIZE) -> EquityResult:
+    """
+    Монте-Карло эквити героя против num_opponents случайных рук.
+    Все num_simulations розыгрышей сэмплируются и оцениваются пачками NumPy.
+    """
+    hero, board = hand_ids(hero, board)
+    _check_deal(hero, board, num_opponents)
+    if num_opponents == 0:
+        return EquityResult(num_simulations, 0, 0)
+    sample = _sampler(hero, board, num_opponents, make_generator(rng))
+    result = EquityResult(0, 0, 0)
+    done = 0
+    while done < num_simulations:
+        n = min(batch_size, num_simulations - done)
+        result = result + sample(n)
+        done += n
+    return result
+
+
+# Детерминированный режим: anytime_equity не смотрит на часы (см. deterministic_sampling).
+# ContextVar, а не глобальная переменная: у каждого потока свой режим, и сидированная симуляция
+# в одном потоке не отключает бюджет времени живой стратегии в другом
+_use_clock: ContextVar[bool] = ContextVar("use_clock", default=True)
+
+
+@contextmanager
+def deterministic_sampling(enabled: bool = True):
+    """
+    Внутри блока бюджет времени anytime_equity не действует: остановка только по интервалу
+    и max_samples, поэтому результат зависит лишь от rng (воспроизводимые прогоны).
+    Действует только в текущем потоке (контексте).
+    """
+    token = _use_clock.set(not enabled)
+    try:
+        yield
+    finally:
+        _use_clock.reset(token)
+
+
+def _decided(lo: float, hi: float, thresholds: Optional[Sequence[float]], precision: float) -> bool:
+    if thresholds:
+        return not any(lo <= x <= hi for x in thresholds)
+    return (hi - lo) / 2 <= precision
+
+
+def anytime_equity(hero, board, num_opponents: int, thresholds: Optional[Sequence[float]] = None,
+                   time_budget: Optional[float] = None, max_samples: int = 100000, rng=None,
+                   z: float = ANYTIME_Z, precision: float = ANYTIME_PRECISION,
+                   first_batch: int = ANYTIME_FIRST_BATCH,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> EquityResult:
+    """
+    Монте-Карло, которое можно прервать в любой момент. Пачки растут вдвое, начиная с first_batch;
+    после каждой считается интервал win_rate ± z * stderr. Остановка, когда:
+    - интервал не содержит ни одного порога из thresholds (решение уже не изменится),
+      а без порогов — когда полуширина интервала не больше precision;
+    - истёк time_budget секунд (следующая пачка подбирается под оставшееся время);
+    - набрано max_samples розыгрышей.
+    В результате bounds — интервал на момент остановки, exact=False; timed_out — выборку
+    урезал или остановил time_budget.
+    """
+    hero, board = hand_ids(hero, board)
+    _check_deal(hero, board, num_opponents)
+    if num_opponents == 0:
+        return EquityResult(1, 0, 0, exact=True)
+    started = time.perf_counter()
+    deadline = started + time_budget if time_budget is not None and _use_clock.get() else None
+    sample = _sampler(hero, board, num_opponents, make_generator(rng))
+    result = EquityResult(0, 0, 0)
+    timed_out = False
+    n = min(first_batch, max_samples)
+    while True:
+        result = result + sample(n)
+        lo, hi = result.confidence_interval(z)
+        left = max_samples - result.total
+        if left <= 0 or _decided(lo, hi, thresholds, precision):
+            break
+        n = min(2 * n, batch_size, left)
+        if deadline is not None:
+            now = time.perf_counter()
+            if now >= deadline:
+                timed_out = True
+                break
+            # Не выходить за бюджет: пачка не больше, чем успеем при текущей скорости
+            rate = result.total / max(now - started, 1e-9)
+            fits = max(int(rate * (deadline - now)), 1)
+            if fits < n:
+                n, timed_out = fits, True
+    result.bounds = (lo, hi)
+    result.timed_out = timed_out
+    return result
+
+
+def exact_state_count(num_board: int, num_opponents: int) -> int:
+    """Сколько исходов (достройка борда x неупорядоченные руки соперников) перебирает exact_equity."""
+    m = 52 - 2 - num_board
+    missing = 5 - num_board
+    states = comb(m, missing)
+    left = m - missing
+    for i in range(num_opponents):
+        states *= comb(left - 2 * i, 2)
+    return states // factorial(num_opponents)
+
+
+_TUPLES_CACHE: Dict[Tuple[int, int], np.ndarray] = {}
+
+
+def _disjoint_tuples(r: int, k: int) -> np.ndarray:
+    """
+    Все неупорядоченные наборы из k непересекающихся двухкарточных комбинаций
+    из r карт — массив (T, k) индексов в списке combinations(range(r), 2).
+    """
+    cached = _TUPLES_CACHE.get((r, k))
+    if cached is not None:
+        return cached
+    pairs = list(combinations(range(r), 2))
+    masks = np.array([(1 << a) | (1 << b) for a, b in pairs], dtype=np.int64)
+    n = len(pairs)
+    tuples = np.arange(n).reshape(n, 1)
+    used = masks.copy()
+    for _ in range(k - 1):
+        last = tuples[:, -1]
+        ok = (np.arange(n)[None, :] > last[:, None]) & ((used[:, None] & masks[None, :]) == 0)
+        rows, cols = np.nonzero(ok)
+        tuples = np.concatenate([tuples[rows], cols[:, None]], axis=1)
+        used = used[rows] | masks[cols]
+    _TUPLES_CACHE[(r, k)] = tuples
+    return tuples
+
+
+def _board_classes(remaining: Sequence[int], missing: int, perms: Sequence[int]):
+    """Достройки борда, сгруппированные по изоморфизму мастей: [(достройка, вес), ...]."""
+    if missing == 0:
+        return [((), 1)]
+    classes: Dict[Tuple[int, ...], int] = {}
+    for runout in combinations(remaining, missing):
+        canon = min(tuple(sorted(PERMUTED[p][c] for c in runout)) for p in perms)
+        classes[canon] = classes.get(canon, 0) + 1
+    return list(classes.items())
+
+
+def exact_equity(hero, board, num_opponents: int,
+                 thresholds: Optional[Sequence[float]] = None) -> EquityResult:
+    """
+    Точное эквити полным перебором всех достроек борда и рук соперников.
+    Достройки, изоморфные по мастям (при фиксированных руке героя и борде), считаются один раз.
+    thresholds — пороги решения: перебор прекращается, как только гарантированные
+    границы [lo, hi] не содержат ни одного порога (результат тогда с bounds и exact=False).
+    """
+    hero, board = hand_ids(hero, board)
+    _check_deal(hero, board, num_opponents)
+    if num_opponents == 0:
+        return EquityResult(1, 0, 0, exact=True)
+    total_states = exact_state_count(len(board), num_opponents)
+    if total_states > EXACT_STATE_HARD_LIMIT:
+        raise ValueError(f"too many states for exact enumeration: {total_states}")
+    t = _get_tables()
+    dead = cards_to_mask(hero + board)
+    remaining = [i for i in range(52) if not dead >> i & 1]
+    missing = 5 - len(board)
+    classes = _board_classes(remaining, missing, stabilizer(hero, board))
+    if thresholds is not None:
+        # Случайный (но фиксированный) порядок: частичный результат — честная выборка досток
+        order = np.random.default_rng(0).permutation(len(classes))
+        classes = [classes[i] for i in order]
+
+    r = len(remaining) - missing
+    tuples = _disjoint_tuples(r, num_opponents)
+    pair_a, pair_b = np.array(list(combinations(range(r), 2))).T
+    hero_key = int(t.card_key[hero + board].sum())
+    hero_bits = int(t.suit_bit[hero + board].sum())
+    board_key = int(t.card_key[board].sum())
+    board_bits = int(t.suit_bit[board].sum())
+
+    wins = ties = losses = 0
+    for runout, weight in classes:
+        left = np.array([c for c in remaining if c not in runout], dtype=np.int64)
+        run_key = int(t.card_key[list(runout)].sum()) if runout else 0
+        run_bits = int(t.suit_bit[list(runout)].sum()) if runout else 0
+        hero_strength = evaluate_keys(np.array([hero_key + run_key]), np.array([hero_bits + run_bits]))[0]
+        a, b = left[pair_a], left[pair_b]
+        opp = evaluate_keys(t.card_key[a] + t.card_key[b] + (board_key + run_key),
+                            t.suit_bit[a] + t.suit_bit[b] + (board_bits + run_bits))
+        best = opp[tuples].max(axis=1) if num_opponents > 1 else opp
+        w = int(np.count_nonzero(best < hero_strength))
+        tie = int(np.count_nonzero(best == hero_strength))
+        wins += w * weight
+        ties += tie * weight
+        losses += (len(best) - w - tie) * weight
+
+        if thresholds is not None:
+            lo = (wins + ties * 0.5) / total_states
+            hi = lo + (total_states - wins - ties - losses) / total_states
+            if hi - lo > 0 and not any(lo <= x <= hi for x in thresholds):
+                return EquityResult(wins, ties, losses, exact=False, bounds=(lo, hi))
+    return EquityResult(wins, ties, losses, exact=True)
+
+
+def resolve_mode(num_board: int, num_opponents: int, mode: str = "auto",
+                 exact_limit: int = EXACT_STATE_LIMIT, time_budget: Optional[float] = None) -> str:
+    """
+    "auto" -> "exact" | "sample" | "anytime". С time_budget точный перебор берётся только
+    при не больше ANYTIME_EXACT_LIMIT исходов, иначе — anytime_equity в пределах бюджета.
+    """
+    if mode != "auto":
+        return mode
+    states = exact_state_count(num_board, num_opponents)
+    if time_budget is not None:
+        return "exact" if states <= min(exact_limit, ANYTIME_EXACT_LIMIT) else "anytime"
+    return "exact" if states <= exact_limit else "sample"
+
+
+def equity(hero, board, num_opponents: int, num_simulations: int = 10000, rng=None,
+           mode: str = "auto", thresholds: Optional[Sequence[float]] = None,
+           exact_limit: int = EXACT_STATE_LIMIT, workers: Optional[int] = None,
+           time_budget: Optional[float] = None) -> EquityResult:
+    """
+    Единая точка входа: mode = "exact" | "sample" | "anytime" | "auto".
+    В "auto" полный перебор выбирается, если исходов не больше exact_limit
+    (обычно терн и ривер), иначе — Монте-Карло на num_simulations розыгрышей.
+    time_budget (секунды) — выборка через anytime_equity: num_simulations становится
+    верхней границей, а остановка — по порогам thresholds или по времени (см. resolve_mode).
+    workers > 1 — Монте-Карло считается в общем пуле процессов (poker.equity_pool).
+    """
+    hero, board = hand_ids(hero, board)
+    mode = resolve_mode(len(board), num_opponents, mode, exact_limit, time_budget)
+    if mode == "exact":
+        return exact_equity(hero, board, num_opponents, thresholds=thresholds)
+    if mode == "anytime":
+        return anytime_equity(hero, board, num_opponents, thresholds=thresholds, time_budget=time_budget,
+                              max_samples=num_simulations, rng=rng)
+    if mode == "sample":
+        if workers is not None and workers > 1 and num_opponents > 0:
+            from .equity_pool import get_pool
+            return get_pool(workers).monte_carlo(hero, board, num_opponents,
+                                                 num_simulations=num_simulations, rng=rng)
+        return monte_carlo_equity(hero, board, num_opponents, num_simulations=num_simulations, rng=rng)
+    raise ValueError(f"Unknown equity mode: {mode!r}")
+
+
+def monte_carlo_equity_python(hero, board, num_opponents: int, num_simulations: int = 500,
+                              rng=None) -> EquityResult:
+    """
+    Та же оценка на чистом Python (по одному розыгрышу) — эталон для проверки
+    и вариант без накладных расходов NumPy для очень маленьких выборок.
+    """
+    hero, board = hand_ids(hero, board)
+    _check_deal(hero, board, num_opponents)
+    # Колода без известных карт собирается один раз; reset() только сбрасывает курсор,
+    # а deal_ids тасует ровно те карты, что нужны на розыгрыш
+    deck = Deck(rng, dead=cards_to_mask(hero + board))
+    missing = 5 - len(board)
+    needed = missing + 2 * num_opponents
+    wins = ties = 0
+
+    for _ in range(num_simulations):
+        deck.reset()
+        deck.shuffle()
+        drawn = deck.deal_ids(needed)
+        sim_board = board + drawn[:missing]
+        my_rank = evaluate_ids(hero + sim_board)
+        best_opp = -1
+        pos = missing
+        for _ in range(num_opponents):
+            opp_rank = evaluate_ids(drawn[pos:pos + 2] + sim_board)
+            pos += 2
+            if opp_rank > best_opp:
+                best_opp = opp_rank
+        if my_rank > best_opp:
+            wins += 1
+        elif my_rank == best_opp:
+            ties += 1
+
+    return EquityResult(wins, ties, num_simulations - wins - ties)
+
+# Пример использования:
+# >>> from poker.equity import monte_carlo_equity
+# >>> r = monte_carlo_equity(['As', 'Ad'], [], num_opponents=2, num_simulations=100000, rng=1)
+# >>> r.win_rate  # ~0.73
+# >>> equity(['As', 'Kd'], ['Qh', '7c', '2s', '9d'], num_opponents=1).exact  # терн — полный перебор
+# >>> anytime_equity(['9s', '9d'], ['Kh', '7c', '2s'], 2, thresholds=(0.4, 0.6), time_budget=0.002).bounds
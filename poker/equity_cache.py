@@ -0,0 +1,113 @@
+"""
+LRU-кэш результатов эквити, ключ — каноническое состояние (рука, борд, соперники).
+
+Руки и борды, отличающиеся только переименованием мастей (AsKs на Qs7s2d и AhKh на Qh7h2d),
+дают одинаковое эквити, поэтому ключ строится через poker.isomorphism.canonical_ids.
+
+Основные объекты:
+- EquityCache(maxsize)     : OrderedDict с вытеснением самых давно использованных записей
+- EquityCache.equity(...)  : то же, что poker.equity.equity, но через кэш
+- EquityCache.info()       : CacheInfo(hits, misses, maxsize, currsize), как у functools.lru_cache
+- clear_all_caches()       : сброс всех кэшей процесса (перед воспроизводимым прогоном)
+"""
+
+import weakref
+from collections import OrderedDict, namedtuple
+from typing import Hashable, Optional, Sequence
+
+from .equity import EXACT_STATE_LIMIT, EquityResult, equity, hand_ids, resolve_mode
+from .isomorphism import canonical_ids
+
+DEFAULT_CACHE_SIZE = 4096
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Все живые кэши процесса — чтобы воспроизводимый прогон мог начать с чистого состояния
+_caches: "weakref.WeakSet[EquityCache]" = weakref.WeakSet()
+
+
+def clear_all_caches():
+    """Очищает все EquityCache процесса."""
+    for cache in list(_caches):
+        cache.clear()
+
+
+def canonical_key(hero, board, num_opponents: int) -> tuple:
+    """Ключ состояния, не зависящий от порядка карт и от переименования мастей."""
+    return canonical_ids(*hand_ids(hero, board)) + (num_opponents,)
+
+
+class EquityCache:
+    """Ограниченный LRU-кэш EquityResult. maxsize=0 — кэш выключен."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, EquityResult]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        _caches.add(self)
+
+    def get(self, key: Hashable) -> Optional[EquityResult]:
+        result = self._data.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: EquityResult):
+        if self.maxsize <= 0:
+            return
+        self._data[key] = result
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def resize(self, maxsize: int):
+        self.maxsize = maxsize
+        while len(self._data) > max(maxsize, 0):
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def equity(self, hero, board, num_opponents: int, num_simulations: int = 10000, rng=None,
+               mode: str = "auto", thresholds: Optional[Sequence[float]] = None,
+               exact_limit: int = EXACT_STATE_LIMIT, workers: Optional[int] = None,
+               time_budget: Optional[float] = None) -> EquityResult:
+        """
+        poker.equity.equity через кэш. Режим определяется заранее, чтобы точный результат
+        переиспользовался при любом num_simulations, а выборочный — только при тех же параметрах.
+        Выборки с явно заданным rng не кэшируются: их нужно уметь воспроизвести; остановленные
+        бюджетом времени (timed_out) — тоже: размер такой выборки зависит от загрузки машины.
+        """
+        hero, board = hand_ids(hero, board)
+        mode = resolve_mode(len(board), num_opponents, mode, exact_limit, time_budget)
+        if mode == "exact":
+            key = canonical_key(hero, board, num_opponents) + ("exact", tuple(thresholds or ()))
+        elif rng is not None:
+            key = None
+        elif mode == "anytime":
+            key = canonical_key(hero, board, num_opponents) + (
+                "anytime", num_simulations, time_budget, tuple(thresholds or ()))
+        else:
+            key = canonical_key(hero, board, num_opponents) + ("sample", num_simulations)
+
+        if key is not None and self.maxsize > 0:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+        result = equity(hero, board, num_opponents, num_simulations=num_simulations, rng=rng,
+                        mode=mode, thresholds=thresholds, workers=workers, time_budget=time_budget)
+        if key is not None and not result.timed_out:
+            self.put(key, result)
+        return result
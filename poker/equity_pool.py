@@ -0,0 +1,138 @@
+"""
+Параллельный расчёт эквити на долгоживущем пуле процессов.
+
+Основные объекты:
+- EquityPool(workers)            : обёртка над ProcessPoolExecutor, создаётся один раз и переиспользуется
+- EquityPool.monte_carlo(...)    : одна оценка, разрезанная на шарды по процессам
+- EquityPool.batch(states, ...)  : пачка независимых оценок [(hero, board, num_opponents), ...]
+- get_pool() / shutdown_pool()   : общий пул модуля (закрывается автоматически при выходе)
+
+Воспроизводимость: seed -> numpy.random.SeedSequence -> spawn() по одному потоку на шард.
+Число шардов зависит только от num_simulations (SHARD_SIZE), а не от числа процессов,
+поэтому при одном seed результат одинаков на любой машине.
+"""
+
+import atexit
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .equity import EquityResult, _get_tables, equity, hand_ids, monte_carlo_equity
+from .rng import RandomStream
+
+# Сколько розыгрышей считает один шард; меньше — выгоднее считать в текущем процессе
+SHARD_SIZE = 10000
+MAX_SHARDS = 256
+
+
+def _warm_worker():
+    """Инициализатор процесса: таблицы оценщика строятся один раз на весь срок жизни воркера."""
+    _get_tables()
+
+
+def _run_shard(hero, board, num_opponents, num_simulations, seed_seq) -> EquityResult:
+    return monte_carlo_equity(hero, board, num_opponents, num_simulations=num_simulations,
+                              rng=np.random.default_rng(seed_seq))
+
+
+def _run_state(hero, board, num_opponents, num_simulations, seed_seq, mode, thresholds) -> EquityResult:
+    return equity(hero, board, num_opponents, num_simulations=num_simulations,
+                  rng=np.random.default_rng(seed_seq), mode=mode, thresholds=thresholds)
+
+
+def seed_sequence(seed=None) -> np.random.SeedSequence:
+    """seed (None / int / random.Random / RandomStream / Generator / SeedSequence) -> SeedSequence."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        # Энтропия берётся из самого генератора: он продвигается, как и при последовательном расчёте
+        return np.random.SeedSequence(int(seed.integers(2 ** 63)))
+    if isinstance(seed, (random.Random, RandomStream)):
+        return np.random.SeedSequence(seed.getrandbits(64))
+    return np.random.SeedSequence(seed)
+
+
+def split_simulations(num_simulations: int) -> List[int]:
+    """Размеры шардов для num_simulations розыгрышей (не зависят от числа процессов)."""
+    shards = min(MAX_SHARDS, max(1, -(-num_simulations // SHARD_SIZE)))
+    base, extra = divmod(num_simulations, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+class EquityPool:
+    """Пул процессов для эквити; процессы запускаются при первом вызове и живут до shutdown()."""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        return self._executor
+
+    def monte_carlo(self, hero, board, num_opponents: int, num_simulations: int = 100000,
+                    rng=None) -> EquityResult:
+        """Монте-Карло эквити, розыгрыши разделены на шарды и посчитаны в пуле."""
+        hero, board = hand_ids(hero, board)
+        sizes = split_simulations(num_simulations)
+        streams = seed_sequence(rng).spawn(len(sizes))
+        futures = [
+            self.executor.submit(_run_shard, hero, board, num_opponents, n, ss)
+            for n, ss in zip(sizes, streams)
+        ]
+        result = EquityResult(0, 0, 0)
+        for f in futures:
+            result = result + f.result()
+        return result
+
+    def batch(self, states: Sequence[Tuple], num_simulations: int = 10000, rng=None,
+              mode: str = "auto", thresholds: Optional[Sequence[float]] = None) -> List[EquityResult]:
+        """
+        Эквити для списка состояний (hero, board, num_opponents) — по задаче на состояние.
+        Результаты возвращаются в порядке states.
+        """
+        streams = seed_sequence(rng).spawn(len(states))
+        futures = [
+            self.executor.submit(_run_state, *hand_ids(hero, board), num_opponents,
+                                 num_simulations, ss, mode, thresholds)
+            for (hero, board, num_opponents), ss in zip(states, streams)
+        ]
+        return [f.result() for f in futures]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+_pool: Optional[EquityPool] = None
+
+
+def get_pool(workers: Optional[int] = None) -> EquityPool:
+    """Общий пул модуля. Если запрошено другое число процессов — пул пересоздаётся."""
+    global _pool
+    if _pool is not None and workers is not None and _pool.workers != workers:
+        _pool.shutdown()
+        _pool = None
+    if _pool is None:
+        _pool = EquityPool(workers)
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+atexit.register(shutdown_pool)
+
+# Пример использования:
+# >>> from poker.equity_pool import get_pool
+# >>> get_pool().monte_carlo(['As', 'Kd'], [], num_opponents=3, num_simulations=1000000, rng=42).win_rate
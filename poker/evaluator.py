@@ -10,8 +10,10 @@
 - tiebreaker_tuple: tuple[int,...] — используется для сравнения рук одинаковой категории.
 
 Интерфейс принимает 2..7 карт (Card объекты).
-Алгоритм: перебор всех 5-картных комбинаций (itertools.combinations) -> нахождение лучшей.
-(Для прототипа достаточно и прозрачно; для скорости в продакшн можно подменять на C-алгоритм)
+Алгоритм: табличная оценка из poker/fast_evaluator.py (одно целое число силы на руку),
+результат переводится обратно в (category, tiebreaker_tuple).
+Исходный перебор всех 5-картных комбинаций сохранён как evaluate_best_hand_reference —
+эталон для перекрёстной проверки быстрого движка.
 """
 
 from itertools import combinations
@@ -19,6 +21,7 @@ from typing import List, Tuple
 from collections import Counter
 
 from .cards import Card
+from .fast_evaluator import evaluate_ids, strength_to_rank
 
 # Категории по убыванию силы:
 CATEGORY_NAMES = {
@@ -127,7 +130,19 @@ def _classify_five(cards: List[Card]) -> Tuple[int, Tuple]:
 
 def evaluate_best_hand(cards: List[Card]) -> Tuple[int, Tuple]:
     """
-    Принимает список из 2..7 карт. Перебирает все 5-картные комбинации и возвращает
+    Принимает список из 2..7 карт и возвращает лучшую пару (category, tiebreaker_tuple).
+    Для рук короче 5 карт комбинаций нет — возвращается (-1, ()).
+    """
+    if not (2 <= len(cards) <= 7):
+        raise ValueError("cards must be a list of length between 2 and 7")
+    if len(cards) < 5:
+        return (-1, ())
+    return strength_to_rank(evaluate_ids([c.id for c in cards]))
+
+
+def evaluate_best_hand_reference(cards: List[Card]) -> Tuple[int, Tuple]:
+    """
+    Эталонная (медленная) реализация: перебирает все 5-картные комбинации и возвращает
     лучшую найденную пару (category, tiebreaker_tuple).
     """
     if not (2 <= len(cards) <= 7):
@@ -0,0 +1,365 @@
+"""
+Быстрая табличная оценка покерной руки (5, 6 или 7 карт).
+
+Основные функции:
+- evaluate_strength(cards) -> int  — сила руки одним целым числом (Card, id, строки или маска)
+- evaluate_ids(ids) -> int         — то же самое для списка целочисленных id карт
+- evaluate_mask(mask) -> int       — то же самое для 64-битной маски карт
+- strength_to_rank(strength) -> (category, tiebreaker_tuple) — совместимость с evaluate_best_hand
+- HandState(hole)                  — инкрементальное состояние руки: карты борда добавляются
+                                     по одной за O(1), сила читается без пересчёта всей руки
+
+Кодирование карты — как в poker/cards.py: id = (rank - 2) * 4 + suit_index, c=0, d=1, h=2, s=3.
+
+Сила руки: (category << 20) | пять рангов-тайбрейкеров по 4 бита (старший первым).
+Чем больше число, тем сильнее рука, поэтому руки сравниваются обычным `>`.
+
+Алгоритм:
+- каждая карта прибавляет к ключу 5 ** rank_index (счётчик рангов в пятеричной системе)
+  и единицу к 3-битному счётчику своей масти (биты 32..43);
+- если какой-то масти набралось >= 5 карт — сила берётся из таблицы флешей
+  по 13-битной маске рангов этой масти (8192 записи);
+- иначе — из таблицы рангов по пятеричному ключу (все мультимножества 5..7 рангов).
+
+Для рук из <= 7 карт флеш исключает каре и фулл-хаус, поэтому ветки не пересекаются.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from .cards import mask_to_ids, to_ids
+
+HIGH_CARD, ONE_PAIR, TWO_PAIR, THREE_OF_A_KIND, STRAIGHT = 0, 1, 2, 3, 4
+FLUSH, FULL_HOUSE, FOUR_OF_A_KIND, STRAIGHT_FLUSH = 5, 6, 7, 8
+
+# Сколько рангов-тайбрейкеров у каждой категории (как в evaluator._classify_five)
+TIEBREAKER_LENGTH = {8: 1, 7: 2, 6: 2, 5: 5, 4: 1, 3: 3, 2: 3, 1: 4, 0: 5}
+
+SUIT_SHIFT = 32
+RANK_KEY_MASK = (1 << SUIT_SHIFT) - 1
+
+# Счётчик оценок для utils.profiling (объект с полем n); None — профилирование выключено,
+# тогда каждый вызов платит одной проверкой
+eval_counter = None
+
+
+def make_strength(category: int, tiebreakers: Iterable[int]) -> int:
+    """(category, tiebreakers) -> целая сила руки."""
+    strength = category
+    n = 0
+    for r in tiebreakers:
+        strength = (strength << 4) | r
+        n += 1
+    return strength << (4 * (5 - n))
+
+
+def _straight_high(mask: int) -> int:
+    """Старшая карта стрита в 13-битной маске рангов (0, если стрита нет)."""
+    for top in range(12, 3, -1):
+        window = 0b11111 << (top - 4)
+        if mask & window == window:
+            return top + 2
+    # колесо A-2-3-4-5
+    if mask & 0b1000000001111 == 0b1000000001111:
+        return 5
+    return 0
+
+
+def _top_ranks(mask: int, n: int) -> List[int]:
+    """n старших рангов (2..14) из маски, по убыванию."""
+    ranks = []
+    for i in range(12, -1, -1):
+        if mask >> i & 1:
+            ranks.append(i + 2)
+            if len(ranks) == n:
+                break
+    return ranks
+
+
+STRAIGHT_HIGH: List[int] = [_straight_high(m) for m in range(1 << 13)]
+POPCOUNT: List[int] = [bin(m).count("1") for m in range(1 << 13)]
+
+
+def _flush_strength(mask: int) -> int:
+    high = STRAIGHT_HIGH[mask]
+    if high:
+        return make_strength(STRAIGHT_FLUSH, (high,))
+    return make_strength(FLUSH, _top_ranks(mask, 5))
+
+
+# Таблица флешей: индекс — маска рангов одной масти (только для >= 5 бит)
+FLUSH_STRENGTH: List[int] = [
+    _flush_strength(m) if POPCOUNT[m] >= 5 else 0 for m in range(1 << 13)
+]
+
+
+def _flush_suit(suit_key: int) -> int:
+    for s in range(4):
+        if (suit_key >> (3 * s)) & 7 >= 5:
+            return s
+    return -1
+
+
+# suit_key (четыре 3-битных счётчика) -> индекс масти флеша или -1
+FLUSH_SUIT: List[int] = [_flush_suit(k) for k in range(1 << 12)]
+
+# id карты -> слагаемое ключа
+CARD_KEY: List[int] = [
+    (5 ** (i >> 2)) + (1 << (SUIT_SHIFT + 3 * (i & 3))) for i in range(52)
+]
+
+# id карты -> бит ранга в маске своей масти (по 16 бит на масть); сумма по руке — маски всех мастей
+SUIT_BIT: List[int] = [1 << (16 * (i & 3) + (i >> 2)) for i in range(52)]
+
+
+def _counts_from_key(key: int) -> List[int]:
+    counts = []
+    for _ in range(13):
+        key, c = divmod(key, 5)
+        counts.append(c)
+    return counts
+
+
+def rank_counts_strength(counts: List[int]) -> int:
+    """
+    Сила руки без флеша по количествам рангов (counts[0] — двойки, counts[12] — тузы).
+    Выбирает лучшую 5-карточную комбинацию, как перебор evaluator._classify_five.
+    """
+    quads, trips, pairs, singles = [], [], [], []
+    present = 0
+    for i in range(12, -1, -1):
+        c = counts[i]
+        if not c:
+            continue
+        present |= 1 << i
+        r = i + 2
+        if c == 4:
+            quads.append(r)
+        elif c == 3:
+            trips.append(r)
+        elif c == 2:
+            pairs.append(r)
+        else:
+            singles.append(r)
+
+    if quads:
+        q = quads[0]
+        kicker = max(r for r in (quads[1:] + trips + pairs + singles))
+        return make_strength(FOUR_OF_A_KIND, (q, kicker))
+
+    if trips and (len(trips) > 1 or pairs):
+        t = trips[0]
+        pair = max(trips[1:] + pairs)
+        return make_strength(FULL_HOUSE, (t, pair))
+
+    high = STRAIGHT_HIGH[present]
+    if high:
+        return make_strength(STRAIGHT, (high,))
+
+    if trips:
+        t = trips[0]
+        kickers = sorted(pairs + singles, reverse=True)[:2]
+        return make_strength(THREE_OF_A_KIND, [t] + kickers)
+
+    if len(pairs) >= 2:
+        p1, p2 = pairs[0], pairs[1]
+        kicker = max(pairs[2:] + singles)
+        return make_strength(TWO_PAIR, (p1, p2, kicker))
+
+    if pairs:
+        p = pairs[0]
+        return make_strength(ONE_PAIR, [p] + singles[:3])
+
+    return make_strength(HIGH_CARD, singles[:5])
+
+
+# Пятеричный ключ рангов -> сила. Заполняется лениво (или целиком build_rank_table()).
+RANK_STRENGTH: Dict[int, int] = {}
+
+
+def _rank_strength_miss(key: int) -> int:
+    strength = rank_counts_strength(_counts_from_key(key))
+    RANK_STRENGTH[key] = strength
+    return strength
+
+
+def _rank_multisets(size: int):
+    """Все мультимножества рангов заданного размера (не больше 4 карт одного ранга)."""
+    counts = [0] * 13
+
+    def rec(i: int, left: int):
+        if i == 13:
+            if left == 0:
+                yield counts
+            return
+        for c in range(min(4, left), -1, -1):
+            counts[i] = c
+            yield from rec(i + 1, left - c)
+        counts[i] = 0
+
+    return rec(0, size)
+
+
+def build_rank_table(sizes: Iterable[int] = (5, 6, 7)) -> Dict[int, int]:
+    """Полностью заполняет RANK_STRENGTH для рук указанных размеров и возвращает её."""
+    powers = [5 ** i for i in range(13)]
+    for size in sizes:
+        for counts in _rank_multisets(size):
+            key = sum(p * c for p, c in zip(powers, counts))
+            if key not in RANK_STRENGTH:
+                RANK_STRENGTH[key] = rank_counts_strength(counts)
+    return RANK_STRENGTH
+
+
+def evaluate_ids(ids: Iterable[int]) -> int:
+    """Сила руки из 5..7 карт, заданных id 0..51."""
+    if eval_counter is not None:
+        eval_counter.n += 1
+    key = 0
+    for c in ids:
+        key += CARD_KEY[c]
+    fs = FLUSH_SUIT[key >> SUIT_SHIFT]
+    if fs >= 0:
+        mask = 0
+        for c in ids:
+            if c & 3 == fs:
+                mask |= 1 << (c >> 2)
+        return FLUSH_STRENGTH[mask]
+    key &= RANK_KEY_MASK
+    strength = RANK_STRENGTH.get(key)
+    if strength is None:
+        strength = _rank_strength_miss(key)
+    return strength
+
+
+def evaluate_mask(mask: int) -> int:
+    """Сила руки из 5..7 карт, заданных 64-битной маской."""
+    return evaluate_ids(mask_to_ids(mask))
+
+
+def evaluate_strength(cards) -> int:
+    """Сила руки из 5..7 карт: список Card, id, строк вида 'As' или маска."""
+    ids = to_ids(cards)
+    if not (5 <= len(ids) <= 7):
+        raise ValueError("cards must be a list of length between 5 and 7")
+    return evaluate_ids(ids)
+
+
+_DECODED: Dict[int, Tuple[int, Tuple]] = {}
+
+
+def strength_to_rank(strength: int) -> Tuple[int, Tuple]:
+    """Целая сила -> (category, tiebreaker_tuple) в формате evaluate_best_hand."""
+    rank = _DECODED.get(strength)
+    if rank is None:
+        category = strength >> 20
+        n = TIEBREAKER_LENGTH[category]
+        tie = tuple((strength >> (16 - 4 * i)) & 15 for i in range(n))
+        rank = (category, tie)
+        _DECODED[strength] = rank
+    return rank
+
+
+def _strength_from_keys(key: int, suit_bits: int) -> int:
+    fs = FLUSH_SUIT[key >> SUIT_SHIFT]
+    if fs >= 0:
+        return FLUSH_STRENGTH[(suit_bits >> (16 * fs)) & 0x1FFF]
+    key &= RANK_KEY_MASK
+    strength = RANK_STRENGTH.get(key)
+    if strength is None:
+        strength = _rank_strength_miss(key)
+    return strength
+
+
+class HandState:
+    """
+    Рука игрока, которая растёт по ходу раздачи: карманные карты + карты борда.
+    Хранит аддитивный ключ (CARD_KEY) и маски мастей (SUIT_BIT) отдельно для руки и борда,
+    поэтому add() — O(1), а strength — один lookup в таблице (и кэшируется до следующей карты).
+    Ключи совместимы с poker.equity.evaluate_keys: эквити может стартовать с них.
+    """
+
+    __slots__ = ("hole", "board", "hole_key", "hole_bits", "board_key", "board_bits", "mask", "_strength")
+
+    def __init__(self, hole=(), board=()):
+        self.hole: List[int] = []
+        self.board: List[int] = []
+        self.hole_key = self.hole_bits = self.board_key = self.board_bits = 0
+        self.mask = 0
+        self._strength = None
+        for c in to_ids(hole):
+            self._check(c)
+            self.hole.append(c)
+            self.hole_key += CARD_KEY[c]
+            self.hole_bits += SUIT_BIT[c]
+        self.extend(board)
+
+    def _check(self, c: int):
+        bit = 1 << c
+        if self.mask & bit:
+            raise ValueError(f"duplicate card id {c}")
+        if len(self.hole) + len(self.board) >= 7:
+            raise ValueError("a hand has at most 7 cards")
+        self.mask |= bit
+
+    def add(self, card):
+        """Добавляет одну карту борда (Card, id или строка)."""
+        c = card if isinstance(card, int) else to_ids([card])[0]
+        self._check(c)
+        self.board.append(c)
+        self.board_key += CARD_KEY[c]
+        self.board_bits += SUIT_BIT[c]
+        self._strength = None
+
+    def extend(self, cards):
+        for c in to_ids(cards):
+            self.add(c)
+
+    def copy(self) -> "HandState":
+        other = HandState.__new__(HandState)
+        other.hole, other.board = list(self.hole), list(self.board)
+        other.hole_key, other.hole_bits = self.hole_key, self.hole_bits
+        other.board_key, other.board_bits = self.board_key, self.board_bits
+        other.mask, other._strength = self.mask, self._strength
+        return other
+
+    @property
+    def num_cards(self) -> int:
+        return len(self.hole) + len(self.board)
+
+    @property
+    def key(self) -> int:
+        return self.hole_key + self.board_key
+
+    @property
+    def suit_bits(self) -> int:
+        return self.hole_bits + self.board_bits
+
+    @property
+    def strength(self) -> int:
+        """Сила лучшей 5-карточной руки; -1, пока карт меньше пяти."""
+        if self._strength is None:
+            if self.num_cards < 5:
+                return -1
+            if eval_counter is not None:
+                eval_counter.n += 1
+            self._strength = _strength_from_keys(self.key, self.suit_bits)
+        return self._strength
+
+    @property
+    def rank(self) -> Tuple[int, Tuple]:
+        """(category, tiebreakers) как у evaluate_best_hand; (-1, ()) для неполной руки."""
+        strength = self.strength
+        return strength_to_rank(strength) if strength >= 0 else (-1, ())
+
+    def __repr__(self):
+        return f"HandState(hole={self.hole}, board={self.board})"
+
+
+# Пример использования:
+# >>> state = HandState(['As', 'Ks'])
+# >>> state.extend(['Qs', 'Js', '2d']); state.add('Ts')
+# >>> state.rank  # (8, (14,))
+# >>> from poker.cards import parse_card
+# >>> from poker.fast_evaluator import evaluate_strength, strength_to_rank
+# >>> s = evaluate_strength([parse_card(x) for x in ('As','Ks','Qs','Js','Ts','2d','3c')])
+# >>> strength_to_rank(s)  # (8, (14,))
@@ -0,0 +1,362 @@
+"""
+Компактная бинарная история раздач: запись раздачи фиксированной ширины плюс действия переменной длины.
+
+Основные объекты:
+- HAND_DTYPE                          : numpy structured dtype записи раздачи (карты — id 0..51, -1 — нет карты)
+- ACTION_DTYPE                        : действие (место, улица, код, сумма) — 7 байт
+- HandHistoryWriter(path, seat_names) : потоковая запись; подключается к PokerSimulator(history=...)
+- read_header(path)                   : заголовок файла (имена мест, блайнд, версия)
+- iter_blocks(path)                   : блоки файла как виды на np.memmap: (раздачи, их действия)
+- iter_chunks(path) / iter_hands(path): чтение кусками (генераторы): (раздачи, их действия)
+- decode_hand(record, actions, seats) : запись -> dict со строками карт (медленный путь)
+- export_csv / export_json            : конвертеры в data/hands.csv и data/training_data.json
+
+Формат файла: MAGIC, версия (uint16), длина заголовка (uint32), JSON-заголовок, затем блоки.
+Блок — то, что писатель сбрасывает одной операцией: (число раздач, число действий) как два uint32,
+записи раздач, затем действия всех этих раздач подряд. Раздача хранит first_action и num_actions —
+смещение и число своих действий в массиве блока, поэтому место под действия не резервируется:
+запись раздачи — 144 байта, действие — 7 (типичная раздача на 3 игроков ~12 действий, ~230 байт).
+Больше MAX_ACTIONS действий в раздаче не пишется, у такой раздачи выставлен truncated.
+Экспорт:
+    python -m poker.hand_history hands.phh --csv data/hands.csv --json data/training_data.json
+"""
+
+import argparse
+import csv
+import json
+import os
+import struct
+from enum import IntEnum
+from typing import Iterator, Sequence, Tuple
+
+import numpy as np
+
+from .cards import CARDS
+
+MAGIC = b"PKHH"
+FORMAT_VERSION = 2
+MAX_SEATS = 10
+MAX_ACTIONS = 0xFFFF          # предел счётчика num_actions (uint16)
+STREETS = ["Preflop", "Flop", "Turn", "River"]
+DEFAULT_BUFFER_HANDS = 4096
+ACTIONS_PER_HAND = 16         # начальный запас буфера действий на раздачу; буфер растёт сам
+
+_PREFIX = struct.Struct("<4sHI")
+_BLOCK = struct.Struct("<II")
+
+
+class ActionCode(IntEnum):
+    FOLD = 0
+    CALL = 1
+    RAISE = 2
+    BLUFF_RAISE = 3
+    ALLIN = 4
+    CHECK = 5
+    BLIND = 6      # обязательная ставка (малый/большой блайнд), не добровольное действие
+
+
+class Outcome(IntEnum):
+    UNFINISHED = 0
+    ALL_FOLDED = 1
+    SHOWDOWN = 2
+
+
+ACTION_DTYPE = np.dtype([("seat", "i1"), ("street", "i1"), ("code", "u1"), ("amount", "<i4")])
+
+HAND_DTYPE = np.dtype([
+    ("hand_id", "<u8"),
+    ("num_seats", "u1"),
+    ("outcome", "u1"),
+    ("truncated", "u1"),              # действий было больше MAX_ACTIONS
+    ("num_actions", "<u2"),
+    ("first_action", "<u4"),          # индекс первого действия раздачи в массиве действий блока
+    ("winners", "<u2"),               # битовая маска мест
+    ("big_blind", "<i4"),
+    ("hole", "i1", (MAX_SEATS, 2)),
+    ("board", "i1", (5,)),
+    ("stack_start", "<i4", (MAX_SEATS,)),
+    ("stack_end", "<i4", (MAX_SEATS,)),
+    ("pot", "<i4", (len(STREETS),)),  # банк после торговли на каждой улице (0 — не дошли)
+])
+
+_EMPTY_RECORD = np.zeros((), dtype=HAND_DTYPE)
+_EMPTY_RECORD["hole"] = -1
+_EMPTY_RECORD["board"] = -1
+
+
+class HandHistoryWriter:
+    """
+    Записи раздач и действия копятся в заранее выделенных буферах на buffer_hands раздач
+    и сбрасываются на диск одним блоком. Симулятор вызывает
+    begin_hand -> action* -> street_end* -> end_hand.
+    """
+
+    def __init__(self, path: str, seat_names: Sequence[str], big_blind: int = 20,
+                 buffer_hands: int = DEFAULT_BUFFER_HANDS):
+        if not 2 <= len(seat_names) <= MAX_SEATS:
+            raise ValueError(f"hand history supports 2..{MAX_SEATS} seats, got {len(seat_names)}")
+        self.path = path
+        self.seat_names = list(seat_names)
+        self.big_blind = big_blind
+        self._seat_index = {name: i for i, name in enumerate(self.seat_names)}
+        self._buffer = np.zeros(max(1, buffer_hands), dtype=HAND_DTYPE)
+        self._actions = np.zeros(len(self._buffer) * ACTIONS_PER_HAND, dtype=ACTION_DTYPE)
+        # Виды на столбцы буфера: запись по полям без создания np.void на каждое действие
+        self._hole = self._buffer["hole"]
+        self._board = self._buffer["board"]
+        self._stack_start = self._buffer["stack_start"]
+        self._stack_end = self._buffer["stack_end"]
+        self._pot = self._buffer["pot"]
+        self._filled = 0
+        self._row = -1          # строка текущей раздачи, -1 — раздача не начата
+        self._first_action = 0  # начало действий текущей раздачи в буфере действий
+        self._num_actions = 0   # действий в буфере (все раздачи блока)
+        self._truncated = False
+        self.hands_written = 0
+        self._file = open(path, "wb")
+        header = json.dumps({
+            "version": FORMAT_VERSION,
+            "seats": self.seat_names,
+            "big_blind": big_blind,
+            "max_seats": MAX_SEATS,
+            "record_size": HAND_DTYPE.itemsize,
+            "action_size": ACTION_DTYPE.itemsize,
+        }).encode("utf-8")
+        self._file.write(_PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)) + header)
+
+    def begin_hand(self, players: Sequence):
+        """Начало раздачи: карты розданы, блайнды ещё не поставлены (из PokerSimulator.start_hand)."""
+        row = self._row = self._filled
+        self._buffer[row] = _EMPTY_RECORD
+        self._first_action = self._num_actions
+        self._truncated = False
+        for i, p in enumerate(players):
+            if p.hand:
+                self._hole[row, i] = (p.hand[0].id, p.hand[1].id)
+            # Стек до раздачи: begin_hand вызывается до блайндов, они пишутся действиями BLIND
+            self._stack_start[row, i] = p.stack
+
+    def action(self, seat: int, street: int, code: int, amount: int = 0):
+        if self._row < 0:
+            return
+        n = self._num_actions
+        if n - self._first_action >= MAX_ACTIONS:
+            self._truncated = True
+            return
+        if n == len(self._actions):
+            self._actions = np.concatenate([self._actions, np.zeros_like(self._actions)])
+        self._actions[n] = (seat, street, code, amount)
+        self._num_actions = n + 1
+
+    def street_end(self, street: int, pot: int):
+        if self._row >= 0:
+            self._pot[self._row, street] = pot
+
+    def end_hand(self, board: Sequence, players: Sequence, outcome: Outcome, winners: Sequence[str]):
+        row = self._row
+        if row < 0:
+            return
+        if board:
+            self._board[row, :len(board)] = [c.id for c in board]
+        self._stack_end[row, :len(players)] = [p.stack for p in players]
+        mask = 0
+        for name in winners:
+            mask |= 1 << self._seat_index[name]
+        rec = self._buffer
+        rec["hand_id"][row] = self.hands_written + row
+        rec["num_seats"][row] = len(players)
+        rec["big_blind"][row] = self.big_blind
+        rec["first_action"][row] = self._first_action
+        rec["num_actions"][row] = self._num_actions - self._first_action
+        rec["truncated"][row] = self._truncated
+        rec["winners"][row] = mask
+        rec["outcome"][row] = outcome
+        self._row = -1
+        self._filled += 1
+        self._first_action = self._num_actions
+        if self._filled == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Пишет законченные раздачи блоком; начатая раздача переносится в начало буферов."""
+        filled, done = self._filled, self._first_action
+        if filled and self._file is not None:
+            self._file.write(_BLOCK.pack(filled, done) + self._buffer[:filled].tobytes()
+                             + self._actions[:done].tobytes())
+            self.hands_written += filled
+            if self._row >= 0:
+                self._buffer[0] = self._buffer[self._row]
+                self._row = 0
+            pending = self._num_actions - done
+            self._actions[:pending] = self._actions[done:self._num_actions]
+            self._filled, self._first_action, self._num_actions = 0, 0, pending
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_prefix(f) -> dict:
+    magic, version, length = _PREFIX.unpack(f.read(_PREFIX.size))
+    if magic != MAGIC:
+        raise ValueError("not a hand history file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported hand history version {version}")
+    header = json.loads(f.read(length).decode("utf-8"))
+    if header["record_size"] != HAND_DTYPE.itemsize or header["action_size"] != ACTION_DTYPE.itemsize:
+        raise ValueError("hand history record layout does not match this version")
+    header["data_offset"] = _PREFIX.size + length
+    return header
+
+
+def read_header(path: str) -> dict:
+    with open(path, "rb") as f:
+        return _read_prefix(f)
+
+
+def iter_blocks(path: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    (записи раздач, действия) каждого полного блока — read-only виды на np.memmap файла без
+    копирования: в памяти только страницы, к которым обратились, при любом размере файла.
+    """
+    offset = read_header(path)["data_offset"]
+    size = os.path.getsize(path)
+    if size <= offset:
+        return
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    while offset + _BLOCK.size <= size:
+        hands, actions = _BLOCK.unpack(raw[offset:offset + _BLOCK.size].tobytes())
+        start = offset + _BLOCK.size
+        middle = start + hands * HAND_DTYPE.itemsize
+        end = middle + actions * ACTION_DTYPE.itemsize
+        if end > size:
+            return  # недописанный последний блок (файл ещё пишется или оборван)
+        yield raw[start:middle].view(HAND_DTYPE), raw[middle:end].view(ACTION_DTYPE)
+        offset = end
+
+
+def iter_chunks(path: str, chunk_hands: int = 65536) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    (раздачи, их действия) кусками не больше chunk_hands раздач — память не зависит от размера
+    файла. Действия куска идут подряд в порядке раздач: у раздачи i их hands["num_actions"][i].
+    """
+    for hands, actions in iter_blocks(path):
+        for start in range(0, len(hands), chunk_hands):
+            chunk = hands[start:start + chunk_hands]
+            first = int(chunk["first_action"][0])
+            last = int(chunk["first_action"][-1]) + int(chunk["num_actions"][-1])
+            yield chunk, actions[first:last]
+
+
+def iter_hands(path: str, chunk_hands: int = 65536) -> Iterator[Tuple[np.void, np.ndarray]]:
+    """(запись раздачи, её действия) по одной."""
+    for hands, actions in iter_blocks(path):
+        for start in range(0, len(hands), chunk_hands):
+            for record in hands[start:start + chunk_hands]:
+                first = int(record["first_action"])
+                yield record, actions[first:first + int(record["num_actions"])]
+
+
+def decode_hand(record, actions: np.ndarray, seat_names: Sequence[str]) -> dict:
+    """Запись раздачи и её действия (iter_hands) -> словарь с именами, строками карт и списком действий."""
+    n = int(record["num_seats"])
+    names = list(seat_names)[:n]
+    winners = int(record["winners"])
+    return {
+        "hand_id": int(record["hand_id"]),
+        "big_blind": int(record["big_blind"]),
+        "players": [
+            {
+                "name": names[i],
+                "hole": [str(CARDS[c]) for c in record["hole"][i] if c >= 0],
+                "stack_start": int(record["stack_start"][i]),
+                "stack_end": int(record["stack_end"][i]),
+            }
+            for i in range(n)
+        ],
+        "board": [str(CARDS[c]) for c in record["board"] if c >= 0],
+        "pot": [int(x) for x in record["pot"]],
+        "actions": [
+            {
+                "player": names[int(a["seat"])],
+                "street": STREETS[int(a["street"])],
+                "action": ActionCode(int(a["code"])).name.lower(),
+                "amount": int(a["amount"]),
+            }
+            for a in actions
+        ],
+        "truncated": bool(record["truncated"]),
+        "outcome": Outcome(int(record["outcome"])).name.lower(),
+        "winners": [names[i] for i in range(n) if winners >> i & 1],
+    }
+
+
+CSV_FIELDS = ["hand_id", "big_blind", "players", "hole_cards", "board", "pot", "actions", "outcome", "winners"]
+
+
+def export_csv(src: str, dst: str = os.path.join("data", "hands.csv")) -> int:
+    """Одна строка на раздачу. Возвращает число раздач."""
+    seats = read_header(src)["seats"]
+    count = 0
+    with open(dst, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for record, actions in iter_hands(src):
+            hand = decode_hand(record, actions, seats)
+            writer.writerow({
+                "hand_id": hand["hand_id"],
+                "big_blind": hand["big_blind"],
+                "players": " ".join(p["name"] for p in hand["players"]),
+                "hole_cards": " ".join("".join(p["hole"]) or "-" for p in hand["players"]),
+                "board": " ".join(hand["board"]),
+                "pot": max(hand["pot"]),
+                "actions": " ".join(f"{a['player']}:{a['street'][0]}:{a['action']}:{a['amount']}"
+                                    for a in hand["actions"]),
+                "outcome": hand["outcome"],
+                "winners": " ".join(hand["winners"]),
+            })
+            count += 1
+    return count
+
+
+def export_json(src: str, dst: str = os.path.join("data", "training_data.json")) -> int:
+    """JSON-массив раздач; пишется по одной раздаче, без сборки всего списка в памяти."""
+    seats = read_header(src)["seats"]
+    count = 0
+    with open(dst, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record, actions in iter_hands(src):
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(decode_hand(record, actions, seats), ensure_ascii=False))
+            count += 1
+        f.write("\n]\n" if count else "]\n")
+    return count
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description="Экспорт бинарной истории раздач в CSV/JSON")
+    parser.add_argument("history", help="файл истории (PokerSimulator(history=...))")
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args(argv)
+
+    header = read_header(args.history)
+    print(f"Места: {', '.join(header['seats'])}; блайнд {header['big_blind']}")
+    if args.csv:
+        print(f"CSV: {export_csv(args.history, args.csv)} раздач -> {args.csv}")
+    if args.json:
+        print(f"JSON: {export_json(args.history, args.json)} раздач -> {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Изоморфизм мастей: перестановки мастей не меняют силу рук и эквити.
+
+Основные функции:
+- SUIT_PERMUTATIONS          : все 24 перестановки мастей (perm[suit_index] -> suit_index)
+- permute_ids(ids, perm)     : применяет перестановку к id карт
+- stabilizer(*groups)        : перестановки, переводящие каждую группу карт саму в себя
+- canonical_ids(*groups)     : каноническое представление набора групп (минимум по 24 перестановкам)
+
+Id карт — как в poker/cards.py: id = rank_index * 4 + suit_index.
+"""
+
+from itertools import permutations
+from typing import Iterable, List, Sequence, Tuple
+
+SUIT_PERMUTATIONS: List[Tuple[int, ...]] = list(permutations(range(4)))
+
+# PERMUTED[p][id] — id карты после перестановки мастей номер p
+PERMUTED: List[List[int]] = [
+    [(c & ~3) | perm[c & 3] for c in range(52)] for perm in SUIT_PERMUTATIONS
+]
+
+IDENTITY = 0  # permutations() начинается с тождественной (0, 1, 2, 3)
+
+
+def permute_ids(ids: Iterable[int], perm: int) -> List[int]:
+    """Применяет перестановку мастей номер perm к списку id."""
+    table = PERMUTED[perm]
+    return [table[c] for c in ids]
+
+
+def stabilizer(*groups: Sequence[int]) -> List[int]:
+    """
+    Номера перестановок мастей, при которых каждая группа карт (как множество)
+    переходит сама в себя. Всегда содержит тождественную перестановку.
+    """
+    sets = [frozenset(g) for g in groups]
+    result = []
+    for p, table in enumerate(PERMUTED):
+        if all(frozenset(table[c] for c in s) == s for s in sets):
+            result.append(p)
+    return result
+
+
+def canonical_ids(*groups: Sequence[int], perms: Sequence[int] = None) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Канонический вид набора групп карт: порядок внутри группы не важен,
+    масти переименовываются так, чтобы результат был минимальным.
+    perms — ограничить перебор этими перестановками (по умолчанию все 24).
+    """
+    best = None
+    for p in (range(len(PERMUTED)) if perms is None else perms):
+        table = PERMUTED[p]
+        form = tuple(tuple(sorted(table[c] for c in g)) for g in groups)
+        if best is None or form < best:
+            best = form
+    return best
@@ -0,0 +1,234 @@
+"""
+Матчи стратегий один на один в пуле процессов: bb/100 каждой пары с доверительным интервалом.
+
+Основные объекты:
+- plan_shards(strategies, ...)  : список шардов (пара, рассадка, seed) — не зависит от числа процессов
+- iter_shards(...)              : ShardResult по мере готовности (в порядке завершения)
+- run_matchups(...) -> MatchupReport : все шарды, слитые в порядке номеров
+- CLI:
+    python -m poker.matchup --hands 2000 --shards 8 --workers 4 --seed 1 \\
+        --strategies simple_strategy monte_carlo_strategy aggressive_strategy
+
+Каждый шард — независимый run_batch: своя пара стратегий, своя рассадка (кто из двоих сидит
+первым) и свой seed из SeedSequence(master_seed).spawn(). Поэтому результат при одном
+master_seed одинаков для любого числа процессов, а шарды масштабируются почти линейно.
+Интервал считается по разбросу bb/100 между шардами пары (нормальное приближение).
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch_runner import StrategySpec, resolve_strategy, run_batch
+
+# z-квантиль для 95% интервала
+Z_95 = 1.959964
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Одна независимая сессия: стратегии в порядке рассадки и seed."""
+    index: int
+    pair: Tuple[str, str]                # имена пары в каноническом порядке (как в strategies)
+    seats: Tuple[Tuple[str, Callable], ...]
+    num_hands: int
+    seed: int
+
+
+@dataclass
+class ShardResult:
+    index: int
+    pair: Tuple[str, str]
+    hands: int
+    net_chips: Dict[str, int]
+    seconds: float
+
+
+@dataclass
+class PairResult:
+    """Итог пары (a, b) с точки зрения a; результат b — с обратным знаком."""
+    a: str
+    b: str
+    hands: int = 0
+    net_chips: int = 0                   # выигрыш a
+    big_blind: int = 20
+    shard_bb_per_100: List[float] = field(default_factory=list)
+
+    @property
+    def bb_per_100(self) -> float:
+        return 100.0 * self.net_chips / self.big_blind / self.hands if self.hands else 0.0
+
+    @property
+    def stderr(self) -> float:
+        n = len(self.shard_bb_per_100)
+        if n < 2:
+            return math.inf
+        return float(np.std(self.shard_bb_per_100, ddof=1)) / math.sqrt(n)
+
+    @property
+    def confidence_interval(self) -> Tuple[float, float]:
+        half = Z_95 * self.stderr
+        return self.bb_per_100 - half, self.bb_per_100 + half
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        low, high = self.confidence_interval
+        d.update(bb_per_100=self.bb_per_100, ci_low=low, ci_high=high)
+        return d
+
+
+@dataclass
+class MatchupReport:
+    seed: Optional[int]
+    seconds: float
+    pairs: Dict[Tuple[str, str], PairResult] = field(default_factory=dict)
+
+    @property
+    def hands(self) -> int:
+        return sum(p.hands for p in self.pairs.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "seed": self.seed,
+            "seconds": self.seconds,
+            "hands": self.hands,
+            "pairs": [p.to_dict() for p in self.pairs.values()],
+        }
+
+    def format_table(self) -> str:
+        lines = [f"Раздач: {self.hands} за {self.seconds:.1f} с",
+                 f"{'пара':<48}{'bb/100':>10}{'95% интервал':>24}"]
+        for p in self.pairs.values():
+            low, high = p.confidence_interval
+            lines.append(f"{p.a + ' vs ' + p.b:<48}{p.bb_per_100:>10.2f}"
+                         f"{f'[{low:.2f}, {high:.2f}]':>24}")
+        return "\n".join(lines)
+
+
+def _named(strategies: Sequence[StrategySpec]) -> List[Tuple[str, Callable]]:
+    named = [spec if isinstance(spec, tuple) else (spec.__name__, spec) for spec in strategies]
+    names = [name for name, _ in named]
+    if len(set(names)) != len(names):
+        raise ValueError(f"strategy names must be unique, got {names}")
+    return named
+
+
+def plan_shards(strategies: Sequence[StrategySpec], hands_per_shard: int = 1000,
+                shards_per_pair: int = 4, seed: Optional[int] = None) -> List[Shard]:
+    """
+    Шарды для всех пар стратегий. Рассадки чередуются (a первым, b первым),
+    поэтому shards_per_pair должно быть чётным, чтобы обе рассадки были представлены поровну.
+    """
+    named = _named(strategies)
+    if len(named) < 2:
+        raise ValueError("need at least two strategies")
+    if shards_per_pair < 1:
+        raise ValueError("shards_per_pair must be positive")
+    plan = []
+    for a, b in itertools.combinations(named, 2):
+        for k in range(shards_per_pair):
+            seats = (a, b) if k % 2 == 0 else (b, a)
+            plan.append(((a[0], b[0]), seats))
+    streams = np.random.SeedSequence(seed).spawn(len(plan))
+    return [
+        Shard(i, pair, seats, hands_per_shard, int(ss.generate_state(1, np.uint64)[0]))
+        for i, ((pair, seats), ss) in enumerate(zip(plan, streams))
+    ]
+
+
+def _run_shard(shard: Shard, big_blind: int, starting_stack: int) -> ShardResult:
+    batch = run_batch(list(shard.seats), shard.num_hands, big_blind=big_blind,
+                      starting_stack=starting_stack, seed=shard.seed)
+    return ShardResult(
+        index=shard.index,
+        pair=shard.pair,
+        hands=batch.hands,
+        net_chips={name: s.net_chips for name, s in batch.stats.items()},
+        seconds=batch.seconds,
+    )
+
+
+def iter_shards(shards: Sequence[Shard], big_blind: int = 20, starting_stack: int = 1000,
+                workers: Optional[int] = None) -> Iterator[ShardResult]:
+    """Результаты шардов по мере готовности. workers=1 — в текущем процессе, по порядку."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for shard in shards:
+            yield _run_shard(shard, big_blind, starting_stack)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        futures = [executor.submit(_run_shard, shard, big_blind, starting_stack) for shard in shards]
+        for f in as_completed(futures):
+            yield f.result()
+
+
+def merge_shards(results: Sequence[ShardResult], big_blind: int = 20) -> Dict[Tuple[str, str], PairResult]:
+    """Сливает результаты в порядке номеров шардов — итог не зависит от порядка завершения."""
+    pairs: Dict[Tuple[str, str], PairResult] = {}
+    for r in sorted(results, key=lambda r: r.index):
+        a, b = r.pair
+        pair = pairs.setdefault(r.pair, PairResult(a, b, big_blind=big_blind))
+        pair.hands += r.hands
+        pair.net_chips += r.net_chips[a]
+        if r.hands:
+            pair.shard_bb_per_100.append(100.0 * r.net_chips[a] / big_blind / r.hands)
+    return pairs
+
+
+def run_matchups(strategies: Sequence[StrategySpec], hands_per_shard: int = 1000,
+                 shards_per_pair: int = 4, seed: Optional[int] = None, workers: Optional[int] = None,
+                 big_blind: int = 20, starting_stack: int = 1000,
+                 progress: Optional[Callable[[ShardResult], None]] = None) -> MatchupReport:
+    """
+    Все пары стратегий один на один. progress(shard_result) вызывается по мере готовности шардов.
+    """
+    shards = plan_shards(strategies, hands_per_shard, shards_per_pair, seed)
+    started = time.perf_counter()
+    results = []
+    for r in iter_shards(shards, big_blind, starting_stack, workers):
+        results.append(r)
+        if progress is not None:
+            progress(r)
+    return MatchupReport(seed=seed, seconds=time.perf_counter() - started,
+                         pairs=merge_shards(results, big_blind))
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description="Матчи стратегий один на один в пуле процессов")
+    parser.add_argument("--strategies", nargs="+",
+                        default=["simple_strategy", "monte_carlo_strategy", "aggressive_strategy"])
+    parser.add_argument("--hands", type=int, default=1000, help="раздач в одном шарде")
+    parser.add_argument("--shards", type=int, default=8, help="шардов на пару")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--big-blind", type=int, default=20)
+    parser.add_argument("--stack", type=int, default=1000)
+    parser.add_argument("--json", default=None, help="куда сохранить результат в JSON")
+    args = parser.parse_args(argv)
+
+    strategies = [(name.rpartition(":")[2], resolve_strategy(name)) for name in args.strategies]
+    done = []
+
+    def progress(r: ShardResult):
+        done.append(r)
+        print(f"  шард {r.index:>4} {r.pair[0]} vs {r.pair[1]}: {r.hands} раздач за {r.seconds:.1f} с"
+              f" ({len(done)} готово)")
+
+    report = run_matchups(strategies, args.hands, args.shards, seed=args.seed, workers=args.workers,
+                          big_blind=args.big_blind, starting_stack=args.stack, progress=progress)
+    print(report.format_table())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
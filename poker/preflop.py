@@ -0,0 +1,145 @@
+"""
+Таблица префлоп-эквити для всех 169 классов стартовых рук против 1..9 случайных соперников.
+
+Основные функции:
+- HAND_CLASSES                         : 169 классов ('AA', 'AKs', 'AKo', ..., '32o')
+- hand_class(cards) -> str             : класс руки из двух карт
+- preflop_equity(cards, num_opponents) : O(1) lookup в таблице (None, если таблицы нет)
+- build_table(...)                     : офлайн-расчёт таблицы (Монте-Карло)
+
+Таблица хранится в data/preflop_equity_v{TABLE_VERSION}.npy (float32, 169 x 9) и читается
+через memory-map при первом обращении. Пересобрать:
+    python -m poker.preflop --simulations 100000 --workers 8
+"""
+
+import argparse
+import os
+import time
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .cards import INT_TO_RANK_STR, RANK_STR_TO_INT, Card, to_cards
+
+TABLE_VERSION = 1
+MAX_OPPONENTS = 9
+DEFAULT_TABLE_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "data", f"preflop_equity_v{TABLE_VERSION}.npy"
+))
+
+
+def _build_classes() -> List[str]:
+    classes = []
+    for high in range(14, 1, -1):
+        for low in range(high, 1, -1):
+            h, l = INT_TO_RANK_STR[high], INT_TO_RANK_STR[low]
+            if high == low:
+                classes.append(h + l)
+            else:
+                classes.append(h + l + "s")
+                classes.append(h + l + "o")
+    return classes
+
+
+HAND_CLASSES: List[str] = _build_classes()
+CLASS_INDEX = {name: i for i, name in enumerate(HAND_CLASSES)}
+
+
+def hand_class(cards) -> str:
+    """Две карты (Card, id или строки) -> класс руки: 'QQ', 'AKs', 'T9o'."""
+    a, b = to_cards(cards)
+    if a.rank < b.rank:
+        a, b = b, a
+    name = a.rank_str() + b.rank_str()
+    if a.rank == b.rank:
+        return name
+    return name + ("s" if a.suit == b.suit else "o")
+
+
+def class_representative(name: str) -> List[Card]:
+    """Класс руки -> одна конкретная рука этого класса (для расчётов)."""
+    high, low = RANK_STR_TO_INT[name[0]], RANK_STR_TO_INT[name[1]]
+    if high == low or name.endswith("o"):
+        return [Card(high, 's'), Card(low, 'h')]
+    return [Card(high, 's'), Card(low, 's')]
+
+
+def build_table(num_simulations: int = 100000, max_opponents: int = MAX_OPPONENTS,
+                seed: int = TABLE_VERSION, workers: Optional[int] = None,
+                progress: bool = False) -> np.ndarray:
+    """
+    Считает таблицу (169, max_opponents) Монте-Карло по num_simulations розыгрышей на ячейку.
+    workers > 1 — ячейки считаются в пуле процессов (poker.equity_pool).
+    """
+    states = [
+        (class_representative(name), [], k)
+        for name in HAND_CLASSES for k in range(1, max_opponents + 1)
+    ]
+    started = time.time()
+    if workers is not None and workers > 1:
+        from .equity_pool import EquityPool
+        pool = EquityPool(workers)
+        try:
+            results = pool.batch(states, num_simulations=num_simulations, rng=seed, mode="sample")
+        finally:
+            pool.shutdown()
+        rates = [r.win_rate for r in results]
+    else:
+        from .equity import monte_carlo_equity
+        streams = np.random.SeedSequence(seed).spawn(len(states))
+        rates = []
+        for i, ((hero, board, k), ss) in enumerate(zip(states, streams)):
+            rates.append(monte_carlo_equity(hero, board, k, num_simulations=num_simulations,
+                                            rng=np.random.default_rng(ss)).win_rate)
+            if progress and (i + 1) % max_opponents == 0:
+                print(f"  {HAND_CLASSES[i // max_opponents]:>4}  ({time.time() - started:.0f} с)")
+    return np.array(rates, dtype=np.float32).reshape(len(HAND_CLASSES), max_opponents)
+
+
+def save_table(table: np.ndarray, path: str = DEFAULT_TABLE_PATH):
+    np.save(path, table.astype(np.float32))
+
+
+_table: Optional[np.ndarray] = None
+_table_loaded = False
+
+
+def load_table(path: str = DEFAULT_TABLE_PATH) -> Optional[np.ndarray]:
+    """Читает таблицу через memory-map (один раз). None — файла нет или он другой версии/формы."""
+    global _table, _table_loaded
+    if _table_loaded and path == DEFAULT_TABLE_PATH:
+        return _table
+    table = None
+    if os.path.exists(path):
+        table = np.load(path, mmap_mode="r")
+        if table.shape != (len(HAND_CLASSES), MAX_OPPONENTS) or table.dtype != np.float32:
+            table = None
+    if path == DEFAULT_TABLE_PATH:
+        _table, _table_loaded = table, True
+    return table
+
+
+def preflop_equity(cards, num_opponents: int) -> Optional[float]:
+    """Префлоп-эквити руки против num_opponents случайных рук (lookup). None — нет данных."""
+    table = load_table()
+    if table is None or not 1 <= num_opponents <= MAX_OPPONENTS:
+        return None
+    return float(table[CLASS_INDEX[hand_class(cards)], num_opponents - 1])
+
+
+def main(argv: Sequence[str] = None):
+    parser = argparse.ArgumentParser(description="Построение таблицы префлоп-эквити (169 x 9)")
+    parser.add_argument("--simulations", type=int, default=100000, help="розыгрышей на ячейку")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов")
+    parser.add_argument("--seed", type=int, default=TABLE_VERSION)
+    parser.add_argument("--out", default=DEFAULT_TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    started = time.time()
+    table = build_table(args.simulations, seed=args.seed, workers=args.workers, progress=True)
+    save_table(table, args.out)
+    print(f"Таблица v{TABLE_VERSION} сохранена: {args.out} ({time.time() - started:.0f} с)")
+
+
+if __name__ == "__main__":
+    main()
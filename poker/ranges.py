@@ -0,0 +1,316 @@
+"""
+Диапазоны рук и эквити диапазон против диапазонов.
+
+Основные объекты:
+- parse_range("QQ+, AKs, 76s, A5s-A2s, AhKh, KQo:0.5") -> Range
+- Range                         : комбо (пары id карт) с весами; Range.from_cards(['As', 'Kd'])
+- range_equity(hero, villains, board) -> EquityResult героя (рука или диапазон против 1..n диапазонов)
+
+Нотация (через запятую, регистр рангов не важен):
+- 'QQ', 'AKs', 'AKo', 'AK'           — класс руки (6 / 4 / 12 / 16 комбо)
+- 'QQ+', 'ATs+', 'KTo+', 'A9+'       — пары от QQ до AA; кикер от T до ранга ниже старшей карты
+- '22-55', 'A5s-A2s', 'KTo-K7o'      — отрезок с общей старшей картой
+- 'AhKh'                             — конкретное комбо (карты разбираются через parse_card)
+- 'random' / 'any'                   — все 1326 комбо
+- ':0.5' после любого элемента        — вес (по умолчанию 1); повторное упоминание комбо заменяет вес
+
+Расчёт учитывает удаление карт: комбо, пересекающиеся с бордом или друг с другом, не встречаются.
+- "sample": комбо тянутся пропорционально весам, несовместимые наборы отбрасываются,
+  достройка борда — из оставшихся карт; всё векторно пачками NumPy;
+- "exact": перебор всех совместимых наборов комбо и достроек борда, с весами;
+- "auto": перебор, если наборов x достроек не больше exact_limit.
+В точном режиме wins/ties/losses — суммы весов (дробные).
+"""
+
+from itertools import combinations
+from math import comb
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .cards import CARDS, RANK_STR_TO_INT, SUIT_ORDER, cards_to_mask, parse_card, to_ids
+from .equity import (
+    DEFAULT_BATCH_SIZE, EXACT_STATE_LIMIT, EquityResult, _get_tables, _score, evaluate_keys,
+    make_generator,
+)
+
+RANDOM_ALIASES = {"random", "any", "xx", "*"}
+
+# Сколько пачек подряд без единого совместимого набора считать признаком несовместимых диапазонов
+MAX_EMPTY_BATCHES = 20
+
+
+class Range:
+    """Набор комбо: combos — массив (n, 2) id карт (старшая первой), weights — (n,) веса > 0."""
+
+    __slots__ = ("combos", "weights", "masks")
+
+    def __init__(self, combos: Dict[Tuple[int, int], float]):
+        items = [(c, w) for c, w in combos.items() if w > 0]
+        self.combos = np.array([c for c, _ in items], dtype=np.int64).reshape(-1, 2)
+        self.weights = np.array([w for _, w in items], dtype=np.float64)
+        self.masks = (np.left_shift(1, self.combos[:, 0]) | np.left_shift(1, self.combos[:, 1])).astype(np.int64)
+
+    @classmethod
+    def from_cards(cls, cards) -> "Range":
+        a, b = to_ids(cards)
+        if a == b:
+            raise ValueError("duplicate cards in hand")
+        return cls({(max(a, b), min(a, b)): 1.0})
+
+    def __len__(self):
+        return len(self.combos)
+
+    def __iter__(self):
+        for (a, b), w in zip(self.combos, self.weights):
+            yield CARDS[a], CARDS[b], float(w)
+
+    def __repr__(self):
+        return f"Range({len(self)} combos, weight {self.weights.sum():g})"
+
+    def without(self, dead_mask: int) -> "Range":
+        """Диапазон без комбо, задевающих мёртвые карты (борд, известные руки)."""
+        keep = (self.masks & dead_mask) == 0
+        other = Range.__new__(Range)
+        other.combos, other.weights, other.masks = self.combos[keep], self.weights[keep], self.masks[keep]
+        return other
+
+    def to_dict(self) -> Dict[str, float]:
+        return {f"{CARDS[a]}{CARDS[b]}": float(w) for (a, b), w in zip(self.combos, self.weights)}
+
+
+def _class_combos(high: int, low: int, kind: str) -> List[Tuple[int, int]]:
+    """Класс руки (ранги 2..14, kind '' | 's' | 'o') -> список комбо (старший id первым)."""
+    combos = []
+    for s1 in range(4):
+        for s2 in range(4):
+            if high == low and s2 >= s1:
+                continue
+            if high != low and ((kind == "s" and s1 != s2) or (kind == "o" and s1 == s2)):
+                continue
+            a, b = (high - 2) * 4 + s1, (low - 2) * 4 + s2
+            combos.append((max(a, b), min(a, b)))
+    return combos
+
+
+def _parse_class(text: str) -> Tuple[int, int, str]:
+    """'AKs' -> (14, 13, 's'); 'QQ' -> (12, 12, '')."""
+    if len(text) not in (2, 3):
+        raise ValueError(f"bad hand class {text!r}")
+    r1, r2 = text[0].upper(), text[1].upper()
+    kind = text[2:].lower()
+    if r1 not in RANK_STR_TO_INT or r2 not in RANK_STR_TO_INT or kind not in ("", "s", "o"):
+        raise ValueError(f"bad hand class {text!r}")
+    high, low = sorted((RANK_STR_TO_INT[r1], RANK_STR_TO_INT[r2]), reverse=True)
+    if high == low and kind:
+        raise ValueError(f"pairs cannot be suited or offsuit: {text!r}")
+    return high, low, kind
+
+
+def _expand(token: str) -> List[Tuple[int, int]]:
+    if token.lower() in RANDOM_ALIASES:
+        return [(a, b) for a in range(52) for b in range(a)]
+    if len(token) == 4 and token[1].lower() in SUIT_ORDER and token[3].lower() in SUIT_ORDER:
+        a, b = parse_card(token[:2]).id, parse_card(token[2:]).id
+        if a == b:
+            raise ValueError(f"duplicate cards in {token!r}")
+        return [(max(a, b), min(a, b))]
+    if "-" in token:
+        left, right = (part.strip() for part in token.split("-", 1))
+        h1, l1, k1 = _parse_class(left)
+        h2, l2, k2 = _parse_class(right)
+        if k1 != k2 or (h1 == l1) != (h2 == l2) or (h1 != l1 and h1 != h2):
+            raise ValueError(f"bad range {token!r}")
+        if h1 == l1:
+            lo, hi = sorted((h1, h2))
+            return [c for r in range(lo, hi + 1) for c in _class_combos(r, r, "")]
+        lo, hi = sorted((l1, l2))
+        return [c for r in range(lo, hi + 1) for c in _class_combos(h1, r, k1)]
+    if token.endswith("+"):
+        high, low, kind = _parse_class(token[:-1])
+        if high == low:
+            return [c for r in range(low, 15) for c in _class_combos(r, r, "")]
+        return [c for r in range(low, high) for c in _class_combos(high, r, kind)]
+    return _class_combos(*_parse_class(token))
+
+
+def parse_range(text: str) -> Range:
+    """Строка в стандартной нотации -> Range (см. описание модуля)."""
+    combos: Dict[Tuple[int, int], float] = {}
+    for raw in text.split(","):
+        token = raw.strip()
+        if not token:
+            continue
+        weight = 1.0
+        if ":" in token:
+            token, w = token.rsplit(":", 1)
+            token = token.strip()
+            try:
+                weight = float(w)
+            except ValueError:
+                raise ValueError(f"bad weight in {raw.strip()!r}") from None
+            if weight < 0:
+                raise ValueError(f"negative weight in {raw.strip()!r}")
+        for combo in _expand(token):
+            combos[combo] = weight
+    if not combos:
+        raise ValueError(f"empty range {text!r}")
+    return Range(combos)
+
+
+RangeLike = Union[Range, str, Sequence]
+
+
+def as_range(value: RangeLike) -> Range:
+    """Range / строка нотации / две карты -> Range."""
+    if isinstance(value, Range):
+        return value
+    if isinstance(value, str):
+        return parse_range(value)
+    return Range.from_cards(value)
+
+
+def _prepare(hero: RangeLike, villains, board) -> Tuple[List[Range], List[int]]:
+    if isinstance(villains, (Range, str)):
+        villains = [villains]
+    board = to_ids(board)
+    if len(board) > 5 or len(set(board)) != len(board):
+        raise ValueError("board must have at most 5 distinct cards")
+    if not villains:
+        raise ValueError("need at least one villain range")
+    dead = cards_to_mask(board)
+    ranges = [as_range(r).without(dead) for r in [hero] + list(villains)]
+    for r in ranges:
+        if not len(r):
+            raise ValueError("a range has no combos compatible with the board")
+    return ranges, board
+
+
+def range_state_count(ranges: Sequence[Range], num_board: int) -> int:
+    """Верхняя оценка числа исходов точного перебора (без учёта пересечений комбо)."""
+    count = comb(52 - num_board - 2 * len(ranges), 5 - num_board)
+    for r in ranges:
+        count *= len(r)
+    return count
+
+
+def _exact(ranges: List[Range], board: List[int]) -> EquityResult:
+    t = _get_tables()
+    # Все совместимые наборы комбо (по индексу в каждом диапазоне)
+    idx = np.arange(len(ranges[0]))[:, None]
+    used = ranges[0].masks.copy()
+    weight = ranges[0].weights.copy()
+    for r in ranges[1:]:
+        rows, cols = np.nonzero((used[:, None] & r.masks[None, :]) == 0)
+        idx = np.concatenate([idx[rows], cols[:, None]], axis=1)
+        used = used[rows] | r.masks[cols]
+        weight = weight[rows] * r.weights[cols]
+    if not len(idx):
+        raise ValueError("ranges have no compatible combinations")
+
+    missing = 5 - len(board)
+    dead = cards_to_mask(board)
+    remaining = [c for c in range(52) if not dead >> c & 1]
+    runs = list(combinations(remaining, missing))
+    runouts = np.array(runs, dtype=np.int64).reshape(len(runs), missing)
+    run_mask = np.zeros(len(runouts), dtype=np.int64)
+    for j in range(missing):
+        run_mask |= np.left_shift(1, runouts[:, j])
+    base_key = int(t.card_key[board].sum()) + t.card_key[runouts].sum(axis=1)
+    base_bits = int(t.suit_bit[board].sum()) + t.suit_bit[runouts].sum(axis=1)
+    # Сила каждого комбо на каждой достройке считается один раз: (n_j, R) на диапазон
+    strength = []
+    for r in ranges:
+        key = t.card_key[r.combos].sum(axis=1)[:, None] + base_key[None, :]
+        bits = t.suit_bit[r.combos].sum(axis=1)[:, None] + base_bits[None, :]
+        strength.append(evaluate_keys(key.ravel(), bits.ravel()).reshape(len(r), len(runouts)))
+
+    wins = ties = total = 0.0
+    # Наборы обрабатываются кусками, чтобы матрица наборы x достройки оставалась небольшой
+    step = max(1, DEFAULT_BATCH_SIZE * 10 // len(runouts))
+    for start in range(0, len(idx), step):
+        part = idx[start:start + step]
+        valid = (used[start:start + step, None] & run_mask[None, :]) == 0
+        w = np.broadcast_to(weight[start:start + step, None], valid.shape)[valid]
+        hero = strength[0][part[:, 0]][valid]
+        best = strength[1][part[:, 1]][valid]
+        for j in range(2, len(ranges)):
+            best = np.maximum(best, strength[j][part[:, j]][valid])
+        wins += float(w[hero > best].sum())
+        ties += float(w[hero == best].sum())
+        total += float(w.sum())
+    return EquityResult(wins, ties, total - wins - ties, exact=True)
+
+
+def _sample(ranges: List[Range], board: List[int], num_simulations: int, gen,
+            batch_size: int) -> EquityResult:
+    t = _get_tables()
+    missing = 5 - len(board)
+    board_mask = cards_to_mask(board)
+    board_key = int(t.card_key[board].sum())
+    board_bits = int(t.suit_bit[board].sum())
+    cdfs = [np.cumsum(r.weights) / r.weights.sum() for r in ranges]
+    bit = np.left_shift(np.int64(1), np.arange(52, dtype=np.int64))
+
+    result = EquityResult(0, 0, 0)
+    done = empty = 0
+    while done < num_simulations:
+        n = min(batch_size, 2 * (num_simulations - done) + 64)
+        picks = []
+        used = np.full(n, board_mask, dtype=np.int64)
+        ok = np.ones(n, dtype=bool)
+        for r, cdf in zip(ranges, cdfs):
+            pick = np.minimum(np.searchsorted(cdf, gen.random(n), side="right"), len(r) - 1)
+            m = r.masks[pick]
+            ok &= (used & m) == 0
+            used |= m
+            picks.append(pick)
+        rows = np.flatnonzero(ok)[:num_simulations - done]
+        if not rows.size:
+            empty += 1
+            if empty >= MAX_EMPTY_BATCHES:
+                raise ValueError("ranges are (almost) incompatible: no valid deal sampled")
+            continue
+        empty = 0
+        k = rows.size
+        key = np.full(k, board_key, dtype=np.int64)
+        bits = np.full(k, board_bits, dtype=np.int64)
+        if missing:
+            # Достройка борда: missing карт с наименьшими случайными ключами среди живых
+            scores = gen.random((k, 52))
+            scores[(used[rows, None] & bit[None, :]) != 0] = 2.0
+            runout = np.argpartition(scores, missing - 1, axis=1)[:, :missing]
+            key += t.card_key[runout].sum(axis=1)
+            bits += t.suit_bit[runout].sum(axis=1)
+        strengths = []
+        for r, pick in zip(ranges, picks):
+            combo = r.combos[pick[rows]]
+            strengths.append(evaluate_keys(key + t.card_key[combo].sum(axis=1),
+                                           bits + t.suit_bit[combo].sum(axis=1)))
+        result = result + _score(strengths[0], np.stack(strengths[1:], axis=1))
+        done += k
+    return result
+
+
+def range_equity(hero: RangeLike, villains, board=(), num_simulations: int = 20000, rng=None,
+                 mode: str = "auto", exact_limit: int = EXACT_STATE_LIMIT,
+                 batch_size: int = DEFAULT_BATCH_SIZE) -> EquityResult:
+    """
+    Эквити героя (две карты или диапазон) против одного или нескольких диапазонов соперников.
+    villains — Range, строка нотации или список из них. mode = "exact" | "sample" | "auto".
+    """
+    ranges, board = _prepare(hero, villains, board)
+    if mode == "auto":
+        mode = "exact" if range_state_count(ranges, len(board)) <= exact_limit else "sample"
+    if mode == "exact":
+        return _exact(ranges, board)
+    if mode == "sample":
+        return _sample(ranges, board, num_simulations, make_generator(rng), batch_size)
+    raise ValueError(f"Unknown equity mode: {mode!r}")
+
+
+# Пример использования:
+# >>> from poker.ranges import parse_range, range_equity
+# >>> len(parse_range("QQ+, AKs"))  # 22
+# >>> range_equity(['Ah', 'Kh'], "QQ+, AKs", board=['Qh', '7d', '2h']).win_rate
+# >>> range_equity("22+, A2s+, KTo+", ["QQ+, AK", "random"], num_simulations=10000, rng=1).win_rate
@@ -0,0 +1,185 @@
+"""
+Потоки случайных чисел на numpy.random.Generator с воспроизводимыми подпотоками.
+
+Основные объекты:
+- RandomStream(seed)            : поток на PCG64 (или Philox); random()/randrange()/shuffle()
+                                  совместимы с random.Random там, где их использует код проекта
+- stream.substream(*key)        : независимый дочерний поток по ключу ("player", name), ("shard", 3)...
+- stream.spawn(n)               : n независимых потоков (по одному на процесс)
+- stream.block(index)           : перейти к началу блока index (2**64 чисел на блок) — «счётчик»:
+                                  раздача с номером index воспроизводится без розыгрыша предыдущих
+- stream.shuffles(n, k, dead)   : n частичных перестановок колоды одной NumPy-операцией
+- as_stream(rng)                : None / seed / SeedSequence / RandomStream -> RandomStream
+
+Всё выводится из одного SeedSequence: ключи подпотоков — часть spawn_key, а не порядок
+вызовов, поэтому результат не зависит от числа процессов и от того, в каком порядке
+подпотоки создавались. random() отдаёт числа из заранее сгенерированного блока.
+"""
+
+import random
+import zlib
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+BIT_GENERATORS = {"pcg64": np.random.PCG64, "philox": np.random.Philox}
+DEFAULT_BUFFER_SIZE = 256
+BLOCK_SHIFT = 64  # блок = 2**64 чисел; периода PCG64/Philox хватает на 2**64 блоков
+
+
+def _key_part(part) -> int:
+    """Элемент ключа подпотока -> неотрицательное целое (строки — через crc32, не hash())."""
+    if isinstance(part, str):
+        return zlib.crc32(part.encode("utf-8"))
+    part = int(part)
+    if part < 0:
+        raise ValueError(f"substream key must be non-negative, got {part}")
+    return part
+
+
+class RandomStream:
+    """
+    Поток случайных чисел. seed: None (энтропия ОС), int или numpy.random.SeedSequence;
+    bit_generator: "pcg64" или "philox".
+    """
+
+    __slots__ = ("seed_sequence", "bit_generator", "generator", "buffer_size",
+                 "_kind", "_origin", "_buffer", "_pos", "_pending_block")
+
+    def __init__(self, seed=None, bit_generator: str = "pcg64", buffer_size: int = DEFAULT_BUFFER_SIZE):
+        if bit_generator not in BIT_GENERATORS:
+            raise ValueError(f"bit_generator must be one of {sorted(BIT_GENERATORS)}, got {bit_generator!r}")
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        self._kind = bit_generator
+        self.bit_generator = BIT_GENERATORS[bit_generator](seed)
+        self.generator = np.random.Generator(self.bit_generator)
+        self.buffer_size = max(1, buffer_size)
+        self._origin = self.bit_generator.state
+        self._buffer: List[float] = []
+        self._pos = 0
+        self._pending_block: Optional[int] = None
+
+    # --- подпотоки ---
+
+    def substream(self, *key, buffer_size: Optional[int] = None) -> "RandomStream":
+        """
+        Дочерний поток, однозначно заданный ключом; тот же ключ — тот же поток.
+        buffer_size — размер буфера random() (меньше для потоков, из которых берут мало чисел на блок).
+        """
+        ss = self.seed_sequence
+        child = np.random.SeedSequence(ss.entropy, spawn_key=ss.spawn_key + tuple(_key_part(k) for k in key),
+                                       pool_size=ss.pool_size)
+        return RandomStream(child, self._kind, buffer_size or self.buffer_size)
+
+    def spawn(self, n: int) -> List["RandomStream"]:
+        """n независимых потоков: substream(0) ... substream(n - 1)."""
+        return [self.substream(i) for i in range(n)]
+
+    def block(self, index: int):
+        """
+        Следующие числа берутся с начала блока index. Переход выполняется лениво,
+        при первом обращении к потоку, и стоит один advance() генератора.
+        """
+        self._pending_block = _key_part(index)
+        self._buffer = []
+        self._pos = 0
+
+    def _sync(self):
+        if self._pending_block is not None:
+            self.bit_generator.state = self._origin
+            self.bit_generator.advance(self._pending_block << BLOCK_SHIFT)
+            self._pending_block = None
+
+    # --- совместимость с random.Random ---
+
+    def random(self) -> float:
+        """Равномерное число в [0, 1) из буфера; буфер пополняется одной NumPy-операцией."""
+        pos = self._pos
+        if pos >= len(self._buffer):
+            self._sync()
+            self._buffer = self.generator.random(self.buffer_size).tolist()
+            pos = 0
+        self._pos = pos + 1
+        return self._buffer[pos]
+
+    def randrange(self, n: int) -> int:
+        return int(self.random() * n)
+
+    def choice(self, seq: Sequence):
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, x: list):
+        """Фишер–Йетс на месте, как random.shuffle."""
+        for i in range(len(x) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            x[i], x[j] = x[j], x[i]
+
+    def getrandbits(self, k: int) -> int:
+        self._sync()
+        words = self.generator.integers(0, 1 << 32, size=(k + 31) // 32, dtype=np.uint64)
+        value = 0
+        for w in words:
+            value = (value << 32) | int(w)
+        return value >> (32 * len(words) - k)
+
+    # --- массовая генерация ---
+
+    def numpy(self) -> np.random.Generator:
+        """Генератор NumPy этого потока (для векторных вызовов: equity, ranges)."""
+        self._sync()
+        return self.generator
+
+    def shuffles(self, n: int, k: Optional[int] = None, dead: int = 0) -> np.ndarray:
+        """
+        n независимых случайных раздач по k карт из колоды без мёртвых карт (маска dead):
+        массив (n, k) id карт, частичный Фишер–Йетс по столбцам сразу для всех строк.
+        """
+        live = np.array([i for i in range(52) if not dead >> i & 1], dtype=np.int8)
+        m = len(live)
+        k = m if k is None else k
+        if not 0 <= k <= m:
+            raise ValueError(f"cannot deal {k} cards from {m}")
+        gen = self.numpy()
+        deck = np.tile(live, (n, 1))
+        rows = np.arange(n)
+        for j in range(min(k, m - 1)):
+            r = gen.integers(j, m, size=n)
+            picked = deck[rows, r]
+            deck[rows, r] = deck[:, j]
+            deck[:, j] = picked
+        return deck[:, :k]
+
+    def __repr__(self) -> str:
+        return f"RandomStream(entropy={self.seed_sequence.entropy}, key={self.seed_sequence.spawn_key})"
+
+
+StreamLike = Union[None, int, np.random.SeedSequence, RandomStream]
+
+
+def as_stream(rng: StreamLike = None) -> RandomStream:
+    """None / seed / SeedSequence / RandomStream -> RandomStream."""
+    if isinstance(rng, RandomStream):
+        return rng
+    return RandomStream(rng)
+
+
+def player_random(player) -> float:
+    """
+    Случайное число для решения стратегии: из потока игрока (Player.rng), если симулятор
+    его выдал, иначе из глобального random (прежнее поведение).
+    """
+    rng = getattr(player, "rng", None)
+    if rng is None:
+        return random.random()
+    return rng.random()
+
+
+# Пример использования:
+# >>> stream = RandomStream(42)
+# >>> deck_stream = stream.substream("deck"); deck_stream.block(17)  # раздача №17
+# >>> from poker.cards import Deck
+# >>> d = Deck(deck_stream); d.shuffle(); d.deal(2)
+# >>> stream.substream("player", "aggressive_strategy").random()
+# >>> stream.shuffles(10000, k=9, dead=(1 << 51) | (1 << 47)).shape  # (10000, 9)
@@ -1,20 +1,34 @@
 """
 Минимальный симулятор Texas Hold'em для тестирования бота.
 
+Торговля — poker/betting.py: блайнды, круги до закрытия, минимальный рейз, сайд-поты,
+дележ банка при равных руках. Баттон переходит по кругу, Player.position выставляется
+по нему перед каждой раздачей.
+
 ⚠ Упрощения:
-- Нет сложной экономики ставок, только фиксированные блайнды и "колл/фолд".
-- Нет разделения банка, сайд-потов.
-- Все игроки, кроме фолдовших, доходят до вскрытия.
-- Работает с объектами Card из poker/cards.py и функцией evaluate_best_hand из poker/evaluator.py.
+- Нет анте, стрэддлов и «мёртвого» баттона.
+- Работает с объектами Card из poker/cards.py; вскрытие считается по целым id карт (poker/fast_evaluator.py).
+- PokerSimulator(history="hands.phh") пишет бинарную историю раздач (poker/hand_history.py).
+- PokerSimulator(rng=seed) — колода и стратегии (player_random и выборки эквити) берут числа
+  из подпотоков poker.rng.RandomStream; бюджет времени эквити стратегий при этом не смотрит
+  на часы (poker.equity.deterministic_sampling), иначе решения зависели бы от скорости машины.
 
 Цель: дать среду, где можно тренировать или тестировать стратегии.
 """
 
-import random
-from typing import List, Callable
+from contextlib import nullcontext
+from typing import List, Callable, Optional
+
+import numpy as np
+
+from utils import profiling
 from utils.detailed_log import PokerLogger
+from .betting import Action, BettingState, position_names
 from .cards import Deck, Card
-from .evaluator import evaluate_best_hand
+from .equity import deterministic_sampling
+from .fast_evaluator import HandState, evaluate_ids, strength_to_rank
+from .hand_history import HandHistoryWriter, Outcome
+from .rng import RandomStream
 
 
 class Player:
@@ -23,33 +37,88 @@ class Player:
         self.strategy = strategy
         self.stack = stack
         self.hand: List[Card] = []
-        self.in_game = True
+        self.in_game = True  # участвует в раздаче и не сбросил карты (all-in — тоже в игре)
+        self.folded = False  # сбросил карты в текущей раздаче (в отличие от all-in)
+        self.seat = None     # номер места; выдаёт симулятор
+        # Рука + борд текущей раздачи; пополняется по улицам, общая для вскрытия и стратегий
+        self.hand_state: HandState = None
         self.simulator = None
-        self.position = position  # например, "BTN", "UTG"
+        # Поток случайных чисел для решений стратегии (poker.rng.player_random); выдаёт симулятор
+        self.rng = None
+        self.position = position  # например, "BTN", "UTG"; симулятор ставит по баттону
+
+    @property
+    def all_in(self) -> bool:
+        return self.in_game and self.stack == 0
+
+    @property
+    def to_call(self) -> int:
+        """Сколько фишек нужно доложить, чтобы уравнять текущую ставку."""
+        return self.simulator.betting.to_call(self.seat)
 
     def reset_for_new_hand(self):
         self.hand.clear()
+        self.hand_state = None
         # Игрок в игре только если есть стек
         self.in_game = self.stack > 0
+        self.folded = False
 
 
 class PokerSimulator:
-    def __init__(self, players: List[Player], big_blind: int = 20, rng=None):
+    def __init__(self, players: List[Player], big_blind: int = 20, rng=None, logger=None,
+                 history=None):
         if len(players) < 2:
             raise ValueError("Нужно хотя бы 2 игрока")
         self.players = players
         self.bb = big_blind
-        self.rng = rng or random.Random()
+        # rng: None / seed / SeedSequence -> RandomStream: колода и каждый игрок получают свои
+        # подпотоки, и раздача с номером k воспроизводима по одному seed (poker/rng.py).
+        # random.Random (или любой объект с random()) — прежний режим: один поток на колоду.
+        # С заданным rng раздачи воспроизводимы: стратегии считают эквити без учёта времени
+        self.deterministic = rng is not None
+        if rng is None or isinstance(rng, (int, np.random.SeedSequence)):
+            rng = RandomStream(rng)
+        self.rng = rng
+        if isinstance(rng, RandomStream):
+            # За раздачу колода берёт не больше 2 * игроков + 5 чисел
+            deck_rng = rng.substream("deck", buffer_size=2 * len(players) + 5)
+            for p in players:
+                p.rng = rng.substream("player", p.name)
+        else:
+            deck_rng = rng
         self.community_cards = []
-        self.pot = 0
-        self.logger = PokerLogger()
+        self.betting = BettingState(len(players), big_blind)
+        self.button = -1  # первая раздача — баттон на месте 0
+        # logger=NullLogger() — прогон без вывода в консоль и файл (см. poker/batch_runner.py)
+        self.logger = logger if logger is not None else PokerLogger()
+        # history — путь к файлу или HandHistoryWriter: каждая раздача пишется одной бинарной записью
+        if isinstance(history, str):
+            history = HandHistoryWriter(history, [p.name for p in players], big_blind=big_blind)
+        self.history = history
         self.hand_counter = 0
-        self.deck = None
+        self.hands_dealt = 0
+        # Одна колода на всю сессию: между раздачами только сбрасывается курсор
+        self.deck = Deck(deck_rng)
         self.current_stage = 0
         self.stages = ["Preflop", "Flop", "Turn", "River"]
 
-        for p in players:
+        for seat, p in enumerate(players):
             p.simulator = self
+            p.seat = seat
+
+    @property
+    def pot(self) -> int:
+        return self.betting.pot
+
+    @property
+    def current_bet(self) -> int:
+        return self.betting.current_bet
+
+    def close(self):
+        """Дописывает буферы истории раздач и лога."""
+        if self.history is not None:
+            self.history.close()
+        self.logger.flush()
 
     def play_hand(self, verbose=True):
         """Автоматически проходит всю раздачу от начала до конца."""
@@ -75,9 +144,16 @@ class PokerSimulator:
 
     def start_hand(self):
         """Начинаем новую раздачу."""
-        self.deck = Deck(self.rng)
+        replayable = isinstance(self.rng, RandomStream)
+        if replayable:
+            # Раздача k берёт k-й блок каждого подпотока — не зависит от числа сыгранных до неё
+            self.deck.rng.block(self.hands_dealt)
+            for p in self.players:
+                if p.rng is not None:
+                    p.rng.block(self.hands_dealt)
+        self.hands_dealt += 1
+        self.deck.reset(restore=replayable)
         self.deck.shuffle()
-        self.pot = 0
         self.community_cards = []
         self.current_stage = 0
 
@@ -89,6 +165,31 @@ class PokerSimulator:
         for p in self.players:
             if p.in_game:
                 p.hand = self.deck.deal(2)
+                p.hand_state = HandState(p.hand)
+
+        # Баттон — к следующему игроку со стеком; позиции отсчитываются от него
+        dealt = [p for p in self.players if p.in_game]
+        if dealt:
+            n = len(self.players)
+            for step in range(1, n + 1):
+                seat = (self.button + step) % n
+                if self.players[seat].in_game:
+                    self.button = seat
+                    break
+            names = position_names(len(dealt))
+            for i, p in enumerate(sorted(dealt, key=lambda p: (p.seat - self.button) % n)):
+                p.position = names[i]
+
+        if self.history is not None:
+            self.history.begin_hand(self.players)
+
+        betting = self.betting
+        blinds = betting.start_hand([p.stack for p in self.players], self.button)
+        # Блайнды уже поставлены оба: в логе у каждого банк на момент его ставки
+        pot = betting.pot - sum(amount for _, amount in blinds)
+        for seat, amount in blinds:
+            pot += amount
+            self._record(seat, Action.BLIND, amount, pot)
 
     def next_stage(self) -> dict:
         """Переход к следующей стадии: Preflop → Flop → Turn → River → Showdown"""
@@ -99,133 +200,138 @@ class PokerSimulator:
         self.current_stage += 1
 
         # Добавляем карты на борд
+        dealt = []
         if stage == "Flop":
-            self.community_cards += self.deck.deal(3)
-        elif stage == "Turn":
-            self.community_cards += self.deck.deal(1)
-        elif stage == "River":
-            self.community_cards += self.deck.deal(1)
-
-        # Логика ставок на текущей стадии
-        result = self._play_betting_round(stage)
+            dealt = self.deck.deal(3)
+        elif stage in ("Turn", "River"):
+            dealt = self.deck.deal(1)
+        if dealt:
+            self.community_cards += dealt
+            for p in self.players:
+                if p.hand_state is not None:
+                    p.hand_state.extend(dealt)
+
+        betting = self.betting
+        if stage != "Preflop":
+            betting.begin_street()
+        with deterministic_sampling() if self.deterministic else nullcontext():
+            self._play_betting_round(stage)
+
+        if self.history is not None:
+            self.history.street_end(self.current_stage - 1, betting.pot)
 
         # Если остался один игрок — он забирает банк
-        if "winner" in result:
-            return result
+        if betting.live <= 1:
+            live = betting.in_hand()
+            pot = betting.pot
+            betting.settle()
+            self._sync_stacks()
+            winners = [self.players[s].name for s in live]
+            if self.history is not None:
+                self.history.end_hand(self.community_cards, self.players, Outcome.ALL_FOLDED, winners)
+            return {
+                "winner": winners[0] if winners else None,
+                "pot": pot,
+                "action": "all_folded"
+            }
 
         # Если это последняя стадия — определяем победителя
         if stage == "River":
-            return self._showdown()
+            result = self._showdown()
+            if self.history is not None:
+                self.history.end_hand(self.community_cards, self.players, Outcome.SHOWDOWN,
+                                      result["winners"])
+            return result
 
         return {
             "stage": stage,
             "community_cards": self.community_cards,
-            "pot": self.pot,
+            "pot": betting.pot,
             "action": "continue"
         }
 
-    def _play_betting_round(self, stage: str) -> dict:
-        """Обработка действий игроков с поддержкой raise."""
-        self.current_bet = self.bb  # Начальная ставка = big blind
-
-        for player in self.players:
-            if not (player.in_game and player.stack > 0):
-                continue
-
-            action = player.strategy(player, self.community_cards, self.pot, stage)
-
-            if action == "fold":
-                player.in_game = False
-                self.logger.log_fold(player.name, self.pot)
-            elif action == "call":
-                bet = min(self.current_bet, player.stack)  # Коллим текущую ставку
-                player.stack -= bet
-                self.pot += bet
-                self.logger.log_call(player.name, bet, self.pot)
-                if player.stack == 0:
-                    player.in_game = False
-            elif action.startswith("raise_"):
-                # Поддержка: raise_2x, raise_pot, etc.
-                multiplier = action.replace("raise_", "").replace("x", "")
-                if multiplier == "pot":
-                    bet = min(self.pot, player.stack)
-                elif multiplier == "half":
-                    bet = min(self.pot // 2, player.stack)
-                else:
-                    try:
-                        mult = float(multiplier)
-                        bet = min(int(self.current_bet * mult), player.stack)
-                    except:
-                        bet = min(self.current_bet, player.stack)  # fallback
-
-                self.logger.log_bluff_raise(player.name, bet, self.pot)
-                player.stack -= bet
-                self.pot += bet
-                self.current_bet = bet  # Обновляем текущую ставку
-                self.logger.log_action(player.name, f"RAISE {bet}", self.pot)
-                if player.stack == 0:
-                    player.in_game = False
-            elif action == "allin":
-                bet = player.stack
-                player.stack = 0
-                self.pot += bet
-                self.logger.log_allin(player.name, bet, self.pot)
-            elif action.startswith("bluff_raise"):
-                # То же, что обычный raise, но с пометкой
-                base_action = action.replace("bluff_", "")
-                # Просто обрабатываем как обычный raise
-                multiplier = base_action.replace("raise_", "").replace("x", "")
-                if multiplier == "pot":
-                    bet = min(self.pot, player.stack)
-                else:
-                    try:
-                        mult = float(multiplier)
-                        bet = min(int(self.bb * mult), player.stack)
-                    except:
-                        bet = min(self.bb, player.stack)
-                player.stack -= bet
-                self.pot += bet
-                self.current_bet = bet
-                self.logger.log_action(player.name, f"BLUFF RAISE {bet}!", self.pot)
-                if player.stack == 0:
-                    player.in_game = False
-
-        # Проверка: остался ли один активный игрок?
-        active = [p for p in self.players if p.in_game and p.stack > 0]
-        if len(active) == 1:
-            winner = active[0]
-            winner.stack += self.pot
-            return {
-                "winner": winner.name,
-                "pot": self.pot,
-                "action": "all_folded"
-            }
-
-        return {"action": "continue"}
+    def _play_betting_round(self, stage: str):
+        """Круг торговли до закрытия; ответы стратегий применяются по правилам poker/betting.py."""
+        betting = self.betting
+        players = self.players
+        seat = betting.first_to_act()
+        while seat is not None:
+            player = players[seat]
+            profiler = profiling.active
+            if profiler is None:
+                action = player.strategy(player, self.community_cards, betting.pot, stage)
+            else:
+                action = profiler.call_strategy(player, self.community_cards, betting.pot, stage)
+            code, amount = betting.apply(seat, action)
+            self._record(seat, code, amount)
+            seat = betting.next_to_act(seat)
+
+    def _record(self, seat: int, code: Action, amount: int, pot: Optional[int] = None):
+        """Переносит действие в Player, лог и историю раздач; pot — банк для лога (по умолчанию текущий)."""
+        betting = self.betting
+        player = self.players[seat]
+        player.stack = betting.stacks[seat]
+        if pot is None:
+            pot = betting.pot
+        logger = self.logger
+        if code == Action.FOLD:
+            player.in_game = False
+            player.folded = True
+            logger.log_fold(player.name, pot)
+        elif code == Action.CHECK:
+            logger.log_action(player.name, "check", pot)
+        elif code == Action.CALL:
+            logger.log_call(player.name, amount, pot)
+        elif code == Action.RAISE:
+            logger.log_raise(player.name, amount, pot)
+        elif code == Action.BLUFF_RAISE:
+            logger.log_bluff_raise(player.name, amount, pot)
+        elif code == Action.ALLIN:
+            logger.log_allin(player.name, amount, pot)
+        else:
+            logger.log_action(player.name, f"blind {amount}", pot)
+        if self.history is not None:
+            self.history.action(seat, betting.street, code, amount)
+
+    def _sync_stacks(self):
+        for p, stack in zip(self.players, self.betting.stacks):
+            p.stack = stack
 
     def _showdown(self) -> dict:
-        """Определение победителя по силе руки."""
-        best_rank = None
-        winners = []
-        for p in self.players:
-            if not p.in_game:
-                continue
-            rank = evaluate_best_hand(p.hand + self.community_cards)
-            if best_rank is None or rank > best_rank:
-                best_rank = rank
-                winners = [p]
-            elif rank == best_rank:
-                winners.append(p)
-
-        split_pot = self.pot // len(winners)
-        for w in winners:
-            w.stack += split_pot
+        """Вскрытие: каждый банк (основной и сайд-поты) — лучшей руке среди его претендентов."""
+        betting = self.betting
+        strengths = [None] * len(self.players)
+        best = None
+        board_ids = None
+        for seat in betting.in_hand():
+            p = self.players[seat]
+            state = p.hand_state
+            if state is not None and len(state.board) == len(self.community_cards):
+                strength = state.strength
+            else:
+                # Борд меняли в обход next_stage — считаем с нуля
+                if board_ids is None:
+                    board_ids = [c.id for c in self.community_cards]
+                strength = evaluate_ids([c.id for c in p.hand] + board_ids)
+            strengths[seat] = strength
+            if best is None or strength > best:
+                best = strength
+
+        pot = betting.pot
+        before = list(betting.stacks)
+        pots = betting.settle(strengths)
+        self._sync_stacks()
+        players = self.players
+        won = sorted({s for p in pots for s in p.winners})
+        payouts = {players[s].name: betting.stacks[s] - before[s] for s in won}
 
         # 🔥 Добавляем community_cards в результат!
         return {
-            "winners": [w.name for w in winners],
-            "pot": self.pot,
-            "rank": best_rank,
+            "winners": [players[s].name for s in won],
+            "pot": pot,
+            "pots": [{"amount": p.amount, "winners": [players[s].name for s in p.winners]} for p in pots],
+            "payouts": payouts,
+            "rank": strength_to_rank(best) if best is not None else None,
             "action": "showdown",
             "community_cards": self.community_cards  # ✅ Чтобы GUI обновил борд
         }
@@ -1,11 +1,31 @@
-import pytesseract
-from PIL import ImageGrab
-import cv2
 import numpy as np
 
+from interface.card_recognizer import Slot, TableLayout, default_layout
+from interface.digit_reader import draw_amounts
 from interface.screen_reader import ScreenReader
 
-# Укажи путь к tesseract вручную
-reader = ScreenReader()
-stacks = reader.detect_stacks()
-print(stacks)
\ No newline at end of file
+
+def _layout():
+    """Разметка по умолчанию плюс стеки двух мест, ставка и банк."""
+    layout = default_layout(100)
+    layout.slots += [Slot("stack_1", 10, 330, 90, 28, kind="stack"), Slot("stack_2", 470, 330, 90, 28, kind="stack"),
+                     Slot("bet_1", 110, 330, 70, 28, kind="bet"), Slot("pot", 250, 5, 90, 26, kind="pot")]
+    return layout
+
+
+def test_detect_stacks_reads_amounts_offline():
+    layout = _layout()
+    frame = np.full((380, 600, 3), (40, 90, 40), np.uint8)
+    values = {"stack_1": 1480, "stack_2": 25, "bet_1": 120, "pot": 3050}
+    draw_amounts(frame, layout, values, height=16)
+    reader = ScreenReader(layout)
+    assert reader.detect_stacks(frame) == values
+    # Пиксели не изменились — суммы берутся из кэша
+    hits = reader.digit_reader.stats.cache_hits
+    reader.detect_stacks(frame)
+    assert reader.digit_reader.stats.cache_hits == hits + 4
+
+
+if __name__ == "__main__":
+    # Живой экран: разметка со стеками — layout.json (см. interface/card_recognizer.py)
+    print(ScreenReader(TableLayout.load("layout.json")).detect_stacks())
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from ai.basic_strategy import aggressive_strategy, simple_strategy
+from poker.analytics import analyze, hand_class_indices
+from poker.batch_runner import run_batch
+from poker.hand_history import STREETS, decode_hand, iter_hands, read_header
+from poker.preflop import CLASS_INDEX, hand_class
+
+
+@pytest.fixture(scope="module")
+def history(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("analytics") / "hands.phh")
+    run_batch([("simple", simple_strategy), ("agg", aggressive_strategy)], 400, seed=9, history=path)
+    return path
+
+
+def _reference(path):
+    """Те же показатели через decode_hand — медленно, по одной раздаче."""
+    seats = read_header(path)["seats"]
+    ref = {name: {"hands": 0, "vpip": 0, "pfr": 0, "wins": 0, "saw": [0] * 4, "sd": [0] * 4}
+           for name in seats}
+    for record, actions in iter_hands(path):
+        hand = decode_hand(record, actions, seats)
+        last = {0: 0, 3: 1, 4: 2, 5: 3}[len(hand["board"])]
+        for p in hand["players"]:
+            if not p["hole"]:
+                continue
+            r = ref[p["name"]]
+            mine = [a for a in hand["actions"] if a["player"] == p["name"]]
+            pre = [a["action"] for a in mine if a["street"] == "Preflop"]
+            folds = [STREETS.index(a["street"]) for a in mine if a["action"] == "fold"]
+            fold_street = min(folds) if folds else 4
+            r["hands"] += 1
+            r["vpip"] += any(a in ("call", "raise", "bluff_raise", "allin") for a in pre)
+            r["pfr"] += any(a in ("raise", "bluff_raise", "allin") for a in pre)
+            r["wins"] += p["name"] in hand["winners"]
+            for s in range(last + 1):
+                if s <= fold_street:
+                    r["saw"][s] += 1
+                    r["sd"][s] += hand["outcome"] == "showdown" and fold_street == 4
+    return ref
+
+
+def test_matches_per_hand_reference(history):
+    report = analyze(history, chunk_hands=37)
+    assert report.hands == 400
+    for name, r in _reference(history).items():
+        p = report.players[name]
+        assert (p.hands, p.vpip_hands, p.pfr_hands, p.wins) == (r["hands"], r["vpip"], r["pfr"], r["wins"])
+        assert list(p.saw_street) == r["saw"] and list(p.showdown_from) == r["sd"]
+    assert report.classes.hands.sum() == sum(p.hands for p in report.players.values())
+
+
+def test_chunk_size_does_not_matter(history):
+    a = analyze(history, chunk_hands=1 << 20).to_dict()
+    b = analyze([history, history], chunk_hands=50).to_dict()
+    assert b["hands"] == 2 * a["hands"]
+    assert b["players"][0]["vpip"] == pytest.approx(a["players"][0]["vpip"])
+    assert b["players"][1]["bb_per_100"] == pytest.approx(a["players"][1]["bb_per_100"])
+
+
+def test_hand_class_indices():
+    hole = np.array([[51, 47], [0, 5], [-1, -1]], dtype=np.int8)  # AsKs, 2c3d, нет карт
+    assert list(hand_class_indices(hole)) == [CLASS_INDEX["AKs"], CLASS_INDEX[hand_class([0, 5])], -1]
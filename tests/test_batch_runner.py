@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from ai.basic_strategy import simple_strategy, aggressive_strategy
+from poker.batch_runner import resolve_strategy, run_batch
+
+
+def test_chips_are_conserved_and_no_log_written(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = run_batch([simple_strategy, simple_strategy, simple_strategy], 2000, seed=5)
+    assert result.hands == 2000
+    assert sum(s.net_chips for s in result.stats.values()) == 0
+    assert list(result.stats) == ["simple_strategy", "simple_strategy#2", "simple_strategy#3"]
+    assert not os.path.exists(tmp_path / "poker_game.log")
+
+
+def test_seeded_runs_repeat():
+    a = run_batch([simple_strategy, simple_strategy], 500, seed=11).to_dict()
+    b = run_batch([simple_strategy, simple_strategy], 500, seed=11).to_dict()
+    for d in (a, b):
+        d.pop("seconds")
+        d.pop("hands_per_second")
+    assert a == b
+
+
+def test_never_reset_stops_when_one_player_has_chips():
+    result = run_batch([("agg", aggressive_strategy), ("simple", simple_strategy)], 5000,
+                       seed=3, reset_stacks="never", starting_stack=100)
+    assert result.hands < 5000
+    assert sum(s.net_chips for s in result.stats.values()) == 0
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        run_batch([simple_strategy, simple_strategy], 10, reset_stacks="sometimes")
+    assert resolve_strategy("simple_strategy") is simple_strategy
+    assert resolve_strategy("ai.basic_strategy:simple_strategy") is simple_strategy
@@ -0,0 +1,48 @@
+import pytest
+
+from benchmarks import BenchmarkReport, Measurement, compare, run_suite
+from benchmarks.suite import bench_memory, bench_simulator, main
+
+
+def test_suite_writes_comparable_json(tmp_path):
+    report = run_suite(["evaluator"], scale=0.01, repeat=1)
+    assert {"evaluator.best_hand.5", "evaluator.best_hand.6", "evaluator.best_hand.7"} <= set(report.results)
+    assert all(m.value > 0 and m.unit == "evals/s" for m in report.results.values())
+    path = tmp_path / "bench.json"
+    report.save(str(path))
+    loaded = BenchmarkReport.load(str(path))
+    assert loaded.results == report.results
+    assert loaded.meta["seed"] == 1
+    assert compare(loaded, report) == []
+    with pytest.raises(ValueError):
+        run_suite(["gpu"])
+
+
+def test_simulator_and_memory_groups():
+    [sim] = bench_simulator(scale=0.005, repeat=1, strategies=["simple_strategy"])
+    assert sim.name == "simulator.simple_strategy" and sim.value > 0
+    peak, retained = bench_memory(scale=0.01, strategies=["simple_strategy"])
+    assert not peak.higher_is_better and retained.unit == "bytes/hand"
+
+
+def test_compare_respects_direction_threshold_and_tolerance():
+    def report(speed, memory):
+        return BenchmarkReport({}, {
+            "speed": Measurement("speed", speed, "evals/s"),
+            "mem": Measurement("mem", memory, "bytes/hand", higher_is_better=False, tolerance=100.0),
+        })
+
+    base = report(1000.0, 200.0)
+    assert compare(base, report(900.0, 290.0), threshold=0.15) == []      # -10%; память в допуске
+    [slow] = compare(base, report(800.0, 200.0), threshold=0.15)
+    assert slow.name == "speed" and slow.change == pytest.approx(0.2)
+    [mem] = compare(base, report(1000.0, 400.0), threshold=0.15)
+    assert mem.name == "mem" and mem.change == pytest.approx(1.0)
+
+
+def test_cli_exit_code_on_regression(tmp_path, capsys):
+    path = tmp_path / "base.json"
+    baseline = {"evaluator.best_hand.5": Measurement("evaluator.best_hand.5", 1e12, "evals/s")}
+    BenchmarkReport({}, baseline).save(str(path))
+    assert main(["--only", "evaluator", "--scale", "0.01", "--repeat", "1", "--compare", str(path)]) == 1
+    assert "evaluator.best_hand.5" in capsys.readouterr().out
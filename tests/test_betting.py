@@ -0,0 +1,152 @@
+import pytest
+
+from ai.basic_strategy import aggressive_strategy, monte_carlo_strategy, simple_strategy
+from poker.betting import (
+    ALLIN, FOLDED, SIZE_MULT, SIZE_POT, SIZE_TO, Action, BettingState, Decision, parse_action, play_round,
+)
+from poker.simulator import Player, PokerSimulator
+from utils.detailed_log import MemoryHandler, NullLogger, PokerLogger
+
+
+def _script(actions):
+    """decide(seat) по очереди из списка [(место, ответ)] — заодно проверяет порядок хода."""
+    queue = list(actions)
+
+    def decide(seat):
+        expected, action = queue.pop(0)
+        assert seat == expected
+        return action
+    return decide, queue
+
+
+def test_parse_action():
+    assert parse_action("raise_2x") == Decision(Action.RAISE, SIZE_MULT, 2.0)
+    assert parse_action("bluff_raise_3x") == Decision(Action.BLUFF_RAISE, SIZE_MULT, 3.0)
+    assert parse_action("raise_half") == Decision(Action.RAISE, SIZE_POT, 0.5)
+    assert parse_action((Action.RAISE, 120)) == Decision(Action.RAISE, SIZE_TO, 120)
+    assert parse_action(Action.CALL).action == Action.CALL
+    assert parse_action("raise_2x") is parse_action("raise_2x")
+    with pytest.raises(ValueError):
+        parse_action("raise_lots")
+
+
+def test_blinds_and_order():
+    state = BettingState(3, big_blind=20)
+    assert state.start_hand([1000, 1000, 1000], button=0) == [(1, 10), (2, 20)]
+    # Префлоп: первым ходит баттон (после BB), у большого блайнда есть право хода
+    decide, queue = _script([(0, "call"), (1, "call"), (2, "raise_2x"), (0, "call"), (1, "fold")])
+    play_round(state, decide)
+    assert not queue and state.pot == 100 and state.status[1] == FOLDED
+    # Постфлоп — с первого места после баттона; фолд без ставки — чек
+    state.begin_street()
+    assert state.first_to_act() == 2
+    assert state.apply(2, "fold") == (Action.CHECK, 0)
+
+
+def test_heads_up_button_posts_small_blind():
+    state = BettingState(2, big_blind=20)
+    assert state.start_hand([500, 500], button=1) == [(1, 10), (0, 20)]
+    assert state.first_to_act() == 1
+    state.apply(1, "call")
+    state.apply(0, "check")
+    state.begin_street()
+    assert state.first_to_act() == 0
+
+
+def test_min_raise_is_enforced():
+    state = BettingState(3, big_blind=20)
+    state.start_hand([1000, 1000, 1000], button=0)
+    assert state.apply(0, (Action.RAISE, 30)) == (Action.RAISE, 40)   # минимум — до 40
+    assert state.apply(1, (Action.RAISE, 100)) == (Action.RAISE, 90)  # до 100, рейз на 60
+    assert state.min_raise_to() == 160
+    assert state.next_to_act(1) == 2
+
+
+def test_short_all_in_does_not_reopen_raising():
+    state = BettingState(3, big_blind=20)
+    state.start_hand([1000, 1000, 130], button=0)
+    state.apply(0, (Action.RAISE, 100))
+    state.apply(1, "call")
+    assert state.apply(2, "allin") == (Action.ALLIN, 110)   # до 130: меньше полного рейза
+    # Уже ходившие могут только уравнять
+    assert state.apply(0, "raise_pot") == (Action.CALL, 30)
+    assert state.apply(1, "call") == (Action.CALL, 30)
+    assert state.next_to_act(1) is None
+
+
+def test_side_pots_and_split():
+    state = BettingState(4, big_blind=20)
+    state.start_hand([1000, 100, 300, 1000], button=0)
+    for seat in (3, 0, 1, 2):
+        state.apply(seat, "allin")
+    assert state.status[1] == state.status[2] == ALLIN
+    pots = state.side_pots()
+    assert [(p.amount, p.eligible) for p in pots] == [(400, [0, 1, 2, 3]), (600, [0, 2, 3]), (1400, [0, 3])]
+    # Места 0 и 3 делят всё, что им доступно; короткий стек 1 выигрывает основной банк
+    pots = state.settle([5, 9, 1, 5])
+    assert [p.winners for p in pots] == [[1], [3, 0], [3, 0]]
+    assert state.stacks == [1000, 400, 0, 1000]
+    assert sum(state.stacks) == 2400
+
+
+def test_uncalled_bet_is_returned():
+    state = BettingState(2, big_blind=20)
+    state.start_hand([1000, 300], button=0)
+    state.apply(0, "allin")
+    state.apply(1, "call")
+    assert [p.amount for p in state.side_pots()] == [600, 700]
+    state.settle([1, 2])
+    assert state.stacks == [700, 600]
+
+
+def test_odd_chips_go_left_of_button():
+    state = BettingState(3, big_blind=20, small_blind=5)
+    state.start_hand([100, 100, 100], button=2)
+    state.apply(2, "fold")
+    state.apply(0, "call")
+    state.apply(1, "check")
+    state.contributed[2], state.stacks[2] = 5, 95   # мёртвые фишки сбросившего — банк нечётный
+    state.settle([3, 3, None])
+    assert state.stacks == [103, 102, 95]
+
+
+def _sim(strategies, stacks, seed=7):
+    players = [Player(f"p{i}", s, stack=stack) for i, (s, stack) in enumerate(zip(strategies, stacks))]
+    return PokerSimulator(players, big_blind=20, rng=seed, logger=NullLogger()), players
+
+
+def test_simulator_conserves_chips_with_side_pots():
+    allin = lambda *args: "allin"
+    sim, players = _sim([allin, aggressive_strategy, monte_carlo_strategy, simple_strategy],
+                        [1000, 150, 400, 60])
+    total = sum(p.stack for p in players)
+    for _ in range(30):
+        if sum(1 for p in players if p.stack > 0) < 2:
+            break
+        result = sim.play_hand(verbose=False)
+        assert sum(p.stack for p in players) == total
+        if result["action"] == "showdown":
+            assert sum(result["payouts"].values()) == result["pot"]
+            assert result["winners"]
+
+
+def test_everyone_folds_to_big_blind():
+    fold = lambda *args: "fold"
+    sim, players = _sim([fold, fold, fold], [1000, 1000, 1000])
+    result = sim.play_hand(verbose=False)
+    # Баттон — место 0, большой блайнд — место 2
+    assert result == {"winner": "p2", "pot": 30, "action": "all_folded"}
+    assert [p.stack for p in players] == [1000, 990, 1010]
+    assert [p.position for p in players] == ["BTN", "SB", "BB"]
+    sim.play_hand(verbose=False)
+    assert [p.position for p in players] == ["BB", "BTN", "SB"]
+
+
+def test_blinds_are_logged_with_running_pot():
+    memory = MemoryHandler()
+    fold = lambda *args: "fold"
+    players = [Player(f"p{i}", fold, stack=1000) for i in range(3)]
+    sim = PokerSimulator(players, big_blind=20, rng=7, logger=PokerLogger(None, handlers=[memory]))
+    sim.play_hand(verbose=False)
+    blinds = [r.data for r in memory.records if r.event == "action" and r.data["action"].startswith("blind")]
+    assert [(b["player"], b["action"], b["pot"]) for b in blinds] == [("p1", "blind 10", 10), ("p2", "blind 20", 30)]
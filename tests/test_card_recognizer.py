@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+import pytest
+
+from interface.card_recognizer import (
+    RANKS, SUITS, CardRecognizer, TableLayout, default_layout, load_templates, non_max_suppression,
+    render_table,
+)
+from interface.screen_reader import ScreenReader
+
+ALL_CARDS = [r + s for r in RANKS for s in SUITS]
+
+
+def test_templates_are_rank_and_suit_glyphs():
+    templates = load_templates()
+    assert sorted(templates.ranks) == sorted(RANKS) and sorted(templates.suits) == sorted(SUITS)
+    assert load_templates() is templates
+
+
+@pytest.mark.parametrize("card_height", [100, 140])
+def test_recognizes_every_card(card_height):
+    layout = default_layout(card_height)
+    recognizer = CardRecognizer(layout)
+    names = [s.name for s in layout.slots]
+    rng = np.random.default_rng(card_height)
+    for i in range(0, len(ALL_CARDS), len(names)):
+        cards = dict(zip(names, ALL_CARDS[i:i + len(names)]))
+        frame = render_table(layout, cards, jitter=5, rng=rng)
+        assert recognizer.recognize(frame) == {name: cards.get(name) for name in names}
+
+
+def test_hole_board_and_find_cards():
+    layout = default_layout(120)
+    cards = {"board_1": "Td", "board_2": "Qs", "board_3": "2h", "hole_1": "Ac", "hole_2": "9d"}
+    frame = render_table(layout, cards)
+    reader = ScreenReader(layout)
+    assert reader.detect_hand_cards(frame) == ["Ac", "9d"]
+    assert reader.detect_board_cards(frame) == ["Td", "Qs", "2h"]
+    found = CardRecognizer(layout).find_cards(frame)
+    assert [d.card for d in found] == ["Td", "Qs", "2h", "Ac", "9d"]
+
+
+def test_layout_round_trip(tmp_path):
+    layout = default_layout(110)
+    layout.save(str(tmp_path / "layout.json"))
+    assert TableLayout.load(str(tmp_path / "layout.json")) == layout
+
+
+def test_non_max_suppression():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 10, 10], [30, 30, 10, 10], [2, 0, 10, 10]])
+    assert non_max_suppression(boxes, np.array([0.5, 0.9, 0.7, 0.8])) == [1, 2]
+
+
+def test_full_table_is_fast():
+    layout = default_layout(120)
+    recognizer = CardRecognizer(layout)
+    frame = render_table(layout, dict(zip([s.name for s in layout.slots], ALL_CARDS[10:17])))
+    recognizer.recognize(frame)
+    started = time.perf_counter()
+    for _ in range(20):
+        recognizer.recognize(frame)
+    # Цель — единицы миллисекунд; порог с запасом на медленные машины
+    assert (time.perf_counter() - started) / 20 < 0.05
@@ -0,0 +1,96 @@
+import copy
+import pickle
+import random
+
+import pytest
+
+from poker.cards import (
+    CARDS, Card, Deck, card_from_id, cards_to_mask, mask_to_ids, parse_card, to_cards, to_ids,
+)
+
+
+def test_cards_are_interned():
+    assert Card(14, 's') is parse_card('As') is parse_card('aS')
+    assert card_from_id(parse_card('Td').id) is parse_card('Td')
+    assert pickle.loads(pickle.dumps(parse_card('2c'))) is parse_card('2c')
+    assert copy.deepcopy(parse_card('Kh')) is parse_card('Kh')
+
+
+def test_id_order_matches_rank_suit_order():
+    by_tuple = sorted(CARDS, key=lambda c: (c.rank, c.suit))
+    assert list(CARDS) == by_tuple == sorted(CARDS)
+    assert [c.id for c in CARDS] == list(range(52))
+
+
+def test_round_trip_strings():
+    for c in CARDS:
+        assert parse_card(str(c)) is c
+    assert str(Card(10, 'd')) == 'Td'
+    assert repr(Card(10, 'd')) == "Card(10, 'd')"
+
+
+def test_invalid_cards():
+    with pytest.raises(ValueError):
+        Card(15, 's')
+    with pytest.raises(ValueError):
+        Card(10, 'x')
+    with pytest.raises(ValueError):
+        parse_card('1s')
+    with pytest.raises(AttributeError):
+        parse_card('As').rank = 2
+
+
+def test_ids_and_masks():
+    hand = [parse_card('As'), parse_card('2c')]
+    mask = cards_to_mask(hand)
+    assert mask == (1 << 51) | 1
+    assert mask_to_ids(mask) == [0, 51]
+    assert to_ids(mask) == [0, 51]
+    assert to_ids(['As', 0]) == [51, 0]
+    assert to_cards([51, 0]) == hand
+    with pytest.raises(ValueError):
+        to_ids([52])
+
+
+def test_deck_reuses_singletons():
+    deck = Deck(random.Random(3))
+    deck.shuffle()
+    dealt = deck.deal(52)
+    assert sorted(dealt) == list(CARDS)
+    assert all(c is CARDS[c.id] for c in dealt)
+
+
+def test_deck_partial_shuffle_is_seeded_and_uniform():
+    a, b = Deck(random.Random(5)), Deck(random.Random(5))
+    for _ in range(20):
+        for d in (a, b):
+            d.reset()
+            d.shuffle()
+        assert a.deal_ids(9) == b.deal_ids(9)
+
+    deck = Deck(random.Random(1))
+    counts = [0] * 52
+    for _ in range(5200):
+        deck.reset()
+        deck.shuffle()
+        counts[deck.deal_ids(1)[0]] += 1
+    assert min(counts) > 60 and max(counts) < 145
+
+
+def test_deck_dead_cards_and_reset():
+    dead = cards_to_mask(['As', 'Kd', '2c'])
+    deck = Deck(random.Random(2), dead=dead)
+    assert len(deck) == 49
+    deck.shuffle()
+    dealt = deck.deal_ids(49)
+    assert sorted(dealt) == [i for i in range(52) if not dead >> i & 1]
+    with pytest.raises(ValueError):
+        deck.deal(1)
+    deck.reset()
+    assert len(deck) == 49 and deck.mask == dead
+    hole = deck.deal(2)
+    assert deck.mask == dead | cards_to_mask(hole)
+    deck.remove(['Ah'])
+    assert len(deck) == 48 and deck.mask == dead | cards_to_mask(['Ah'])
+    # Без shuffle — сдача по порядку id, как у прежней колоды
+    assert Deck().deal(3) == list(CARDS[:3])
@@ -0,0 +1,91 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from poker.cards import parse_card
+from poker.simulator import Player
+from utils.detailed_log import (
+    AsyncHandler, BufferedFileHandler, JsonFormatter, LogLevel, MemoryHandler, NullLogger, PokerLogger,
+)
+
+
+def _lines(path):
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+def test_text_output_matches_legacy_strings(tmp_path, capsys):
+    logger = PokerLogger(str(tmp_path / "game.log"))
+    logger.log_hand_start(3)
+    logger.log_call("Bob", 20, 60)
+    logger.log_raise("Ann", 40, 100, raise_type="3-BET")
+    logger.log_board("Flop", [parse_card("As"), parse_card("Td"), parse_card("2c")])
+    p = Player("Bob", None, stack=980)
+    p.hand = [parse_card("Kh"), parse_card("Kd")]
+    logger.log_preflop([p])
+    logger.log_showdown(["Ann", "Bob"], 101, None)
+    logger.log_stacks([p])
+    logger.close()
+    expected = [
+        "", "--- Раздача 3 ---",
+        "  Bob → CALL 20 (банк: 60)",
+        "  Ann → 3-BET 40! (банк: 100)",
+        "[Flop] Борд: A♠ T♦ 2♣",
+        "[Preflop] Карты розданы:",
+        "  Bob: K♥ K♦ (стек: 980)",
+        "🏆 Шоудаун: победитель(и): Ann, Bob → +50",
+        "📊 Стеки: Bob: 980",
+    ]
+    assert capsys.readouterr().out.splitlines() == expected
+    assert _lines(tmp_path / "game.log")[2:] == expected
+    assert logger.last_action == "call" and logger.last_player == "Bob"
+
+
+def test_file_is_written_in_batches(tmp_path):
+    handler = BufferedFileHandler(str(tmp_path / "game.log"), buffer_size=3, header=False)
+    logger = PokerLogger(None, handlers=[handler])
+    logger.log_fold("A", 0)
+    logger.log_fold("B", 0)
+    assert _lines(tmp_path / "game.log") == []
+    logger.log_fold("C", 0)
+    assert len(_lines(tmp_path / "game.log")) == 3
+    logger.log_fold("D", 0)
+    logger.flush()
+    assert len(_lines(tmp_path / "game.log")) == 4
+
+
+def test_levels_and_async_json(tmp_path):
+    memory = MemoryHandler()
+    info = PokerLogger(None, level=LogLevel.INFO, handlers=[memory])
+    info.log_call("A", 20, 20)
+    info.log_hand_start(1)
+    assert [r.event for r in memory.records] == ["hand_start"]
+
+    path = tmp_path / "hands.jsonl"
+    logger = PokerLogger(None, handlers=[BufferedFileHandler(str(path), JsonFormatter(), header=False)],
+                         async_write=True)
+    assert isinstance(logger.handlers[0], AsyncHandler)
+    for i in range(100):
+        logger.log_call(f"P{i}", i, 2 * i)
+    logger.flush()
+    records = [json.loads(line) for line in _lines(path)]
+    assert len(records) == 100
+    assert records[-1]["player"] == "P99" and records[-1]["event"] == "call"
+    logger.close()
+
+
+def test_null_logger_touches_nothing(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    logger = NullLogger()
+    logger.log_bluff_raise("A", 40, 60)
+    logger.log_stacks([])
+    assert logger.level == LogLevel.OFF and logger.handlers == []
+    assert logger.last_action == "bluff_raise"
+    assert list(tmp_path.iterdir()) == [] and capsys.readouterr().out == ""
+
+
+def test_import_before_poker_package():
+    code = "import utils.detailed_log, poker; print(poker.PokerSimulator.__name__)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parents[1])
+    assert out.stdout.strip() == "PokerSimulator"
@@ -0,0 +1,56 @@
+import cv2
+import numpy as np
+
+from interface.card_recognizer import Slot, TableLayout
+from interface.digit_reader import (
+    DigitClassifier, DigitReader, benchmark, draw_amounts, load_crops, render_amount, segment, synthetic_crops,
+)
+
+
+def _read(reader, crop):
+    h, w = crop.shape[:2]
+    return reader.read(crop, Slot("crop", 0, 0, w, h, kind="stack"))
+
+
+def test_segment_marks_separators():
+    boxes = segment(cv2.cvtColor(render_amount(12500, 20, separators=True), cv2.COLOR_BGR2GRAY))
+    assert [b[4] for b in boxes] == [False, False, True, False, False, False]
+
+
+def test_reads_both_polarities_and_empty_region():
+    reader = DigitReader()
+    assert _read(reader, render_amount(9087, 18)) == 9087
+    assert _read(reader, render_amount(9087, 18, fg=(10, 10, 10), bg=(230, 230, 230))) == 9087
+    assert _read(reader, np.full((24, 60, 3), 35, np.uint8)) is None
+
+
+def test_synthetic_accuracy():
+    result = benchmark(DigitReader(), synthetic_crops(300, seed=3))
+    assert result["accuracy"] >= 0.97
+    assert result["ms_per_crop"] < 5
+
+
+def test_read_all_single_pass_and_cache():
+    layout = TableLayout(100, [Slot(f"stack_{i}", 10, 10 + 40 * i, 100, 30, kind="stack") for i in range(4)])
+    frame = np.full((180, 120, 3), 30, np.uint8)
+    draw_amounts(frame, layout, {"stack_0": 100, "stack_1": 2450, "stack_2": 7, "stack_3": 318000}, height=18)
+    reader = DigitReader()
+    assert reader.read_all(frame, layout.slots) == {"stack_0": 100, "stack_1": 2450, "stack_2": 7, "stack_3": 318000}
+    glyphs = reader.stats.glyphs
+    # Изменилась одна область — заново классифицируются только её символы
+    draw_amounts(frame, layout, {"stack_2": 64}, height=18)
+    assert reader.read_all(frame, layout.slots)["stack_2"] == 64
+    assert reader.stats.cache_hits == 3 and reader.stats.glyphs == glyphs + 2
+
+
+def test_fit_crops_and_load_crops(tmp_path):
+    for i, (crop, value) in enumerate(synthetic_crops(5, seed=8)):
+        cv2.imwrite(str(tmp_path / f"{value}_{i}.png"), crop)
+    cv2.imwrite(str(tmp_path / "notes.png"), render_amount(5))
+    crops = load_crops(str(tmp_path))
+    assert len(crops) == 5
+    classifier = DigitClassifier.default(heights=(16,))
+    before = len(classifier.labels)
+    added = classifier.fit_crops(crops)
+    assert added > 0 and len(classifier.labels) == before + added
+    assert benchmark(DigitReader(classifier), crops)["accuracy"] == 1.0
@@ -0,0 +1,217 @@
+import random
+import time
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from poker.cards import to_ids
+from poker.equity import (
+    ANYTIME_FIRST_BATCH, anytime_equity, deterministic_sampling, equity, evaluate_batch, exact_equity,
+    exact_state_count, monte_carlo_equity, monte_carlo_equity_python, resolve_mode,
+)
+from poker.fast_evaluator import HandState, evaluate_ids
+from poker.isomorphism import canonical_ids, permute_ids, stabilizer
+
+
+def test_evaluate_batch_matches_scalar():
+    gen = np.random.default_rng(5)
+    for k in (5, 6, 7):
+        cards = np.array([gen.permutation(52)[:k] for _ in range(5000)])
+        expected = [evaluate_ids([int(c) for c in row]) for row in cards]
+        assert evaluate_batch(cards).tolist() == expected
+
+
+def test_counts_add_up_and_are_reproducible():
+    a = monte_carlo_equity(['As', 'Ad'], [], num_opponents=3, num_simulations=12345, rng=7, batch_size=5000)
+    b = monte_carlo_equity(['As', 'Ad'], [], num_opponents=3, num_simulations=12345, rng=7, batch_size=5000)
+    assert a == b
+    assert a.total == 12345
+
+
+@pytest.mark.parametrize("hero, board, opponents", [
+    (['As', 'Ad'], [], 1),
+    (['7h', '2c'], [], 4),
+    (['Kh', 'Qh'], ['Jh', 'Th', '2c'], 2),
+    (['9s', '9d'], ['9c', 'Ks', 'Kd', '2h'], 1),
+])
+def test_numpy_engine_agrees_with_python(hero, board, opponents):
+    fast = monte_carlo_equity(hero, board, opponents, num_simulations=40000, rng=1).win_rate
+    slow = monte_carlo_equity_python(hero, board, opponents, num_simulations=8000, rng=random.Random(1)).win_rate
+    assert fast == pytest.approx(slow, abs=0.025)
+
+
+def test_known_equity():
+    # AA против одной случайной руки — около 85%
+    r = monte_carlo_equity(['As', 'Ad'], [], 1, num_simulations=100000, rng=3)
+    assert r.win_rate == pytest.approx(0.852, abs=0.01)
+
+
+def test_invalid_deals():
+    with pytest.raises(ValueError):
+        monte_carlo_equity(['As', 'As'], [], 1, 10)
+    with pytest.raises(ValueError):
+        monte_carlo_equity(['As', 'Ad'], [], -1, 10)
+    with pytest.raises(ValueError):
+        monte_carlo_equity(['As', 'Ad'], [], 24, 10)
+
+
+def _brute_force(hero, board):
+    """Хедз-ап эквити прямым перебором на скалярном оценщике."""
+    hero, board = to_ids(hero), to_ids(board)
+    rest = [c for c in range(52) if c not in hero + board]
+    wins = ties = losses = 0
+    for runout in combinations(rest, 5 - len(board)):
+        full = board + list(runout)
+        mine = evaluate_ids(hero + full)
+        left = [c for c in rest if c not in runout]
+        for opp in combinations(left, 2):
+            theirs = evaluate_ids(list(opp) + full)
+            wins += mine > theirs
+            ties += mine == theirs
+            losses += mine < theirs
+    return wins, ties, losses
+
+
+@pytest.mark.parametrize("hero, board", [
+    (['As', 'Kd'], ['Qh', '7c', '2s', '9d', '3h']),
+    (['As', 'Kd'], ['Qh', '7c', '2s', '9d']),
+    (['5h', '6h'], ['7h', '8h', 'Kc', 'Kd']),
+])
+def test_exact_matches_brute_force(hero, board):
+    r = exact_equity(hero, board, 1)
+    assert r.exact
+    assert (r.wins, r.ties, r.losses) == _brute_force(hero, board)
+
+
+def test_exact_multiway_total_and_agreement():
+    hero, board = ['Jc', 'Jd'], ['2s', '7h', 'Kd', '4c', '9s']
+    r = exact_equity(hero, board, 2)
+    assert r.total == exact_state_count(5, 2)
+    mc = monte_carlo_equity(hero, board, 2, num_simulations=100000, rng=2)
+    assert r.win_rate == pytest.approx(mc.win_rate, abs=0.01)
+
+
+def test_early_termination_bounds_contain_exact():
+    hero, board = ['As', 'Ad'], ['Ah', '7c', '2s', '3d']
+    full = exact_equity(hero, board, 1)
+    early = exact_equity(hero, board, 1, thresholds=(0.4, 0.6, 0.8))
+    assert not early.exact
+    lo, hi = early.bounds
+    assert lo <= full.win_rate <= hi
+    assert lo > 0.8
+    assert early.total < full.total
+
+
+def test_auto_mode_picks_exact_late_and_samples_early():
+    assert equity(['As', 'Kd'], ['Qh', '7c', '2s', '9d'], 1).exact
+    assert not equity(['As', 'Kd'], [], 1, num_simulations=1000, rng=1).exact
+    with pytest.raises(ValueError):
+        equity(['As', 'Kd'], [], 1, mode="magic")
+
+
+def test_suit_isomorphism_helpers():
+    hero = to_ids(['As', 'Ks'])
+    perms = stabilizer(hero)
+    assert len(perms) == 6  # пики на месте, остальные три масти — любые
+    assert all(sorted(permute_ids(hero, p)) == sorted(hero) for p in perms)
+    assert canonical_ids(to_ids(['As', 'Ks'])) == canonical_ids(to_ids(['Ah', 'Kh']))
+    assert canonical_ids(to_ids(['As', 'Ks'])) != canonical_ids(to_ids(['As', 'Kh']))
+
+
+def test_no_opponents_is_a_win():
+    assert monte_carlo_equity(['7c', '2d'], [], 0, 100).win_rate == 1.0
+    assert exact_equity(['7c', '2d'], ['Ah', 'Kh', 'Qh', 'Jh'], 0).win_rate == 1.0
+
+
+def test_parallel_pool_is_reproducible_across_worker_counts():
+    from poker.equity_pool import EquityPool
+
+    two, three = EquityPool(2), EquityPool(3)
+    try:
+        a = two.monte_carlo(['As', 'Kd'], [], 2, num_simulations=25000, rng=9)
+        b = three.monte_carlo(['As', 'Kd'], [], 2, num_simulations=25000, rng=9)
+        assert a == b
+        assert a.total == 25000
+        states = [(['As', 'Kd'], [], 1), (['7c', '7d'], ['2s', '9h', 'Kd', 'Qc'], 1)]
+        first, second = two.batch(states, num_simulations=5000, rng=1)
+        assert not first.exact and second.exact
+        assert second == exact_equity(*states[1])
+    finally:
+        two.shutdown()
+        three.shutdown()
+
+
+def test_parallel_equity_accepts_numpy_generator():
+    from poker.equity_pool import shutdown_pool
+
+    try:
+        a = equity(['As', 'Kd'], [], 1, num_simulations=20000, rng=np.random.default_rng(1), workers=2, mode="sample")
+        b = equity(['As', 'Kd'], [], 1, num_simulations=20000, rng=np.random.default_rng(1), workers=2, mode="sample")
+        assert a == b and a.total == 20000
+    finally:
+        shutdown_pool()
+
+
+def test_hand_state_seeds_equity():
+    state = HandState(["Ah", "Kh"], ["Qh", "7d", "2h", "9c"])
+    assert equity(state, None, 1, mode="exact") == equity(["Ah", "Kh"], ["Qh", "7d", "2h", "9c"], 1, mode="exact")
+
+
+def test_anytime_stops_early_when_decision_is_clear():
+    # Сет на сухом флопе против одного: интервал сразу выше всех порогов
+    r = anytime_equity(['7s', '7d'], ['7h', 'Kc', '2d'], 1, thresholds=(0.3, 0.5, 0.7),
+                       max_samples=100000, rng=1)
+    assert r.total == ANYTIME_FIRST_BATCH
+    assert r.bounds[0] > 0.7 and not r.exact
+
+
+def test_anytime_on_threshold_uses_budget_and_brackets_truth():
+    hero, board = ['Jh', 'Td'], ['9s', '8c', '2h']
+    truth = monte_carlo_equity(hero, board, 1, num_simulations=400000, rng=5).win_rate
+    r = anytime_equity(hero, board, 1, thresholds=(truth,), max_samples=30000, rng=2)
+    assert r.total == 30000                      # порог внутри интервала — до max_samples
+    assert r.bounds[0] <= r.win_rate <= r.bounds[1]
+    assert r.bounds[0] - 0.01 < truth < r.bounds[1] + 0.01
+
+    started = time.perf_counter()
+    timed = anytime_equity(hero, board, 3, thresholds=(truth,), time_budget=0.01, max_samples=10 ** 9)
+    assert time.perf_counter() - started < 0.1
+    assert 0 < timed.total < 10 ** 9
+
+
+def test_anytime_without_clock_is_reproducible():
+    hero, board = ['Ah', '5h'], ['Kh', '9h', '2c']
+    with deterministic_sampling():
+        a = anytime_equity(hero, board, 2, thresholds=(0.5,), time_budget=1e-9, max_samples=8000, rng=3)
+        b = anytime_equity(hero, board, 2, thresholds=(0.5,), time_budget=1e-9, max_samples=8000, rng=3)
+    assert a == b and a.total > ANYTIME_FIRST_BATCH
+    # Без порогов — до заданной точности
+    r = anytime_equity(hero, board, 2, precision=0.02, rng=4)
+    assert (r.bounds[1] - r.bounds[0]) / 2 <= 0.02
+
+
+def test_deterministic_sampling_is_per_thread():
+    import threading
+
+    hero, board = ['Ah', '5h'], ['Kh', '9h', '2c']
+    results = {}
+
+    def live():
+        results["live"] = anytime_equity(hero, board, 2, thresholds=(0.5,), time_budget=1e-9, max_samples=8000)
+
+    with deterministic_sampling():
+        worker = threading.Thread(target=live)
+        worker.start()
+        worker.join()
+        seeded = anytime_equity(hero, board, 2, thresholds=(0.5,), time_budget=1e-9, max_samples=8000, rng=3)
+    # Сидированный прогон в этом потоке не отключает часы стратегии в другом
+    assert results["live"].timed_out and not seeded.timed_out
+
+
+def test_resolve_mode_with_time_budget():
+    assert resolve_mode(5, 1, time_budget=0.002) == "exact"       # ривер хедз-ап: 990 исходов
+    assert resolve_mode(4, 1, time_budget=0.002) == "anytime"
+    assert resolve_mode(4, 1) == "exact"
+    assert resolve_mode(3, 2) == "sample"
+    assert equity(['As', 'Ad'], ['Kc', '7d', '2h'], 2, time_budget=0.002, thresholds=(0.5,)).bounds[0] > 0.5
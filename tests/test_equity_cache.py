@@ -0,0 +1,53 @@
+from poker.equity import deterministic_sampling
+from poker.equity_cache import EquityCache, canonical_key
+
+
+def test_canonical_key_ignores_suit_names_and_order():
+    a = canonical_key(['As', 'Ks'], ['Qs', '7s', '2d'], 2)
+    b = canonical_key(['Kh', 'Ah'], ['2c', 'Qh', '7h'], 2)
+    assert a == b
+    assert a != canonical_key(['As', 'Ks'], ['Qs', '7s', '2d'], 3)
+    assert a != canonical_key(['As', 'Kh'], ['Qs', '7s', '2d'], 2)
+
+
+def test_isomorphic_states_hit_the_cache():
+    cache = EquityCache(maxsize=8)
+    first = cache.equity(['As', 'Kd'], ['Qh', '7c', '2s', '9d'], 1)
+    second = cache.equity(['Ah', 'Kc'], ['Qs', '7d', '2h', '9c'], 1)
+    assert first is second
+    assert cache.info() == (1, 1, 8, 1)
+
+
+def test_sampled_results_are_keyed_by_size_and_skip_explicit_rng():
+    cache = EquityCache(maxsize=8)
+    cache.equity(['As', 'Kd'], [], 1, num_simulations=500)
+    cache.equity(['As', 'Kd'], [], 1, num_simulations=1000)
+    cache.equity(['As', 'Kd'], [], 1, num_simulations=500, rng=1)
+    assert cache.info().hits == 0
+    assert len(cache) == 2
+    cache.equity(['Ac', 'Kh'], [], 1, num_simulations=1000)
+    assert cache.info().hits == 1
+
+
+def test_results_cut_by_the_clock_are_not_cached():
+    cache = EquityCache(maxsize=8)
+    hero, board = ['9s', '8s'], ['Kh', '7c', '2s']   # эквити около порога — выборка упирается в бюджет
+    timed = cache.equity(hero, board, 2, num_simulations=10 ** 6, thresholds=(0.22,), time_budget=1e-9)
+    assert timed.timed_out and len(cache) == 0
+    with deterministic_sampling():
+        result = cache.equity(hero, board, 2, num_simulations=4000, thresholds=(0.22,), time_budget=1e-9)
+    assert not result.timed_out and len(cache) == 1
+
+
+def test_lru_eviction_and_resize():
+    cache = EquityCache(maxsize=2)
+    boards = [['2c', '3d', '4h', '9s', 'Jc'], ['2c', '3d', '4h', '9s', 'Qc'], ['2c', '3d', '4h', '9s', 'Kc']]
+    for board in boards:
+        cache.equity(['As', 'Ad'], board, 1)
+    assert len(cache) == 2
+    cache.equity(['As', 'Ad'], boards[0], 1)  # вытеснен — снова промах
+    assert cache.info().hits == 0
+    cache.resize(0)
+    assert len(cache) == 0
+    cache.equity(['As', 'Ad'], boards[0], 1)
+    assert len(cache) == 0
@@ -0,0 +1,108 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from poker.cards import Card, Deck, parse_card
+from poker.evaluator import evaluate_best_hand, evaluate_best_hand_reference
+from poker.fast_evaluator import (
+    HandState, _rank_multisets, evaluate_ids, evaluate_mask, evaluate_strength, strength_to_rank,
+)
+
+SUITS = "cdhs"
+
+
+def _offsuit_hand(counts):
+    """Мультимножество рангов -> карты без флеша (масти по кругу)."""
+    ranks = [i + 2 for i, c in enumerate(counts) for _ in range(c)]
+    return [Card(rank=r, suit=SUITS[k % 4]) for k, r in enumerate(ranks)]
+
+
+def _cards(*names):
+    return [parse_card(n) for n in names]
+
+
+@pytest.mark.parametrize("size", [5, 6, 7])
+def test_all_rank_patterns_match_reference(size):
+    for counts in _rank_multisets(size):
+        hand = _offsuit_hand(counts)
+        assert evaluate_best_hand(hand) == evaluate_best_hand_reference(hand), hand
+
+
+@pytest.mark.parametrize("extra", [0, 1, 2])
+def test_all_flush_masks_match_reference(extra):
+    # 5 карт одной масти + 0..2 карты другой масти
+    for ranks in combinations(range(2, 15), 5):
+        hand = [Card(rank=r, suit='s') for r in ranks]
+        hand += [Card(rank=r, suit='h') for r in (ranks[0], 14)[:extra]]
+        assert evaluate_best_hand(hand) == evaluate_best_hand_reference(hand), hand
+
+
+def test_random_seven_card_hands_match_reference():
+    rng = random.Random(7)
+    for _ in range(3000):
+        deck = Deck(rng)
+        deck.shuffle()
+        hand = deck.deal(7)
+        assert evaluate_best_hand(hand) == evaluate_best_hand_reference(hand), hand
+
+
+def test_strength_order_matches_tuple_order():
+    rng = random.Random(11)
+    for _ in range(2000):
+        deck = Deck(rng)
+        deck.shuffle()
+        a, b = deck.deal(7), deck.deal(7)
+        sa, sb = evaluate_strength(a), evaluate_strength(b)
+        assert (sa > sb) == (evaluate_best_hand(a) > evaluate_best_hand(b))
+        assert (sa == sb) == (evaluate_best_hand(a) == evaluate_best_hand(b))
+
+
+def test_known_hands():
+    assert evaluate_best_hand(_cards('As', 'Ks', 'Qs', 'Js', 'Ts', '2d', '3c')) == (8, (14,))
+    assert evaluate_best_hand(_cards('As', '2s', '3s', '4s', '5s', 'Kd', 'Kc')) == (8, (5,))
+    assert evaluate_best_hand(_cards('9s', '9h', '9d', '9c', 'Ah', '2c', '2d')) == (7, (9, 14))
+    assert evaluate_best_hand(_cards('9s', '9h', '9d', '2c', '2d', '2h', 'Ah')) == (6, (9, 2))
+    assert evaluate_best_hand(_cards('Ah', '2d', '3c', '4s', '5h', 'Kd', 'Qc')) == (4, (5,))
+    assert evaluate_best_hand(_cards('Ah', 'Ad', 'Kc', 'Ks', 'Qh', 'Qd', '2c')) == (2, (14, 13, 12))
+
+
+def test_short_hands_keep_legacy_result():
+    assert evaluate_best_hand(_cards('As', 'Ad')) == (-1, ())
+    with pytest.raises(ValueError):
+        evaluate_best_hand(_cards('As'))
+    with pytest.raises(ValueError):
+        evaluate_strength(_cards('As', 'Ad'))
+
+
+def test_evaluate_ids_matches_cards():
+    hand = _cards('Td', 'Jd', 'Qd', 'Kd', '2c', '9d', '7h')
+    assert strength_to_rank(evaluate_ids([c.id for c in hand])) == (8, (13,))
+    mask = sum(c.mask for c in hand)
+    assert evaluate_mask(mask) == evaluate_strength(hand) == evaluate_strength([str(c) for c in hand])
+
+
+def test_hand_state_tracks_each_street():
+    rng = random.Random(13)
+    for _ in range(2000):
+        ids = rng.sample(range(52), 7)
+        state = HandState(ids[:2])
+        assert state.strength == -1 and state.rank == (-1, ())
+        state.extend(ids[2:5])
+        assert state.strength == evaluate_ids(ids[:5])
+        flop = state.copy()
+        state.add(ids[5])
+        assert state.strength == evaluate_ids(ids[:6])
+        state.add(ids[6])
+        assert state.strength == evaluate_ids(ids)
+        assert state.rank == evaluate_best_hand_reference([Card(2 + i // 4, SUITS[i % 4]) for i in ids])
+        assert flop.strength == evaluate_ids(ids[:5]) and len(flop.board) == 3
+
+
+def test_hand_state_rejects_bad_cards():
+    state = HandState(["As", "Kd"], ["Qh", "Jc", "Tc"])
+    with pytest.raises(ValueError):
+        state.add("As")
+    state.extend(["2c", "3c"])
+    with pytest.raises(ValueError):
+        state.add("4c")
@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+
+from interface.card_recognizer import default_layout, render_table
+from interface.frame_diff import FrameDiff, TableWatcher, main, read_frames
+
+HOLE = {"hole_1": "Ah", "hole_2": "Kh"}
+STREETS = [HOLE, {**HOLE, "board_1": "2c", "board_2": "7d", "board_3": "Js"},
+           {**HOLE, "board_1": "2c", "board_2": "7d", "board_3": "Js", "board_4": "Qh"}]
+
+
+def _record(layout, directory, repeat=4):
+    """Раздача: по repeat одинаковых кадров на улицу."""
+    i = 0
+    for cards in STREETS:
+        frame = render_table(layout, cards)
+        for _ in range(repeat):
+            cv2.imwrite(str(directory / f"frame_{i:04d}.png"), frame)
+            i += 1
+    return i
+
+
+def test_only_changed_regions_are_recognized(tmp_path):
+    layout = default_layout(100)
+    frames = _record(layout, tmp_path)
+    watcher = TableWatcher(layout)
+    events = [(e.frame, e.region, e.new) for _, image in read_frames(str(tmp_path)) for e in watcher.process(image)]
+    assert events == [(0, "hole_1", "Ah"), (0, "hole_2", "Kh"),
+                      (4, "board_1", "2c"), (4, "board_2", "7d"), (4, "board_3", "Js"), (8, "board_4", "Qh")]
+    assert watcher.state["board_5"] is None
+    stats = watcher.stats
+    # Первый кадр — все 7 областей, затем флоп (3) и тёрн (1)
+    assert stats.frames == frames and stats.recognitions == 7 + 3 + 1
+    assert stats.skipped == 7 * frames - stats.recognitions
+
+
+def test_tolerance_ignores_noise():
+    layout = default_layout(100)
+    frame = render_table(layout, HOLE)
+    noisy = np.clip(frame.astype(np.int16) + np.random.default_rng(1).integers(-2, 3, frame.shape), 0, 255)
+    noisy = noisy.astype(np.uint8)
+    exact, tolerant = FrameDiff(layout.slots), FrameDiff(layout.slots, tolerance=3)
+    assert len(exact.changed(frame)) == len(tolerant.changed(frame)) == 7
+    assert len(exact.changed(noisy)) == 7
+    assert tolerant.changed(noisy) == []
+
+
+def test_cli_reports_skipped(tmp_path, capsys):
+    _record(default_layout(120), tmp_path, repeat=2)
+    assert main([str(tmp_path)]) == 0
+    out = capsys.readouterr().out
+    assert "board_4   - -> Qh" in out and "пропущено: 31" in out
+
+
+def test_screen_reader_watcher_tracks_buttons(tmp_path):
+    from interface.card_recognizer import Slot
+    from interface.screen_reader import ScreenReader
+
+    layout = default_layout(100)
+    layout.slots.append(Slot("fold", 10, 300, 60, 30, kind="button"))
+    reader = ScreenReader(layout)
+    reader.load_templates()
+    frame = render_table(layout, HOLE)
+    button = np.zeros((20, 50), np.uint8)
+    cv2.putText(button, "F", (15, 17), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 255, 2)
+    reader.button_templates["FOLD"] = button
+    watcher = reader.watcher()
+    assert {e.region for e in watcher.process(frame)} == {"hole_1", "hole_2"}
+    frame[305:325, 15:65] = button[..., None]
+    assert [(e.region, e.new) for e in watcher.process(frame)] == [("fold", "fold")]
+    assert watcher.stats.recognitions == 8 + 1
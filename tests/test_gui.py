@@ -0,0 +1,38 @@
+import tkinter as tk
+
+import pytest
+
+from gui.poker_gui import CardRow, CardSprites, changed_slots
+from poker.cards import parse_card
+
+
+def _cards(text):
+    return [parse_card(c) for c in text.split()]
+
+
+def test_changed_slots():
+    assert changed_slots(_cards("Ah Kd"), _cards("Ah Kd")) == []
+    assert changed_slots(_cards("2c 7d Js"), _cards("2c 7d Js Qh")) == [3]
+    assert changed_slots(_cards("Ah Kd"), _cards("Ah Qs")) == [1]
+    assert changed_slots(_cards("2c 7d Js Qh"), []) == [0, 1, 2, 3]
+
+
+def test_card_row_reuses_labels():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("нет дисплея")
+    try:
+        sprites = CardSprites("templates/cards")
+        assert len(sprites.images) == 52
+        row = CardRow(root, sprites, 5, "#0d3b2a", ("Arial", 14), 5, empty_text="Борд пуст")
+        labels = [label for _, label in row.slots]
+        row.show(_cards("2c 7d Js"))
+        image = labels[0].cget("image")
+        row.show(_cards("2c 7d Js Qh"))
+        assert [label for _, label in row.slots] == labels and labels[0].cget("image") == image
+        assert labels[3].cget("image") == str(sprites.get(parse_card("Qh")))
+        row.show([])
+        assert row.cards == [] and row.empty.winfo_manager() == "pack"
+    finally:
+        root.destroy()
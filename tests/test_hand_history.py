@@ -0,0 +1,121 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from ai.basic_strategy import aggressive_strategy, simple_strategy
+from poker.batch_runner import run_batch
+from poker.hand_history import (
+    ACTION_DTYPE, HAND_DTYPE, MAX_ACTIONS, HandHistoryWriter, decode_hand, export_csv, export_json,
+    iter_blocks, iter_chunks, iter_hands, read_header,
+)
+from poker.simulator import Player
+
+STRATEGIES = [("simple", simple_strategy), ("agg", aggressive_strategy), ("simple2", simple_strategy)]
+
+
+def _all_hands(path):
+    return np.concatenate([hands for hands, _ in iter_blocks(path)])
+
+
+@pytest.fixture(scope="module")
+def history(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("hh") / "hands.phh")
+    run_batch(STRATEGIES, 300, seed=4, history=path)
+    return path
+
+
+def test_records_round_trip(history):
+    header = read_header(history)
+    assert header["seats"] == ["simple", "agg", "simple2"]
+    hands = _all_hands(history)
+    assert len(hands) == 300
+    assert list(hands["hand_id"]) == list(range(300))
+    # Фишки не появляются и не пропадают
+    assert (hands["stack_start"].sum(axis=1) == hands["stack_end"].sum(axis=1)).all()
+    for rec in hands[:50]:
+        cards = [c for c in rec["hole"][:3].ravel() if c >= 0] + [c for c in rec["board"] if c >= 0]
+        assert len(set(cards)) == len(cards)
+        assert rec["winners"] != 0 or rec["pot"].max() == 0
+
+
+def test_chunked_reader_matches_blocks(history):
+    chunks = list(iter_chunks(history, chunk_hands=64))
+    assert [len(hands) for hands, _ in chunks] == [64] * 4 + [44]
+    assert np.array_equal(np.concatenate([hands for hands, _ in chunks]), _all_hands(history))
+    assert [len(actions) for _, actions in chunks] == [int(h["num_actions"].sum()) for h, _ in chunks]
+    hands = list(iter_hands(history, chunk_hands=7))
+    assert len(hands) == 300
+    assert all(len(actions) == record["num_actions"] and actions[0]["code"] == 6 for record, actions in hands)
+
+
+def test_actions_take_only_the_space_they_use(history):
+    import os
+
+    hands = _all_hands(history)
+    payload = len(hands) * HAND_DTYPE.itemsize + int(hands["num_actions"].sum()) * ACTION_DTYPE.itemsize
+    assert os.path.getsize(history) - read_header(history)["data_offset"] == payload + 8   # один блок
+    assert os.path.getsize(history) / len(hands) < 300
+
+
+def _write(path, hands, buffer_hands, flush_mid_hand=False):
+    """hands раздач по 2 + i действия; с flush_mid_hand — сброс посреди каждой раздачи."""
+    players = [Player("a", None), Player("b", None)]
+    with HandHistoryWriter(path, ["a", "b"], buffer_hands=buffer_hands) as writer:
+        for i in range(hands):
+            writer.begin_hand(players)
+            writer.action(0, 0, 6, 10)
+            if flush_mid_hand:
+                writer.flush()
+            for k in range(1 + i):
+                writer.action(1, 0, 1, i * 100 + k)
+            writer.end_hand([], players, 1, ["b"])
+
+
+def test_blocks_and_mid_hand_flush(tmp_path):
+    path = str(tmp_path / "blocks.phh")
+    _write(path, 5, buffer_hands=2, flush_mid_hand=True)
+    hands = list(iter_hands(path))
+    assert [int(r["hand_id"]) for r, _ in hands] == list(range(5))
+    assert [[int(a["amount"]) for a in actions] for _, actions in hands] == \
+        [[10] + [i * 100 + k for k in range(1 + i)] for i in range(5)]
+    blocks = list(iter_blocks(path))
+    assert sum(len(hands) for hands, _ in blocks) == 5 and len(blocks) >= 3
+    # Блоки — виды на файл, а не копии в памяти
+    assert all(isinstance(hands.base, np.memmap) for hands, _ in blocks)
+
+
+def test_partial_trailing_block_is_ignored(tmp_path):
+    path = tmp_path / "cut.phh"
+    _write(str(path), 5, buffer_hands=2)     # блоки по 2, 2 и 1 раздаче
+    data = path.read_bytes()
+    path.write_bytes(data[:-ACTION_DTYPE.itemsize])
+    assert sum(len(hands) for hands, _ in iter_chunks(str(path))) == 4
+    assert [len(hands) for hands, _ in iter_blocks(str(path))] == [2, 2]
+
+
+def test_actions_are_capped(tmp_path):
+    path = str(tmp_path / "long.phh")
+    players = [Player("a", None), Player("b", None)]
+    with HandHistoryWriter(path, ["a", "b"]) as writer:
+        writer.begin_hand(players)
+        for _ in range(MAX_ACTIONS + 5):
+            writer.action(0, 0, 1, 20)
+        writer.end_hand([], players, 1, ["b"])
+    hand = decode_hand(*next(iter_hands(path)), ["a", "b"])
+    assert len(hand["actions"]) == MAX_ACTIONS and hand["truncated"]
+    assert hand["winners"] == ["b"] and hand["players"][0]["hole"] == []
+
+
+def test_exports(history, tmp_path):
+    assert export_csv(history, str(tmp_path / "hands.csv")) == 300
+    assert export_json(history, str(tmp_path / "training.json")) == 300
+    with open(tmp_path / "hands.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    data = json.loads((tmp_path / "training.json").read_text(encoding="utf-8"))
+    assert len(rows) == len(data) == 300
+    assert rows[0]["winners"] == " ".join(data[0]["winners"])
+    assert data[0]["actions"][0]["street"] == "Preflop"
+    assert {a["action"] for h in data for a in h["actions"]} <= {
+        "blind", "fold", "check", "call", "raise", "bluff_raise", "allin"}
@@ -0,0 +1,44 @@
+import pytest
+
+from ai.basic_strategy import aggressive_strategy, simple_strategy
+from poker.matchup import merge_shards, plan_shards, run_matchups
+
+STRATEGIES = [("simple", simple_strategy), ("aggressive", aggressive_strategy)]
+
+
+def _strip(report):
+    d = report.to_dict()
+    d.pop("seconds")
+    return d
+
+
+def test_plan_alternates_seats_and_is_seeded():
+    shards = plan_shards(STRATEGIES, hands_per_shard=10, shards_per_pair=4, seed=1)
+    assert [s.seats[0][0] for s in shards] == ["simple", "aggressive"] * 2
+    assert all(s.pair == ("simple", "aggressive") for s in shards)
+    assert [s.seed for s in shards] == [s.seed for s in plan_shards(STRATEGIES, 10, 4, seed=1)]
+    assert len({s.seed for s in shards}) == 4
+    with pytest.raises(ValueError):
+        plan_shards([STRATEGIES[0], STRATEGIES[0]])
+
+
+def test_parallel_matches_serial():
+    serial = run_matchups(STRATEGIES, hands_per_shard=150, shards_per_pair=4, seed=7, workers=1)
+    parallel = run_matchups(STRATEGIES, hands_per_shard=150, shards_per_pair=4, seed=7, workers=2)
+    assert _strip(serial) == _strip(parallel)
+    pair = serial.pairs[("simple", "aggressive")]
+    assert pair.hands == 600 and len(pair.shard_bb_per_100) == 4
+    low, high = pair.confidence_interval
+    assert low <= pair.bb_per_100 <= high
+
+
+def test_merge_ignores_completion_order():
+    shards = plan_shards(STRATEGIES + [("simple2", simple_strategy)], 50, 2, seed=3)
+    results = []
+    run_matchups(STRATEGIES + [("simple2", simple_strategy)], 50, 2, seed=3, workers=1,
+                 progress=results.append)
+    assert len(results) == len(shards) == 6
+    forward = merge_shards(results)
+    backward = merge_shards(results[::-1])
+    assert {k: v.to_dict() for k, v in forward.items()} == {k: v.to_dict() for k, v in backward.items()}
+    assert list(forward) == [("simple", "aggressive"), ("simple", "simple2"), ("aggressive", "simple2")]
@@ -0,0 +1,163 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from ai.basic_strategy import aggressive_strategy, monte_carlo_strategy, simple_strategy
+from interface.card_recognizer import Slot, default_layout, render_table
+from interface.clicker import RecordingActor, button_for
+from interface.frame_diff import TableWatcher
+from interface.pipeline import Pipeline, TableView, replay
+from interface.screen_reader import ScreenReader
+
+BUTTONS = ("FOLD", "CALL", "RAISE")
+HOLE = {"hole_1": "Ah", "hole_2": "Kh"}
+FLOP = {**HOLE, "board_1": "2c", "board_2": "7d", "board_3": "Js"}
+
+
+def _button(name):
+    image = np.full((30, 84), 60, np.uint8)
+    cv2.putText(image, name, (6, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 230, 2, cv2.LINE_AA)
+    return image
+
+
+def _table():
+    """Разметка с кнопками и ScreenReader, у которого шаблоны кнопок нарисованы."""
+    layout = default_layout(100)
+    layout.slots += [Slot(name, 20 + 110 * i, 300, 100, 40, kind="button") for i, name in enumerate(BUTTONS)]
+    reader = ScreenReader(layout)
+    reader.load_templates()
+    reader.button_templates = {name: _button(name) for name in BUTTONS}
+    return layout, reader
+
+
+def _frame(layout, cards, my_turn):
+    frame = render_table(layout, cards)
+    if my_turn:
+        for slot in layout.slots:
+            if slot.kind == "button":
+                frame[slot.y + 5:slot.y + 35, slot.x + 8:slot.x + 92] = cv2.cvtColor(_button(slot.name),
+                                                                                  cv2.COLOR_GRAY2BGR)
+    return frame
+
+
+def _record(tmp_path, layout):
+    """Префлоп: ждём, ход; флоп: ждём, ход — по 3 одинаковых кадра."""
+    spots = [(HOLE, False), (HOLE, True), (FLOP, False), (FLOP, True)]
+    for i, (cards, my_turn) in enumerate(spots):
+        frame = _frame(layout, cards, my_turn)
+        for j in range(3):
+            cv2.imwrite(str(tmp_path / f"frame_{3 * i + j:04d}.png"), frame)
+
+
+def test_replayed_frames_drive_actor(tmp_path):
+    layout, reader = _table()
+    _record(tmp_path, layout)
+    actor = RecordingActor()
+    pipeline = Pipeline(reader.watcher(), simple_strategy, actor, drop=False, max_age=float("inf"))
+    stats = pipeline.run(replay(str(tmp_path)))
+    assert [(m.frame, m.stage, m.action, button) for m, button in actor.moves] == [
+        (3, "Preflop", "call", "CALL"), (9, "Flop", "call", "CALL")]
+    assert actor.moves[1][0].board == ("2c", "7d", "Js")
+    assert stats.stages["capture"].items == stats.stages["recognize"].items == 12
+    assert stats.stages["decide"].items == 4   # только кадры, где что-то изменилось
+    assert stats.total.items == 2 and stats.total.max_seconds > 0
+
+
+def test_backpressure_drops_oldest_frames():
+    layout = default_layout(100)
+
+    def slow(image, slot):
+        time.sleep(0.005)
+        return None
+
+    watcher = TableWatcher(layout, {"hole": slow}, tolerance=0.0)
+    frames = [np.full((330, 600, 3), i, np.uint8) for i in range(40)]
+    stats = Pipeline(watcher, simple_strategy, RecordingActor(), budgets={"recognize": 0.001}).run(frames)
+    recognize = stats.stages["recognize"]
+    assert recognize.dropped > 0
+    assert recognize.items + recognize.dropped == 40
+    assert recognize.over_budget == recognize.items
+
+
+def test_stale_moves_are_not_executed(tmp_path):
+    layout, reader = _table()
+    _record(tmp_path, layout)
+    actor = RecordingActor()
+    stats = Pipeline(reader.watcher(), simple_strategy, actor, drop=False, max_age=0.0).run(replay(str(tmp_path)))
+    # Каждый устаревший ход решается заново по следующему кадру — и снова устаревает
+    assert actor.moves == [] and stats.stages["act"].stale >= 2
+
+
+def test_stale_move_is_decided_again_on_next_frame():
+    layout, reader = _table()
+    frame = _frame(layout, HOLE, my_turn=True)
+    calls = []
+
+    def slow_first(player, community_cards, pot, stage, current_bet=None):
+        calls.append(stage)
+        if len(calls) == 1:
+            time.sleep(0.2)   # первое решение дольше max_age — ход устареет
+        return "call"
+
+    def source():
+        yield frame
+        time.sleep(0.4)
+        yield frame           # тот же стол: TableWatcher событий не выдаёт
+
+    actor = RecordingActor()
+    stats = Pipeline(reader.watcher(), slow_first, actor, max_age=0.1).run(source())
+    assert stats.stages["act"].stale == 1
+    assert [(m.frame, button) for m, button in actor.moves] == [(1, "CALL")]
+    assert len(calls) == 2
+
+
+def test_amount_to_call_comes_from_bet_regions():
+    layout, reader = _table()
+    seen = []
+
+    def strategy(player, community_cards, pot, stage, current_bet=None):
+        seen.append((player.stack, pot, current_bet))
+        return "fold"
+
+    pipeline = Pipeline(reader.watcher(), strategy, RecordingActor())
+    view = TableView(0, time.perf_counter(), ("Ah", "Kh"), (), ("FOLD", "CALL"),
+                     {"stack_1": 900, "stack_2": 400, "bet_1": 20, "bet_2": 600}, pot=650)
+    move = pipeline._decide(view)
+    assert seen == [(900, 650, 580)] and move.to_call == 580
+    # Стратегии без current_bet вызываются как в симуляторе
+    pipeline = Pipeline(reader.watcher(), aggressive_strategy, RecordingActor())
+    assert pipeline._decide(view).action in ("fold", "call", "raise_2x")
+
+
+def test_view_with_duplicate_cards_is_skipped():
+    layout, reader = _table()
+    pipeline = Pipeline(reader.watcher(), monte_carlo_strategy, RecordingActor())
+    now = time.perf_counter()
+    # Туз пик прочитан и на руке, и на борде — например, посреди анимации раздачи
+    assert pipeline._decide(TableView(0, now, ("As", "Kd"), ("As", "2c", "3d"), ("FOLD", "CALL"))) is None
+    assert pipeline._decide(TableView(1, now, ("As", "K?"), (), ("FOLD", "CALL"))) is None
+    assert pipeline.stats.stages["decide"].rejected == 2
+    move = pipeline._decide(TableView(2, now, ("As", "Kd"), ("Ah", "2c", "3d"), ("FOLD", "CALL")))
+    assert move is not None and move.stage == "Flop"
+    assert "отклонено 2" in pipeline.stats.stages["decide"].format()
+
+
+def test_stage_error_is_raised(tmp_path):
+    layout, reader = _table()
+    _record(tmp_path, layout)
+
+    def broken(*args):
+        raise RuntimeError("strategy failed")
+
+    with pytest.raises(RuntimeError):
+        Pipeline(reader.watcher(), broken, RecordingActor(), drop=False).run(replay(str(tmp_path)))
+
+
+def test_button_for():
+    assert button_for("fold", ["FOLD", "CALL"]) == "FOLD"
+    assert button_for("fold", ["CHECK", "RAISE"]) == "CHECK"
+    assert button_for("call", ["CHECK", "RAISE"]) == "CHECK"
+    assert button_for("raise_2x", ["FOLD", "CALL"]) == "CALL"
+    assert button_for("allin", ["FOLD"]) is None
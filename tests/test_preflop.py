@@ -0,0 +1,38 @@
+import pytest
+
+from poker.cards import parse_card
+from poker.preflop import (
+    HAND_CLASSES, MAX_OPPONENTS, build_table, class_representative, hand_class, load_table, preflop_equity,
+)
+
+
+def _cards(*names):
+    return [parse_card(n) for n in names]
+
+
+def test_hand_classes():
+    assert len(HAND_CLASSES) == len(set(HAND_CLASSES)) == 169
+    assert sum(len(c) == 2 for c in HAND_CLASSES) == 13
+    assert sum(c.endswith('s') for c in HAND_CLASSES) == 78
+    assert hand_class(_cards('Kd', 'As')) == 'AKo'
+    assert hand_class(_cards('9h', 'Th')) == 'T9s'
+    assert hand_class(['2c', '2d']) == '22'
+    for name in HAND_CLASSES:
+        assert hand_class(class_representative(name)) == name
+
+
+def test_shipped_table_lookup():
+    table = load_table()
+    assert table is not None, "data/preflop_equity_v1.npy отсутствует — python -m poker.preflop"
+    assert table.shape == (169, MAX_OPPONENTS)
+    assert preflop_equity(_cards('As', 'Ad'), 1) == pytest.approx(0.852, abs=0.01)
+    assert preflop_equity(_cards('Ah', 'Ad'), 3) > preflop_equity(_cards('Kh', 'Kd'), 3)
+    assert preflop_equity(_cards('7c', '2d'), 1) < preflop_equity(_cards('7c', '2c'), 1)
+    assert preflop_equity(_cards('7c', '2d'), 0) is None
+
+
+def test_build_table_is_seeded():
+    a = build_table(num_simulations=200, max_opponents=1, seed=3)
+    b = build_table(num_simulations=200, max_opponents=1, seed=3)
+    assert a.shape == (169, 1)
+    assert (a == b).all()
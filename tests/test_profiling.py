@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from ai.basic_strategy import monte_carlo_strategy, simple_strategy
+from poker import fast_evaluator
+from poker.batch_runner import run_batch
+from poker.fast_evaluator import evaluate_ids
+from utils import profiling
+from utils.profiling import LatencyHistogram, Profiler
+
+
+def test_histogram_percentiles():
+    h = LatencyHistogram()
+    for i in range(1, 1001):
+        h.add(i * 1e-5)           # 10 мкс .. 10 мс равномерно
+    assert h.count == 1000
+    assert h.percentile(50) == pytest.approx(5e-3, rel=0.06)
+    assert h.percentile(99) == pytest.approx(9.9e-3, rel=0.06)
+    assert h.percentile(100) <= h.max == pytest.approx(1e-2)
+    assert h.mean == pytest.approx(5.005e-3)
+
+
+def test_decisions_are_recorded_per_strategy_and_street(tmp_path):
+    with profiling.profiling() as prof:
+        assert profiling.active is prof and fast_evaluator.eval_counter is prof.counter
+        run_batch([simple_strategy, monte_carlo_strategy], 100, seed=4)
+    assert profiling.active is None and fast_evaluator.eval_counter is None
+
+    snap = prof.snapshot()
+    simple, mc = snap["strategies"]["simple_strategy"], snap["strategies"]["monte_carlo_strategy"]
+    assert list(simple)[0] == "Preflop" and list(simple)[-1] == "all"
+    assert simple["Preflop"]["decisions"] == 100
+    assert simple["all"]["evals_per_decision"] == 0
+    # Префлоп — таблица, постфлоп — перебор/Монте-Карло
+    assert mc["Preflop"]["evals_per_decision"] == 0
+    assert mc["Flop"]["evals_per_decision"] > 0
+    for d in mc.values():
+        assert 0 < d["p50_ms"] <= d["p95_ms"] <= d["p99_ms"] <= d["max_ms"]
+    assert "monte_carlo_strategy" in prof.format_report()
+    prof.save(str(tmp_path / "prof.json"))
+    assert json.loads((tmp_path / "prof.json").read_text())["evaluations"] == snap["evaluations"]
+
+
+def test_disabled_profiler_records_nothing():
+    prof = Profiler()
+    run_batch([simple_strategy, simple_strategy], 20, seed=1)
+    assert prof.stats == {} and not prof.enabled
+    prof.enable()
+    evaluate_ids([0, 5, 10, 15, 20, 25, 30])
+    other = Profiler().enable()       # включение второго выключает первый
+    assert not prof.enabled and prof.counter.n == 1
+    other.disable()
+    prof.reset()
+    assert prof.counter.n == 0 and prof.snapshot()["strategies"] == {}
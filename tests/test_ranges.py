@@ -0,0 +1,90 @@
+from itertools import combinations
+
+import pytest
+
+from ai.basic_strategy import estimate_win_rate
+from poker.cards import to_ids
+from poker.equity import equity
+from poker.fast_evaluator import evaluate_ids
+from poker.ranges import Range, parse_range, range_equity
+
+
+def test_notation():
+    assert len(parse_range("AA")) == 6
+    assert len(parse_range("AKs")) == 4
+    assert len(parse_range("AKo")) == 12
+    assert len(parse_range("ak")) == 16
+    assert len(parse_range("QQ+")) == 18
+    assert len(parse_range("ATs+")) == 16
+    assert len(parse_range("22-55")) == len(parse_range("55-22")) == 24
+    assert len(parse_range("A5s-A2s")) == 16
+    assert len(parse_range("random")) == 1326
+    r = parse_range("QQ+, AKs, 76s, AhKh:0.5, KK:0")
+    assert len(r) == 6 + 6 + 4 + 4 - 0  # KK с весом 0 выпадает
+    assert r.to_dict()["AhKh"] == 0.5 and r.to_dict()["AsKs"] == 1.0
+    for bad in ("AKx", "QQs", "AK-QJ", "AhAh", "AK:-1", "", "Z2"):
+        with pytest.raises(ValueError):
+            parse_range(bad)
+
+
+def _brute_force(hero, villain: Range, board):
+    """Эквити двух карт против диапазона полным перебором по отдельным комбо."""
+    hero, board = to_ids(hero), to_ids(board)
+    dead = set(hero + board)
+    wins = ties = total = 0.0
+    for (a, b), w in zip(villain.combos.tolist(), villain.weights.tolist()):
+        if a in dead or b in dead:
+            continue
+        left = [c for c in range(52) if c not in dead | {a, b}]
+        for run in combinations(left, 5 - len(board)):
+            h = evaluate_ids(hero + board + list(run))
+            v = evaluate_ids([a, b] + board + list(run))
+            wins += w * (h > v)
+            ties += w * (h == v)
+            total += w
+    return (wins + ties / 2) / total
+
+
+def test_exact_matches_brute_force_with_weights():
+    villain = parse_range("QQ+:0.5, AKs, 76s, Th9h")
+    board = ["Qh", "7d", "2h", "9c"]
+    result = range_equity(["Ah", "Kh"], villain, board, mode="exact")
+    assert result.exact
+    assert result.win_rate == pytest.approx(_brute_force(["Ah", "Kh"], villain, board))
+
+
+def test_random_range_equals_uniform_equity():
+    board = ["Qh", "7d", "2h"]
+    assert range_equity(["Ah", "Kh"], "random", board, mode="exact").win_rate == pytest.approx(
+        equity(["Ah", "Kh"], board, 1, mode="exact").win_rate)
+
+
+def test_sampling_agrees_with_exact_multiway():
+    hero, villains, board = "TT+, AQs+", ["22+, AJ+", "random"], ["Kd", "8s", "3h", "2c"]
+    exact = range_equity(hero, villains, board, mode="exact")
+    sample = range_equity(hero, villains, board, mode="sample", num_simulations=60000, rng=3)
+    assert sample.win_rate == pytest.approx(exact.win_rate, abs=0.01)
+    again = range_equity(hero, villains, board, mode="sample", num_simulations=60000, rng=3)
+    assert (again.wins, again.ties, again.losses) == (sample.wins, sample.ties, sample.losses)
+
+
+def test_card_removal():
+    # У героя два туза — у соперника с диапазоном AA остаётся одно комбо (AdAc)
+    result = range_equity(["As", "Ah"], "AA", [], mode="sample", num_simulations=5000, rng=1)
+    assert result.win_rate == pytest.approx(0.5, abs=0.03)
+    with pytest.raises(ValueError):
+        range_equity(["As", "Ah"], "AsAd", [])
+    with pytest.raises(ValueError):
+        range_equity("AsAh", ["AsKs"], [], mode="sample", num_simulations=100)
+
+
+def test_estimate_win_rate_with_ranges():
+    rate = estimate_win_rate(["Ah", "Kh"], ["Qh", "7d", "2h", "9c"], num_opponents=1, ranges=["QQ+"])
+    assert rate == pytest.approx(range_equity(["Ah", "Kh"], "QQ+", ["Qh", "7d", "2h", "9c"]).win_rate)
+    # Одна строка или Range — один соперник, а не список символов
+    board = ["Qh", "7d", "2h", "9c"]
+    assert estimate_win_rate(["Ah", "Kh"], board, 1, ranges="QQ+, AKs") == pytest.approx(
+        range_equity(["Ah", "Kh"], ["QQ+, AKs"], board).win_rate)
+    assert estimate_win_rate(["Ah", "Kh"], board, 1, ranges=parse_range("QQ+")) == pytest.approx(rate)
+    sampled = estimate_win_rate(["Ah", "Kh"], [], 1, ranges="QQ+", mode="anytime", num_simulations=2000, rng=1)
+    assert 0.3 < sampled < 0.5
@@ -0,0 +1,38 @@
+import random
+
+from ai.basic_strategy import estimate_win_rate
+from poker.cards import parse_card
+
+
+def _cards(*names):
+    return [parse_card(n) for n in names]
+
+
+def test_estimate_win_rate_range():
+    rate = estimate_win_rate(_cards('As', 'Ad'), [], num_opponents=2, num_simulations=2000, rng=random.Random(1))
+    assert 0.6 < rate < 0.85
+
+
+def test_estimate_win_rate_accepts_ids_and_masks():
+    hero = _cards('Kh', 'Qh')
+    board = _cards('Jh', 'Th', '9h')  # стрит-флеш на флопе
+    assert estimate_win_rate(hero, board, 3, 300) == 1.0
+    assert estimate_win_rate([c.id for c in hero], sum(c.mask for c in board), 3, 300) == 1.0
+
+
+def test_estimate_win_rate_is_seeded():
+    hero = _cards('7c', '8c')
+    a = estimate_win_rate(hero, [], 2, 1000, rng=random.Random(42))
+    b = estimate_win_rate(hero, [], 2, 1000, rng=random.Random(42))
+    assert a == b
+
+
+def test_estimate_win_rate_uses_cache():
+    from ai.basic_strategy import clear_equity_cache, equity_cache_info
+
+    clear_equity_cache()
+    hero, board = _cards('Qs', 'Qd'), _cards('2c', '7h', 'Ks', '9d')
+    first = estimate_win_rate(hero, board, 1)
+    assert estimate_win_rate(_cards('Qh', 'Qc'), _cards('2s', '7d', 'Kh', '9c'), 1) == first
+    info = equity_cache_info()
+    assert (info.hits, info.misses) == (1, 1)
@@ -1,82 +1,339 @@
-import os
+"""
+Лог раздач: структурированные записи, форматтеры и буферизованные обработчики.
+
+Основные объекты:
+- LogLevel                    : DEBUG (каждое действие), INFO (итоги раздачи), OFF (ничего)
+- LogRecord                   : (time, level, event, data) — запись без форматирования
+- TextFormatter / JsonFormatter
+- ConsoleHandler, BufferedFileHandler, MemoryHandler, AsyncHandler (фоновый поток с очередью)
+- PokerLogger                 : прежний API (log_call, log_fold, ...), поверх обработчиков
+- NullLogger                  : PokerLogger на уровне OFF — без файла, форматирования и print
+
+Файл пишется пачками по buffer_size строк (и при flush()/close()/выходе из процесса),
+а не открывается на каждое действие. Текстовый вывод совпадает с прежним.
+"""
+
+import atexit
+import json
+import queue
+import sys
+import threading
+import time
+import weakref
+from collections import namedtuple
 from datetime import datetime
-from typing import List
-from poker.cards import Card
+from enum import IntEnum
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from poker.cards import Card
+
+
+class LogLevel(IntEnum):
+    DEBUG = 10   # каждое действие игрока
+    INFO = 20    # начало раздачи, карты, борд, итог, стеки
+    OFF = 100    # ничего не пишется
+
+
+LogRecord = namedtuple("LogRecord", ["time", "level", "event", "data"])
+
+DEFAULT_BUFFER_SIZE = 256
+
+
+class TextFormatter:
+    """Человекочитаемые строки — те же, что писал PokerLogger раньше."""
+
+    def format(self, record: LogRecord) -> str:
+        d = record.data
+        event = record.event
+        if event == "call":
+            return f"  {d['player']} → CALL {d['amount']} (банк: {d['pot']})"
+        if event == "fold":
+            return f"  {d['player']} → FOLD (банк: {d['pot']})"
+        if event == "bluff_raise":
+            return f"  {d['player']} → 🎭 BLUFF RAISE {d['amount']}! (банк: {d['pot']})"
+        if event == "raise":
+            return f"  {d['player']} → {d['raise_type']} {d['amount']}! (банк: {d['pot']})"
+        if event == "allin":
+            return f"  {d['player']} → ALL-IN {d['amount']}! (банк: {d['pot']})"
+        if event == "action":
+            return f"  {d['player']} → {d['action'].upper()} (банк: {d['pot']})"
+        if event == "hand_start":
+            return f"\n--- Раздача {d['hand']} ---"
+        if event == "preflop":
+            lines = ["[Preflop] Карты розданы:"]
+            for name, hand, stack in d["players"]:
+                lines.append(f"  {name}: {' '.join(c.pretty() for c in hand)} (стек: {stack})")
+            return "\n".join(lines)
+        if event == "board":
+            return f"[{d['stage']}] Борд: {' '.join(c.pretty() for c in d['board'])}"
+        if event == "showdown":
+            winners = d["winners"]
+            if winners:
+                return f"🏆 Шоудаун: победитель(и): {', '.join(winners)} → +{d['pot'] // len(winners)}"
+            return f"🏆 Шоудаун: нет победителей (банк: {d['pot']})"
+        if event == "all_folded":
+            return f"🎉 Все сбросили! {d['winner']} забирает {d['pot']}"
+        if event == "stacks":
+            return "📊 Стеки: " + " | ".join(f"{name}: {stack}" for name, stack in d["stacks"])
+        return str(d.get("text", d))
+
+
+class JsonFormatter:
+    """Одна JSON-строка на запись (карты — строками 'As'), удобно для последующего разбора."""
+
+    def format(self, record: LogRecord) -> str:
+        return json.dumps({"time": record.time, "level": record.level.name, "event": record.event,
+                           **record.data}, ensure_ascii=False, default=str)
+
+
+class Handler:
+    """Получатель записей. emit() вызывается для каждой записи, прошедшей уровень логгера."""
+
+    def __init__(self, formatter=None):
+        self.formatter = formatter or TextFormatter()
+
+    def emit(self, record: LogRecord):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class ConsoleHandler(Handler):
+    def __init__(self, stream=None, formatter=None):
+        super().__init__(formatter)
+        self.stream = stream
+
+    def emit(self, record: LogRecord):
+        print(self.formatter.format(record), file=self.stream or sys.stdout)
+
+
+class MemoryHandler(Handler):
+    """Хранит записи в списке (для GUI и тестов)."""
+
+    def __init__(self, capacity: Optional[int] = None):
+        super().__init__()
+        self.capacity = capacity
+        self.records: List[LogRecord] = []
+
+    def emit(self, record: LogRecord):
+        self.records.append(record)
+        if self.capacity is not None and len(self.records) > self.capacity:
+            del self.records[0]
+
+
+class BufferedFileHandler(Handler):
+    """
+    Файл открывается один раз (с заголовком сессии), строки копятся в памяти
+    и записываются одной операцией, когда их набирается buffer_size.
+    """
+
+    def __init__(self, path: str, formatter=None, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 header: bool = True):
+        super().__init__(formatter)
+        self.path = path
+        self.buffer_size = max(1, buffer_size)
+        self._buffer: List[str] = []
+        self._file = open(path, "w", encoding="utf-8")
+        if header:
+            self._file.write(f"--- Новая сессия: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n\n")
+            self._file.flush()
+
+    def emit(self, record: LogRecord):
+        self._buffer.append(self.formatter.format(record))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._file is None:
+            return
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+class AsyncHandler(Handler):
+    """
+    Передаёт записи вложенным обработчикам в фоновом потоке через очередь:
+    поток симуляции только кладёт запись в очередь. flush() ждёт, пока очередь опустеет.
+    """
+
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, *handlers: Handler, max_queue: int = 0):
+        super().__init__()
+        self.handlers = list(handlers)
+        self._queue: "queue.Queue" = queue.Queue(max_queue)
+        self._thread = threading.Thread(target=self._run, name="poker-log-writer", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is self._STOP:
+                    for h in self.handlers:
+                        h.close()
+                    return
+                if item is self._FLUSH:
+                    for h in self.handlers:
+                        h.flush()
+                else:
+                    for h in self.handlers:
+                        h.emit(item)
+            finally:
+                self._queue.task_done()
+
+    def emit(self, record: LogRecord):
+        self._queue.put(record)
+
+    def flush(self):
+        if self._thread.is_alive():
+            self._queue.put(self._FLUSH)
+            self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+
+# Открытые логгеры дописывают буферы при выходе из процесса
+_open_loggers: "weakref.WeakSet[PokerLogger]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_loggers():
+    for logger in list(_open_loggers):
+        logger.close()
 
 
 class PokerLogger:
-    def __init__(self, log_file="poker_game.log"):
+    """
+    log_file=None — без файла; console=False — без вывода в консоль;
+    async_write=True — обработчики работают в фоновом потоке;
+    handlers=[...] — свои обработчики вместо консоли и файла.
+    """
+
+    def __init__(self, log_file: Optional[str] = "poker_game.log", level: LogLevel = LogLevel.DEBUG,
+                 console: bool = True, async_write: bool = False,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE, handlers: Optional[Sequence[Handler]] = None):
         self.log_file = log_file
         self.last_action = None    # 'bluff_raise', 'raise', 'fold' и т.д.
         self.last_player = None    # кто последним сделал действие
-        self._clear_log()
+        self.level = LogLevel(level)
+        if handlers is None:
+            handlers = []
+            if self.level < LogLevel.OFF:
+                if console:
+                    handlers.append(ConsoleHandler())
+                if log_file:
+                    handlers.append(BufferedFileHandler(log_file, buffer_size=buffer_size))
+        handlers = list(handlers)
+        if async_write and handlers:
+            handlers = [AsyncHandler(*handlers)]
+        self.handlers: List[Handler] = handlers
+        if self.handlers:
+            _open_loggers.add(self)
+
+    def set_level(self, level: LogLevel):
+        self.level = LogLevel(level)
+
+    def enabled(self, level: LogLevel) -> bool:
+        return level >= self.level and bool(self.handlers)
+
+    def _emit(self, level: LogLevel, event: str, **data):
+        if level < self.level or not self.handlers:
+            return
+        record = LogRecord(time.time(), level, event, data)
+        for h in self.handlers:
+            h.emit(record)
+
+    def flush(self):
+        for h in self.handlers:
+            h.flush()
+
+    def close(self):
+        for h in self.handlers:
+            h.close()
+        self.handlers = []
+        _open_loggers.discard(self)
 
     def log_bluff_raise(self, player_name: str, amount: int, pot: int):
-        self._write(f"  {player_name} → 🎭 BLUFF RAISE {amount}! (банк: {pot})")
+        self._emit(LogLevel.DEBUG, "bluff_raise", player=player_name, amount=amount, pot=pot)
         self.last_action = 'bluff_raise'
         self.last_player = player_name
 
     def log_call(self, player_name: str, amount: int, pot: int):
-        self._write(f"  {player_name} → CALL {amount} (банк: {pot})")
+        self._emit(LogLevel.DEBUG, "call", player=player_name, amount=amount, pot=pot)
         self.last_action = 'call'
         self.last_player = player_name
 
     def log_fold(self, player_name: str, pot: int):
-        self._write(f"  {player_name} → FOLD (банк: {pot})")
+        self._emit(LogLevel.DEBUG, "fold", player=player_name, pot=pot)
         self.last_action = 'fold'
         self.last_player = player_name
 
-    def _clear_log(self):
-        """Очищаем файл перед новой сессией"""
-        with open(self.log_file, "w", encoding="utf-8") as f:
-            f.write(f"--- Новая сессия: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n\n")
-
     def log_hand_start(self, hand_num: int):
-        self._write(f"\n--- Раздача {hand_num} ---")
+        self._emit(LogLevel.INFO, "hand_start", hand=hand_num)
 
     def log_preflop(self, players: List):
-        self._write("[Preflop] Карты розданы:")
-        for p in players:
-            if p.in_game:
-                hand_str = " ".join(c.pretty() for c in p.hand)
-                self._write(f"  {p.name}: {hand_str} (стек: {p.stack})")
+        if self.enabled(LogLevel.INFO):
+            self._emit(LogLevel.INFO, "preflop",
+                       players=[(p.name, tuple(p.hand), p.stack) for p in players if p.in_game])
 
-    def log_board(self, stage: str, board: List[Card]):
-        board_str = " ".join(c.pretty() for c in board)
-        self._write(f"[{stage}] Борд: {board_str}")
+    def log_board(self, stage: str, board: List["Card"]):
+        self._emit(LogLevel.INFO, "board", stage=stage, board=tuple(board))
 
     def log_action(self, player_name: str, action: str, pot: int):
-        self._write(f"  {player_name} → {action.upper()} (банк: {pot})")
-
-   # def log_fold(self, player_name: str, pot: int):
-    #    self._write(f"  {player_name} → FOLD (банк: {pot})")
-
-    #def log_call(self, player_name: str, amount: int, pot: int):
-    #    self._write(f"  {player_name} → CALL {amount} (банк: {pot})")
+        self._emit(LogLevel.DEBUG, "action", player=player_name, action=action, pot=pot)
 
     def log_raise(self, player_name: str, amount: int, pot: int, raise_type: str = "RAISE"):
-        self._write(f"  {player_name} → {raise_type} {amount}! (банк: {pot})")
+        self._emit(LogLevel.DEBUG, "raise", player=player_name, amount=amount, pot=pot,
+                   raise_type=raise_type)
 
     def log_allin(self, player_name: str, amount: int, pot: int):
-        self._write(f"  {player_name} → ALL-IN {amount}! (банк: {pot})")
+        self._emit(LogLevel.DEBUG, "allin", player=player_name, amount=amount, pot=pot)
 
     def log_showdown(self, winners: List[str], pot: int, best_rank: tuple):
-        if winners:
-            self._write(f"🏆 Шоудаун: победитель(и): {', '.join(winners)} → +{pot // len(winners)}")
-        else:
-            self._write(f"🏆 Шоудаун: нет победителей (банк: {pot})")
+        self._emit(LogLevel.INFO, "showdown", winners=list(winners), pot=pot, rank=best_rank)
 
     def log_all_folded(self, winner: str, pot: int):
-        self._write(f"🎉 Все сбросили! {winner} забирает {pot}")
+        self._emit(LogLevel.INFO, "all_folded", winner=winner, pot=pot)
 
     def log_stacks(self, players: List):
-        stacks = " | ".join(f"{p.name}: {p.stack}" for p in players)
-        self._write(f"📊 Стеки: {stacks}")
+        if self.enabled(LogLevel.INFO):
+            self._emit(LogLevel.INFO, "stacks", stacks=[(p.name, p.stack) for p in players])
 
-    def _write(self, text: str):
-        print(text)  # Вывод в консоль
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(text + "\n")
+    def _write(self, text: str, level: LogLevel = LogLevel.INFO):
+        """Произвольная строка (совместимость со старым кодом)."""
+        self._emit(level, "text", text=text)
 
-    def log_bluff_raise(self, player_name: str, amount: int, pot: int):
-        self._write(f"  {player_name} → 🎭 BLUFF RAISE {amount}! (банк: {pot})")
+
+class NullLogger(PokerLogger):
+    """
+    Логгер для массовых прогонов: уровень OFF, без обработчиков — не открывает файл,
+    ничего не форматирует и не печатает. last_action/last_player по-прежнему обновляются.
+    """
+
+    def __init__(self):
+        super().__init__(log_file=None, level=LogLevel.OFF, console=False)
+
+
+# Пример использования:
+# >>> logger = PokerLogger("poker_game.log", level=LogLevel.INFO, async_write=True)
+# >>> logger.log_hand_start(1)
+# >>> logger.close()
+# >>> PokerLogger(None, console=False, handlers=[BufferedFileHandler("hands.jsonl", JsonFormatter())])
@@ -0,0 +1,234 @@
+"""
+Профилирование решений стратегий: задержка каждого вызова стратегии и число оценок рук.
+
+Основные объекты:
+- Profiler                      : гистограммы задержек по (стратегия, улица), счётчики оценок
+- Profiler.enable()/disable()   : включение на лету; выключенный профилировщик стоит одной
+                                  проверки на решение и одной на оценку руки
+- profiling()                   : контекстный менеджер — включить на время блока
+- Profiler.snapshot()           : dict для JSON (p50/p95/p99, среднее, максимум, оценок на решение)
+- Profiler.format_report()      : таблица для консоли
+- LatencyHistogram              : логарифмические корзины — память не зависит от числа замеров
+
+Симулятор вызывает стратегию через active.call_strategy(...), когда профилировщик включён.
+Оценки считаются в poker.fast_evaluator.evaluate_ids, HandState.strength и
+poker.equity.evaluate_keys (векторный вызов добавляет размер пачки).
+"""
+
+import json
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from poker import fast_evaluator
+
+# Корзины гистограммы: от 1 мкс до 100 с, BUCKETS_PER_DECADE на порядок (ширина корзины ~5%)
+MIN_LATENCY = 1e-6
+DECADES = 8
+BUCKETS_PER_DECADE = 50
+PERCENTILES = (50, 95, 99)
+STREET_ORDER = {"Preflop": 0, "Flop": 1, "Turn": 2, "River": 3}
+
+# Включённый профилировщик (его читает PokerSimulator); None — профилирование выключено
+active: Optional["Profiler"] = None
+
+
+class LatencyHistogram:
+    """Задержки в логарифмических корзинах; процентили — с точностью до ширины корзины."""
+
+    __slots__ = ("buckets", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.buckets: List[int] = [0] * (DECADES * BUCKETS_PER_DECADE + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        if seconds > MIN_LATENCY:
+            i = int(math.log10(seconds / MIN_LATENCY) * BUCKETS_PER_DECADE)
+            if i >= len(self.buckets):
+                i = len(self.buckets) - 1
+        else:
+            i = 0
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """q-й процентиль (0..100): середина корзины (в логарифмической шкале), зажатая в [min, max]."""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                value = MIN_LATENCY * 10 ** ((i + 0.5) / BUCKETS_PER_DECADE)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+@dataclass
+class DecisionStats:
+    """Решения одной стратегии на одной улице."""
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    evaluations: int = 0
+    max_evaluations: int = 0
+
+    def to_dict(self) -> dict:
+        h = self.latency
+        d = {"decisions": h.count, "mean_ms": 1e3 * h.mean, "max_ms": 1e3 * h.max}
+        for q in PERCENTILES:
+            d[f"p{q}_ms"] = 1e3 * h.percentile(q)
+        d["evals_per_decision"] = self.evaluations / h.count if h.count else 0.0
+        d["max_evals"] = self.max_evaluations
+        return d
+
+
+class _EvalCounter:
+    __slots__ = ("n",)
+
+    def __init__(self):
+        self.n = 0
+
+
+class Profiler:
+    """
+    Собирает статистику по решениям. Одновременно включён не более одного профилировщика:
+    enable() заменяет предыдущий.
+    """
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str], DecisionStats] = {}
+        self.counter = _EvalCounter()
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return active is self
+
+    def enable(self) -> "Profiler":
+        global active
+        if active is not None and active is not self:
+            active.disable()
+        active = self
+        fast_evaluator.eval_counter = self.counter
+        self.started = time.perf_counter()
+        return self
+
+    def disable(self):
+        global active
+        if active is self:
+            active = None
+            fast_evaluator.eval_counter = None
+            self.elapsed += time.perf_counter() - self.started
+            self.started = None
+
+    def reset(self):
+        self.stats.clear()
+        self.counter.n = 0
+        self.elapsed = 0.0
+        if self.started is not None:
+            self.started = time.perf_counter()
+
+    def record(self, strategy: str, street: str, seconds: float, evaluations: int = 0):
+        stats = self.stats.get((strategy, street))
+        if stats is None:
+            stats = self.stats[(strategy, street)] = DecisionStats()
+        stats.latency.add(seconds)
+        stats.evaluations += evaluations
+        if evaluations > stats.max_evaluations:
+            stats.max_evaluations = evaluations
+
+    def call_strategy(self, player, community_cards, pot, stage):
+        """Вызов player.strategy с замером времени и числа оценок рук за решение."""
+        strategy = player.strategy
+        counter = self.counter
+        evals_before = counter.n
+        started = time.perf_counter()
+        action = strategy(player, community_cards, pot, stage)
+        elapsed = time.perf_counter() - started
+        self.record(getattr(strategy, "__name__", repr(strategy)), stage, elapsed, counter.n - evals_before)
+        return action
+
+    def totals(self) -> Dict[str, DecisionStats]:
+        """Статистика по стратегиям без разбивки по улицам."""
+        merged: Dict[str, DecisionStats] = {}
+        for (strategy, _), stats in self.stats.items():
+            total = merged.setdefault(strategy, DecisionStats())
+            total.latency.merge(stats.latency)
+            total.evaluations += stats.evaluations
+            total.max_evaluations = max(total.max_evaluations, stats.max_evaluations)
+        return merged
+
+    def snapshot(self) -> dict:
+        elapsed = self.elapsed
+        if self.started is not None:
+            elapsed += time.perf_counter() - self.started
+        strategies: Dict[str, dict] = {}
+        order = sorted(self.stats.items(), key=lambda kv: (kv[0][0], STREET_ORDER.get(kv[0][1], 4), kv[0][1]))
+        for (strategy, street), stats in order:
+            strategies.setdefault(strategy, {})[street] = stats.to_dict()
+        for strategy, stats in self.totals().items():
+            strategies[strategy]["all"] = stats.to_dict()
+        return {"seconds": elapsed, "evaluations": self.counter.n, "strategies": strategies}
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+    def format_report(self) -> str:
+        lines = [f"{'стратегия':<28}{'улица':<9}{'решений':>9}{'p50 мс':>9}{'p95 мс':>9}"
+                 f"{'p99 мс':>9}{'макс мс':>9}{'оценок':>10}"]
+        for strategy, streets in self.snapshot()["strategies"].items():
+            for street, d in streets.items():
+                lines.append(f"{strategy:<28}{street:<9}{d['decisions']:>9}{d['p50_ms']:>9.3f}"
+                             f"{d['p95_ms']:>9.3f}{d['p99_ms']:>9.3f}{d['max_ms']:>9.2f}"
+                             f"{d['evals_per_decision']:>10.0f}")
+        return "\n".join(lines)
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, *exc):
+        self.disable()
+
+
+@contextmanager
+def profiling(profiler: Optional[Profiler] = None):
+    """with profiling() as prof: ... — профилировщик включён только внутри блока."""
+    profiler = profiler or Profiler()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+
+
+# Пример использования:
+# >>> from utils.profiling import profiling
+# >>> with profiling() as prof:
+# ...     run_batch([monte_carlo_strategy, aggressive_strategy], 1000, seed=1)
+# >>> print(prof.format_report())
+# >>> prof.snapshot()["strategies"]["aggressive_strategy"]["River"]["p99_ms"]